@@ -0,0 +1,324 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bkz import BKZ_ALGORITHMS
+from bkz.backends import (
+	block_gso,
+	fpylll,
+	fpylll_bkz,
+	fpylll_enum_solver,
+	fpylll_lll,
+	to_integer_matrix,
+)
+from bkz.basis_generator import basis_gen
+from bkz.bkz_params import BKZ_FINAL_LOVASZ_PARAM, DELTA, ENTRY_BOUND
+from bkz.L3FP.gsofp_se import gso_full, gso_step
+from bkz.L3FP.L3fp import l3fp
+from bkz.L3FP.L3fp_deep_insertion import l3fp_deep_insert
+from bkz.L3FP.L3fp_params import LOVASZ_CONDITION_PARAM
+from bkz.L3FP.reducer import size_reduction_loop
+from bkz.lattice_families import qary_basis
+from bkz.SVPsolvers import ENUM_ALGORITHMS, ENUM_SOLVERS
+
+# RUN: python3 -m benchmarks.bench run --output benchmarks/latest.json
+# RUN: python3 -m benchmarks.bench compare benchmarks/baseline.json benchmarks/latest.json --threshold 0.1
+
+DEFAULT_SEED = 0
+WARMUP = 1
+REPEATS = 5
+# Relative slowdown of the median run time above which `compare` reports a regression
+REGRESSION_THRESHOLD = 0.1
+
+# Input sizes of the benchmarks
+LLL_DIMENSIONS = (20, 40)
+KERNEL_DIMENSION = 40
+DEEP_INSERT_DIMENSION = 30
+ENUM_DIMENSION = 30
+ENUM_BLOCK_SIZES = (10, 16)
+BKZ_CASES = ((20, 6), (30, 10))
+# Large q-ary bases for dense against structure-aware `l3fp` (only run with `large=True`, minutes per call)
+QARY_DIMENSIONS = (200, 300)
+QARY_MODULUS = 3329
+
+
+def seeded_basis(dimension, seed):
+	"""Returns the random basis (`basis_gen`, entries bounded by `ENTRY_BOUND`) of a benchmark input."""
+	return basis_gen(dimension, ENTRY_BOUND, np.random.default_rng([seed, dimension]))
+
+
+def lll_reduced(dimension, seed):
+	"""Returns the `l3fp` result of the seeded basis of `dimension`."""
+	return l3fp(seeded_basis(dimension, seed))
+
+
+def raw_fpylll_lll(basis_matrix):
+	"""Returns the fpylll reference of `l3fp`: `LLL.reduction` on a prebuilt `IntegerMatrix`, as
+	`(function, setup)` (see `time_call`). The conversion of the basis is part of the untimed setup."""
+	return (
+		lambda integer_matrix: fpylll.LLL.reduction(integer_matrix, delta=LOVASZ_CONDITION_PARAM),
+		lambda: (to_integer_matrix(basis_matrix),),
+	)
+
+
+def raw_fpylll_bkz(basis_matrix, block_size):
+	"""Returns the fpylll reference of the BKZ drivers: `BKZ.reduction` on a prebuilt `IntegerMatrix`."""
+	parameters = fpylll.BKZ.Param(block_size=min(block_size, basis_matrix.shape[1]), delta=BKZ_FINAL_LOVASZ_PARAM)
+	return (
+		lambda integer_matrix: fpylll.BKZ.reduction(integer_matrix, parameters),
+		lambda: (to_integer_matrix(basis_matrix),),
+	)
+
+
+def raw_fpylll_enum(gs_squared_norms, gs_coeffs):
+	"""Returns the fpylll reference of the enumeration solvers: `Enumeration.enumerate` on a prebuilt GSO
+	object of the block (see `block_gso`), with the radius `gs_squared_norms[0]` of the solvers."""
+	block_size = len(gs_squared_norms)
+	gso, scale = block_gso(gs_squared_norms, np.triu(gs_coeffs))
+
+	def enumerate_block(gso, radius):
+		try:
+			fpylll.Enumeration(gso).enumerate(0, block_size, radius, 0)
+		except fpylll.EnumerationError:
+			pass
+
+	return enumerate_block, lambda: (gso, gs_squared_norms[0] * scale)
+
+
+def time_call(function, setup, repeats=REPEATS, warmup=WARMUP):
+	"""Times `function(*setup())`. The setup (e.g. copying the inputs that the function modifies) is not timed.
+
+	Args:
+		function (Callable): The benchmarked function.
+		setup (Callable): Returns the arguments of one call.
+		repeats (int): Number of timed calls.
+		warmup (int): Number of untimed calls before the timed ones (caches, workspace allocation, imports).
+
+	Returns:
+		(dict): The `median` and `min` run time in seconds and the number of `repeats`.
+	"""
+	for _ in range(warmup):
+		function(*setup())
+	times = []
+	for _ in range(repeats):
+		args = setup()
+		start = time.perf_counter()
+		function(*args)
+		times.append(time.perf_counter() - start)
+	return {"median": float(np.median(times)), "min": float(np.min(times)), "repeats": repeats}
+
+
+def benchmark_cases(seed=DEFAULT_SEED, large=False):
+	"""Builds the benchmark cases on fixed seeded inputs.
+
+	Args:
+		seed (int): Seed of the input bases.
+		large (bool): If True, the dense and structure-aware `l3fp` on q-ary bases of `QARY_DIMENSIONS` are added.
+
+	Returns:
+		(dict[str, tuple]): `(function, setup, reference)` per benchmark name. `reference` is the
+		`(function, setup)` pair of the raw fpylll counterpart on the same input (without our conversions
+		and final `refresh_gso`), or None. If fpylll is installed, the backend wrappers of `bkz.backends`
+		are benchmarked as cases of their own.
+	"""
+	with_fpylll = fpylll is not None
+	cases = {}
+
+	def gso_all_stages(basis_matrix, gs_coeff_matrix, gs_squared_norms):
+		for stage in range(len(gs_squared_norms)):
+			gso_step(basis_matrix[:, : stage + 1], gs_coeff_matrix[:, : stage + 1], gs_squared_norms[: stage + 1], stage)
+
+	def size_reduce_all_stages(gs_coeff_matrix, basis_matrix):
+		for stage in range(1, len(gs_coeff_matrix)):
+			size_reduction_loop(stage, gs_coeff_matrix, basis_matrix, False)
+
+	n = KERNEL_DIMENSION
+	basis = seeded_basis(n, seed).astype(np.float64)
+	cases[f"gso_step/dim={n}"] = (gso_all_stages, lambda basis=basis, n=n: (basis, np.eye(n), np.zeros(n)), None)
+	gs_coeff_matrix = gso_full(basis)[1]
+	cases[f"size_reduction_loop/dim={n}"] = (size_reduce_all_stages, lambda gs_coeff_matrix=gs_coeff_matrix, basis=basis: (gs_coeff_matrix.copy(), basis.copy()), None)
+
+	for dimension in LLL_DIMENSIONS:
+		basis = seeded_basis(dimension, seed)
+		reference = raw_fpylll_lll(basis) if with_fpylll else None
+		cases[f"l3fp/dim={dimension}"] = (l3fp, lambda basis=basis: (basis.copy(),), reference)
+		if with_fpylll:
+			cases[f"fpylll_lll/dim={dimension}"] = (fpylll_lll, lambda basis=basis: (basis.copy(),), None)
+
+	# Deep insertion of the shortest vector of the first block, as in `bkz_se` without local blocks
+	reduced_basis, gs_coeff_matrix, gs_squared_norms = lll_reduced(DEEP_INSERT_DIMENSION, seed)
+	block_size = ENUM_BLOCK_SIZES[0]
+	_, coeffs = ENUM_ALGORITHMS["2"](reduced_basis[:, :block_size], gs_squared_norms[:block_size], gs_coeff_matrix[:block_size, :block_size])
+	injected_basis = np.insert(reduced_basis[:, : block_size + 1], 0, reduced_basis[:, :block_size] @ coeffs, axis=1)
+	cases[f"l3fp_deep_insert/dim={DEEP_INSERT_DIMENSION}"] = (
+		lambda injected_basis: l3fp_deep_insert(
+			injected_basis_matrix=injected_basis,
+			gs_coeff_matrix=np.zeros((0, 0)),
+			gs_squared_norms=np.zeros(0),
+			start_stage=0,
+			Lovasz_cond_param=DELTA,
+			f_c=True,
+		),
+		lambda injected_basis=injected_basis: (injected_basis.copy(),),
+		None,
+	)
+
+	reduced_basis, gs_coeff_matrix, gs_squared_norms = lll_reduced(ENUM_DIMENSION, seed)
+	for block_size in ENUM_BLOCK_SIZES:
+		block = (reduced_basis[:, :block_size], gs_squared_norms[:block_size], gs_coeff_matrix[:block_size, :block_size])
+		reference = raw_fpylll_enum(block[1], block[2]) if with_fpylll else None
+		for key, solver in ENUM_SOLVERS.items():
+			cases[f"enum_{key}/block={block_size}"] = (solver, lambda block=block: block, reference)
+		if with_fpylll:
+			cases[f"fpylll_enum_solver/block={block_size}"] = (fpylll_enum_solver, lambda block=block: block, None)
+
+	for key, bkz_reduce in BKZ_ALGORITHMS.items():
+		for dimension, block_size in BKZ_CASES:
+			basis = seeded_basis(dimension, seed)
+			cases[f"{bkz_reduce.__name__}/dim={dimension},block={block_size}"] = (
+				lambda basis, bkz_reduce=bkz_reduce, block_size=block_size: bkz_reduce(basis, block_size, "2"),
+				lambda basis=basis: (basis.copy(),),
+				raw_fpylll_bkz(basis, block_size) if with_fpylll else None,
+			)
+	if with_fpylll:
+		for dimension, block_size in BKZ_CASES:
+			basis = seeded_basis(dimension, seed)
+			cases[f"fpylll_bkz/dim={dimension},block={block_size}"] = (
+				lambda basis, block_size=block_size: fpylll_bkz(basis, block_size),
+				lambda basis=basis: (basis.copy(),),
+				None,
+			)
+
+	if large:
+		for dimension in QARY_DIMENSIONS:
+			basis = qary_basis(dimension, QARY_MODULUS, np.random.default_rng([seed, dimension]))
+			reference = raw_fpylll_lll(basis) if with_fpylll else None
+			cases[f"l3fp/qary,dim={dimension}"] = (l3fp, lambda basis=basis: (basis.copy(),), reference)
+			cases[f"l3fp/qary,dim={dimension},supports=detect"] = (
+				lambda basis: l3fp(basis, supports="detect"),
+				lambda basis=basis: (basis.copy(),),
+				reference,
+			)
+
+	return cases
+
+
+def run_benchmarks(name_filter=None, repeats=REPEATS, warmup=WARMUP, seed=DEFAULT_SEED, large=False):
+	"""Runs the benchmarks whose name contains `name_filter`. Where fpylll is installed, the raw fpylll
+	counterpart runs on the same inputs and `fpylll_ratio` is our median run time divided by the fpylll one.
+
+	Args:
+		name_filter (str): Substring of the benchmark names to run. If None, all benchmarks run.
+		repeats (int): Number of timed calls per benchmark.
+		warmup (int): Number of untimed calls per benchmark.
+		seed (int): Seed of the input bases.
+		large (bool): If True, the large q-ary benchmarks run as well (see `benchmark_cases`).
+
+	Returns:
+		(dict): `metadata` (versions, platform, settings) and `results`, the timings per benchmark name.
+	"""
+	results = {}
+	for name, (function, setup, reference) in benchmark_cases(seed, large).items():
+		if name_filter is not None and name_filter not in name:
+			continue
+		results[name] = time_call(function, setup, repeats, warmup)
+		if reference is not None:
+			fpylll_timing = time_call(*reference, repeats, warmup)
+			results[name]["fpylll_median"] = fpylll_timing["median"]
+			results[name]["fpylll_ratio"] = results[name]["median"] / fpylll_timing["median"]
+		print(f"{name:45s} {results[name]['median'] * 1e3:10.3f} ms", file=sys.stderr)
+
+	metadata = {
+		"python": platform.python_version(),
+		"numpy": np.__version__,
+		"fpylll": getattr(fpylll, "__version__", None) if fpylll is not None else None,
+		"platform": platform.platform(),
+		"repeats": repeats,
+		"warmup": warmup,
+		"seed": seed,
+		"large": large,
+	}
+	return {"metadata": metadata, "results": results}
+
+
+def compare(baseline, current, threshold=REGRESSION_THRESHOLD):
+	"""Compares the median run times of two benchmark runs (see `run_benchmarks`).
+
+	Args:
+		baseline (dict): The baseline run.
+		current (dict): The current run.
+		threshold (float): Relative slowdown above which a benchmark counts as a regression, e.g. 0.1 for 10%.
+
+	Returns:
+		(list[dict]): One row per benchmark present in both runs, with the `name`, the `baseline` and `current`
+		median run times, the relative `change` and whether it is a `regression`.
+	"""
+	rows = []
+	for name, timing in current["results"].items():
+		if name not in baseline["results"]:
+			continue
+		baseline_median = baseline["results"][name]["median"]
+		change = timing["median"] / baseline_median - 1
+		rows.append(
+			{
+				"name": name,
+				"baseline": baseline_median,
+				"current": timing["median"],
+				"change": change,
+				"regression": change > threshold,
+			}
+		)
+	return rows
+
+
+def main():
+	parser = argparse.ArgumentParser(
+		formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+		description="Benchmark the lattice reduction kernels and compare runs against baselines.",
+	)
+	commands = parser.add_subparsers(dest="command", required=True)
+	run_parser = commands.add_parser("run", help="Run the benchmarks and write the timings as JSON.")
+	run_parser.add_argument("--output", default=None, help="Path of the JSON results file (e.g. a new baseline).")
+	run_parser.add_argument("--filter", default=None, help="Only run the benchmarks whose name contains this string.")
+	run_parser.add_argument("--repeats", type=int, default=REPEATS, help="Number of timed calls per benchmark.")
+	run_parser.add_argument("--warmup", type=int, default=WARMUP, help="Number of untimed calls per benchmark.")
+	run_parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed of the input bases.")
+	run_parser.add_argument(
+		"--large",
+		action="store_true",
+		help="Also run dense and structure-aware l3fp on large q-ary bases (several minutes per call).",
+	)
+	compare_parser = commands.add_parser("compare", help="Compare a run with a baseline and flag regressions.")
+	compare_parser.add_argument("baseline", help="Path of the baseline results.")
+	compare_parser.add_argument("current", help="Path of the current results.")
+	compare_parser.add_argument(
+		"--threshold", type=float, default=REGRESSION_THRESHOLD, help="Relative slowdown that counts as a regression."
+	)
+	args = parser.parse_args()
+
+	if args.command == "run":
+		results = run_benchmarks(args.filter, args.repeats, args.warmup, args.seed, args.large)
+		if args.output is not None:
+			with open(args.output, "w") as results_file:
+				json.dump(results, results_file, indent=2)
+		return
+
+	with open(args.baseline) as baseline_file, open(args.current) as current_file:
+		rows = compare(json.load(baseline_file), json.load(current_file), args.threshold)
+	for row in rows:
+		flag = "REGRESSION" if row["regression"] else ""
+		print(
+			f"{row['name']:45s} {row['baseline'] * 1e3:10.3f} ms {row['current'] * 1e3:10.3f} ms {row['change']:+8.1%} {flag}"
+		)
+	if any(row["regression"] for row in rows):
+		sys.exit(1)
+
+
+if __name__ == "__main__":
+	main()
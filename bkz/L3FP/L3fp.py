@@ -1,9 +1,12 @@
-from tqdm import tqdm
+from functools import partial
 
-from bkz.L3FP.gsofp_se import gso_step
+from bkz import observers
+from bkz.L3FP.delta_schedule import run_delta_schedule
+from bkz.L3FP.gsofp_se import gso_step, gso_step_banded
 from bkz.L3FP.initializer import initialize
 from bkz.L3FP.L3fp_params import LOVASZ_CONDITION_PARAM
-from bkz.L3FP.reducer import size_reduction_loop
+from bkz.L3FP.reducer import size_reduce_entry, size_reduction_loop
+from bkz.L3FP.structure import resolve_supports
 
 
 def l3fp(
@@ -13,6 +16,10 @@ def l3fp(
 	start_stage=0,
 	Lovasz_cond_param=LOVASZ_CONDITION_PARAM,
 	f_c=False,
+	delta_schedule=None,
+	early_exit=None,
+	lazy_size_reduction=False,
+	supports=None,
 ):
 	"""Executes the Floating-point LLL reduction algorithm as presented in
 	*Lattice Basis Reduction: Improved Practical Algorithms and Solving Subset Sum Problems*
@@ -42,6 +49,28 @@ def l3fp(
 		f_c (bool):
 			A flag used to track floating-point precision issues. If set to True and a precision flaw is detected, the algorithm will backtrack one step or restart from stage 1.
 
+		delta_schedule (Sequence[float]):
+			Optional increasing sequence of Lovasz condition parameters, e.g. `(0.5, 0.75, 0.99)`. If given,
+			the reduction runs one pass per parameter (see `delta_schedule.run_delta_schedule`) and
+			`Lovasz_cond_param` is ignored.
+
+		early_exit (float):
+			Only used with `delta_schedule`. Fraction of neighbouring column pairs that must satisfy the
+			Lovasz condition for the last parameter of the schedule before the remaining passes are skipped.
+
+		lazy_size_reduction (bool):
+			If True, only the coefficient `gs_coeff_matrix[stage - 1, stage]` needed by the Lovasz test is
+			size-reduced on every visit of a stage. The full size reduction of column `stage` is deferred until
+			the stage is accepted, so no work is spent on columns that are swapped away. The returned basis is
+			size-reduced in both modes.
+
+		supports (np.ndarray | str):
+			Enables structure-aware reduction for bases with short column supports, such as q-ary bases.
+			Either a declared 2D integer NumPy array of shape (2, n) with the row supports `[lo, hi)` of the columns,
+			or `"detect"` to detect them with `detect_supports`. The Gram-Schmidt data is then computed with
+			`gso_step_banded` and size reductions only touch the rows in the support of the subtracted column.
+			A declared array is kept up to date in place, so callers can reuse it for later calls.
+
 	Returns:
 		(tuple):
 			-basis_matrix (np.ndarray):
@@ -54,36 +83,66 @@ def l3fp(
 			-gs_squared_norms (np.ndarray):
 				A 1D Numpy array of shape (n,) representing the updated squared lengths of The Gram-Schmidt vectors.
 	"""
+	supports = resolve_supports(basis_matrix, supports)
+	if delta_schedule is not None:
+		return run_delta_schedule(
+			partial(l3fp, lazy_size_reduction=lazy_size_reduction, supports=supports),
+			basis_matrix,
+			delta_schedule,
+			early_exit,
+			gs_coeff_matrix,
+			gs_squared_norms,
+			start_stage,
+			f_c,
+		)
 
 	basis_matrix, gs_coeff_matrix, gs_squared_norms, stage, end_stage = initialize(
 		basis_matrix, gs_coeff_matrix, gs_squared_norms, start_stage
 	)
 
-	pbar = tqdm(
-		total=end_stage,
-		desc="LLL reduction loop",
-		leave=False,
-		ascii="-##",
-		colour="white",
-		position=2,
-	)
+	observer = observers.OBSERVER
+	if observer is not None:
+		observer.begin("lll", end_stage, start=stage)
 	# Enter reduction loop
 	while stage < end_stage:
+		if observer is not None:
+			observer.begin("gso")
 		# Append / update Gram-Schmidt orthogonalization with current column
-		gs_squared_norms[: stage + 1], gs_coeff_matrix[:, : stage + 1] = gso_step(
-			basis_matrix[:, : stage + 1],
-			gs_coeff_matrix[:, : stage + 1],
-			gs_squared_norms[: stage + 1],
-			stage,
-		)
-
-		# Size reduction step
-		f_c, gs_coeff_matrix, basis_matrix_matrix = size_reduction_loop(
-			stage, gs_coeff_matrix, basis_matrix, f_c
-		)
+		if supports is None:
+			gs_squared_norms[: stage + 1], gs_coeff_matrix[:, : stage + 1] = gso_step(
+				basis_matrix[:, : stage + 1],
+				gs_coeff_matrix[:, : stage + 1],
+				gs_squared_norms[: stage + 1],
+				stage,
+			)
+		else:
+			gs_squared_norms[: stage + 1], gs_coeff_matrix[:, : stage + 1] = gso_step_banded(
+				basis_matrix[:, : stage + 1],
+				gs_coeff_matrix[:, : stage + 1],
+				gs_squared_norms[: stage + 1],
+				stage,
+				supports[:, : stage + 1],
+			)
+		if observer is not None:
+			observer.end("gso")
+			observer.begin("size_reduction")
+
+		# Size reduction step (only the entry needed by the Lovasz test in lazy mode)
+		if lazy_size_reduction:
+			f_c, gs_coeff_matrix, basis_matrix = size_reduce_entry(
+				stage, stage - 1, gs_coeff_matrix, basis_matrix, f_c, supports
+			)
+		else:
+			f_c, gs_coeff_matrix, basis_matrix_matrix = size_reduction_loop(
+				stage, gs_coeff_matrix, basis_matrix, f_c, supports
+			)
+		if observer is not None:
+			observer.end("size_reduction")
 
 		# Check for cumulated floating-point inaccuracies
 		if f_c:
+			if observer is not None:
+				observer.count("f_c_restarts")
 			f_c = False
 			stage = max(stage - 1, 1)
 			continue
@@ -96,14 +155,38 @@ def l3fp(
 		):
 			# If ordering incorrect:
 			# Execute column swap
+			if observer is not None:
+				observer.begin("swap")
 			basis_matrix[:, [stage - 1, stage]] = basis_matrix[:, [stage, stage - 1]]
+			if supports is not None:
+				supports[:, [stage - 1, stage]] = supports[:, [stage, stage - 1]]
+			if observer is not None:
+				observer.end("swap")
+				observer.count("swaps")
 			# step back
 			stage = max(stage - 1, 1)
 		else:
+			if lazy_size_reduction:
+				# Deferred size reduction of the accepted column
+				if observer is not None:
+					observer.begin("size_reduction")
+				f_c, gs_coeff_matrix, basis_matrix = size_reduction_loop(
+					stage, gs_coeff_matrix, basis_matrix, f_c, supports
+				)
+				if observer is not None:
+					observer.end("size_reduction")
+				if f_c:
+					if observer is not None:
+						observer.count("f_c_restarts")
+					f_c = False
+					stage = max(stage - 1, 1)
+					continue
 			# If ordering correct -> move to next step
 			stage += 1
-			pbar.update(1)
+			if observer is not None:
+				observer.update("lll")
 
-	pbar.close()
+	if observer is not None:
+		observer.end("lll")
 
 	return basis_matrix, gs_coeff_matrix, gs_squared_norms
@@ -0,0 +1,124 @@
+import numpy as np
+
+from bkz import observers
+from bkz.L3FP.gsofp_se import gso_full
+from bkz.L3FP.L3fp_params import LOVASZ_CONDITION_PARAM
+from bkz.L3FP.reducer import bulk_size_reduction
+
+
+def l3fp_all_swap(
+	basis_matrix,
+	gs_coeff_matrix=None,
+	gs_squared_norms=None,
+	start_stage=0,
+	Lovasz_cond_param=LOVASZ_CONDITION_PARAM,
+	f_c=False,
+):
+	"""Executes the all-swap (odd-even) variant of the floating-point LLL reduction algorithm
+	as presented in *Parallel lattice basis reduction* by C. Heckler and L. Thiele (1993) and
+	analysed by G. Villard (1992).
+
+	Instead of testing and swapping one pair of neighbouring columns per iteration like `l3fp`,
+	each phase tests all pairs `(i, i+1)` with `i` of the same parity at once. The pairs of a phase
+	are disjoint, so every pair that violates the Lovasz condition is swapped in a single vectorized
+	step. Between phases the Gram-Schmidt data is recomputed with `gso_full` and the whole basis is
+	size-reduced with `bulk_size_reduction`. The algorithm terminates when two consecutive phases
+	(one even and one odd) perform no swaps.
+
+	Args:
+		basis_matrix (np.ndarray):
+			A 2D NumPy array of shape (n, n) representing a lattice basis, where each column is a basis vector.
+
+		gs_coeff_matrix (np.ndarray):
+			Accepted for signature compatibility with `l3fp`. The all-swap variant always
+			recomputes the Gram-Schmidt coefficients of the whole basis.
+
+		gs_squared_norms (np.ndarray):
+			Accepted for signature compatibility with `l3fp`. The all-swap variant always
+			recomputes the Gram-Schmidt squared norms of the whole basis.
+
+		start_stage (int):
+			Accepted for signature compatibility with `l3fp`. Every phase covers the whole basis.
+
+		Lovasz_cond_param (float):
+			The Lovasz condition parameter (typically in ]1/2, 1[) used to determine
+			whether a column swap is necessary for a pair of neighbouring columns.
+
+		f_c (bool):
+			A flag used to track floating-point precision issues. If a precision flaw is detected during
+			size reduction, the Gram-Schmidt data is recomputed and the basis is size-reduced again.
+
+	Returns:
+		(tuple):
+			-basis_matrix (np.ndarray):
+				A 2D Numpy array of shape (n, n) representing a lll-reduced lattice basis,
+				where each column is a basis vector.
+
+			-gs_coeff_matrix (np.ndarray):
+				A 2D Numpy array of shape (n, n) representing the updated Gram-Schmidt coefficients.
+
+			-gs_squared_norms (np.ndarray):
+				A 1D Numpy array of shape (n,) representing the updated squared lengths of The Gram-Schmidt vectors.
+	"""
+	basis_matrix = basis_matrix.astype(np.float64)
+	width = basis_matrix.shape[1]
+	parity = 0
+	idle_phases = 0
+	basis_changed = True
+
+	observer = observers.OBSERVER
+	if observer is not None:
+		observer.begin("lll", start=start_stage)
+	while True:
+		if basis_changed:
+			if observer is not None:
+				observer.begin("gso")
+			gs_squared_norms, gs_coeff_matrix = gso_full(basis_matrix)
+			if observer is not None:
+				observer.end("gso")
+				observer.begin("size_reduction")
+
+			# Size reduction of all columns
+			f_c, gs_coeff_matrix, basis_matrix = bulk_size_reduction(
+				gs_coeff_matrix, basis_matrix, f_c
+			)
+			if observer is not None:
+				observer.end("size_reduction")
+
+			# Check for cumulated floating-point inaccuracies
+			if f_c:
+				if observer is not None:
+					observer.count("f_c_restarts")
+				f_c = False
+				continue
+			basis_changed = False
+
+		if idle_phases == 2 or width < 2:
+			break
+
+		# Lovasz condition check for all pairs (i, i+1) with i of the current parity
+		lower = np.arange(parity, width - 1, 2)
+		violated = Lovasz_cond_param * gs_squared_norms[lower] > (
+			gs_squared_norms[lower + 1] + gs_coeff_matrix[lower, lower + 1] ** 2 * gs_squared_norms[lower]
+		)
+		swaps = lower[violated]
+		if swaps.size > 0:
+			# Execute all column swaps of the phase at once
+			if observer is not None:
+				observer.begin("swap")
+			basis_matrix[:, np.concatenate((swaps, swaps + 1))] = basis_matrix[
+				:, np.concatenate((swaps + 1, swaps))
+			]
+			if observer is not None:
+				observer.end("swap")
+				observer.count("swaps", int(swaps.size))
+			basis_changed = True
+			idle_phases = 0
+		else:
+			idle_phases += 1
+		parity = 1 - parity
+
+	if observer is not None:
+		observer.end("lll")
+
+	return basis_matrix, gs_coeff_matrix, gs_squared_norms
@@ -0,0 +1,300 @@
+import numpy as np
+
+from bkz import observers
+from bkz.L3FP.gsofp_se import gso_step, projected_squared_norms
+from bkz.L3FP.initializer import initialize
+from bkz.L3FP.L3fp_params import DEEP_INSERTION_DEPTH, LOVASZ_CONDITION_PARAM
+from bkz.L3FP.reducer import size_reduction_loop
+
+
+def insertion_window(stage, depth):
+	"""Returns the insertion positions allowed for column `stage` by a depth-bounded deep insertion.
+	As proposed by Schnorr and Euchner, column `stage` may only be inserted at a position `i`
+	with `i < depth` (close to the start of the basis) or `stage - i <= depth` (close to its
+	current position). The position `stage - 1` always belongs to the window, so the resulting
+	basis is LLL-reduced.
+
+	Args:
+		stage (int): The index of the basis vector that is currently under investigation.
+		depth (int): Width of the insertion window. If None, every position `i < stage` is allowed.
+
+	Returns:
+		(np.ndarray): A boolean 1D NumPy array of shape (stage,) flagging the allowed positions.
+	"""
+	positions = np.arange(stage)
+	if depth is None:
+		return np.ones(stage, dtype=bool)
+	return (positions < depth) | (stage - positions <= depth)
+
+
+def deep_insertion_index(gs_coeff_matrix, gs_squared_norms, stage, Lovasz_cond_param, depth):
+	"""Finds the position at which column `stage` is deep-inserted.
+	The first position `i` inside the insertion window with
+	`Lovasz_cond_param * gs_squared_norms[i] > ||pi_i(b_stage)||^2` is returned.
+
+	Args:
+		gs_coeff_matrix (np.ndarray): Gram-Schmidt coefficients of shape (m, m), up to date up to column `stage`.
+		gs_squared_norms (np.ndarray): Gram-Schmidt squared norms of shape (m,), up to date up to index `stage`.
+		stage (int): The index of the basis vector that is currently under investigation.
+		Lovasz_cond_param (float): The Lovasz condition parameter (typically in ]1/2, 1[).
+		depth (int): Width of the insertion window (see `insertion_window`).
+
+	Returns:
+		(int): The insertion position, or None if column `stage` stays in place.
+	"""
+	projected_norms = projected_squared_norms(gs_coeff_matrix, gs_squared_norms, stage)
+	violated = Lovasz_cond_param * gs_squared_norms[:stage] > projected_norms
+	candidates = np.flatnonzero(violated & insertion_window(stage, depth))
+	if candidates.size == 0:
+		return None
+	return candidates[0]
+
+
+def potential_insertion_index(gs_coeff_matrix, gs_squared_norms, stage, Lovasz_cond_param, depth):
+	"""Finds the position at which column `stage` is inserted by the potential-based deep insertion
+	of *Potential-LLL* by F. Fontein, M. Schneider and U. Wagner (2014).
+	Inserting column `stage` at position `i` multiplies the potential of the basis by
+	`prod_{l=i}^{stage-1} ||pi_l(b_stage)||^2 / gs_squared_norms[l]`. The position inside the insertion
+	window minimizing this ratio is returned if the ratio is below `Lovasz_cond_param`. For `i = stage - 1`
+	the ratio reduces to the Lovasz condition, so the resulting basis is LLL-reduced.
+
+	Args:
+		gs_coeff_matrix (np.ndarray): Gram-Schmidt coefficients of shape (m, m), up to date up to column `stage`.
+		gs_squared_norms (np.ndarray): Gram-Schmidt squared norms of shape (m,), up to date up to index `stage`.
+		stage (int): The index of the basis vector that is currently under investigation.
+		Lovasz_cond_param (float): The Lovasz condition parameter (typically in ]1/2, 1[).
+		depth (int): Width of the insertion window (see `insertion_window`).
+
+	Returns:
+		(int): The insertion position, or None if column `stage` stays in place.
+	"""
+	projected_norms = projected_squared_norms(gs_coeff_matrix, gs_squared_norms, stage)
+	# Logarithm of the potential ratio for every insertion position (in log-space to avoid overflow)
+	log_ratios = np.cumsum((np.log(projected_norms) - np.log(gs_squared_norms[:stage]))[::-1])[::-1]
+	log_ratios[~insertion_window(stage, depth)] = np.inf
+	i = int(np.argmin(log_ratios))
+	if log_ratios[i] < np.log(Lovasz_cond_param):
+		return i
+	return None
+
+
+def l3fp_deep(
+	basis_matrix,
+	gs_coeff_matrix=None,
+	gs_squared_norms=None,
+	start_stage=0,
+	Lovasz_cond_param=LOVASZ_CONDITION_PARAM,
+	f_c=False,
+	depth=DEEP_INSERTION_DEPTH,
+):
+	"""Executes the floating-point LLL algorithm with depth-bounded deep insertions as presented in
+	*Lattice Basis Reduction: Improved Practical Algorithms and Solving Subset Sum Problems*
+	by C. P. Schnorr, M. Euchner (1994).
+
+	Unlike `l3fp_deep_insert`, this variant operates on a linearly independent basis and bounds the
+	insertion positions by `depth`, which keeps the cost of a stage close to that of a plain Lovasz test.
+	The projected lengths needed for the insertion test are computed from the Gram-Schmidt data instead
+	of the basis vectors.
+
+	Args:
+		basis_matrix (np.ndarray):
+			A 2D NumPy array of shape (n, n) representing a lattice basis, where each column is a basis vector.
+
+		gs_coeff_matrix (np.ndarray):
+			A 2D Numpy array of shape (n, n) representing the Gram-Schmidt coefficients of the basis_matrix.
+			If None, it will be initialized internally.
+
+		gs_squared_norms (np.ndarray):
+			A 1D Numpy array of shape (n,) representing squared lengths of the Gram-Schmidt vectors of the basis_matrix.
+			If None, it will be initialized internally.
+
+		start_stage (int):
+			The index of the basis vector from which the reduction process begins.
+
+		Lovasz_cond_param (float):
+			The Lovasz condition parameter (typically in ]1/2, 1[) used in the deep insertion test.
+
+		f_c (bool):
+			A flag used to track floating-point precision issues. If set to True and a precision flaw is detected,
+			the algorithm will backtrack one step or restart from stage 1.
+
+		depth (int):
+			Width of the insertion window (see `insertion_window`). If None, deep insertions are unbounded.
+
+	Returns:
+		(tuple):
+			-basis_matrix (np.ndarray):
+				A 2D Numpy array of shape (n, n) representing a reduced lattice basis, where each column is a basis vector.
+
+			-gs_coeff_matrix (np.ndarray):
+				A 2D Numpy array of shape (n, n) representing the updated Gram-Schmidt coefficients.
+
+			-gs_squared_norms (np.ndarray):
+				A 1D Numpy array of shape (n,) representing the updated squared lengths of The Gram-Schmidt vectors.
+	"""
+	return reduce_with_insertions(
+		basis_matrix,
+		gs_coeff_matrix,
+		gs_squared_norms,
+		start_stage,
+		Lovasz_cond_param,
+		f_c,
+		depth,
+		deep_insertion_index,
+	)
+
+
+def l3fp_pot(
+	basis_matrix,
+	gs_coeff_matrix=None,
+	gs_squared_norms=None,
+	start_stage=0,
+	Lovasz_cond_param=LOVASZ_CONDITION_PARAM,
+	f_c=False,
+	depth=DEEP_INSERTION_DEPTH,
+):
+	"""Executes the floating-point Potential-LLL (PotLLL) algorithm as presented in
+	*Potential-LLL: A Provably Polynomial Deep Insertion Reduction Algorithm*
+	by F. Fontein, M. Schneider and U. Wagner (2014), with a configurable insertion window.
+
+	Every insertion decreases the potential of the basis by at least the factor `Lovasz_cond_param`,
+	which bounds the number of insertions polynomially, in contrast to unbounded deep insertion.
+
+	Args:
+		basis_matrix (np.ndarray):
+			A 2D NumPy array of shape (n, n) representing a lattice basis, where each column is a basis vector.
+
+		gs_coeff_matrix (np.ndarray):
+			A 2D Numpy array of shape (n, n) representing the Gram-Schmidt coefficients of the basis_matrix.
+			If None, it will be initialized internally.
+
+		gs_squared_norms (np.ndarray):
+			A 1D Numpy array of shape (n,) representing squared lengths of the Gram-Schmidt vectors of the basis_matrix.
+			If None, it will be initialized internally.
+
+		start_stage (int):
+			The index of the basis vector from which the reduction process begins.
+
+		Lovasz_cond_param (float):
+			The reduction parameter (typically in ]1/2, 1[) bounding the potential ratio of an insertion.
+
+		f_c (bool):
+			A flag used to track floating-point precision issues. If set to True and a precision flaw is detected,
+			the algorithm will backtrack one step or restart from stage 1.
+
+		depth (int):
+			Width of the insertion window (see `insertion_window`). If None, insertions are unbounded.
+
+	Returns:
+		(tuple):
+			-basis_matrix (np.ndarray):
+				A 2D Numpy array of shape (n, n) representing a reduced lattice basis, where each column is a basis vector.
+
+			-gs_coeff_matrix (np.ndarray):
+				A 2D Numpy array of shape (n, n) representing the updated Gram-Schmidt coefficients.
+
+			-gs_squared_norms (np.ndarray):
+				A 1D Numpy array of shape (n,) representing the updated squared lengths of The Gram-Schmidt vectors.
+	"""
+	return reduce_with_insertions(
+		basis_matrix,
+		gs_coeff_matrix,
+		gs_squared_norms,
+		start_stage,
+		Lovasz_cond_param,
+		f_c,
+		depth,
+		potential_insertion_index,
+	)
+
+
+def reduce_with_insertions(
+	basis_matrix,
+	gs_coeff_matrix,
+	gs_squared_norms,
+	start_stage,
+	Lovasz_cond_param,
+	f_c,
+	depth,
+	insertion_index,
+):
+	"""Reduction loop shared by `l3fp_deep` and `l3fp_pot`. The loop follows `l3fp`, except that the
+	Lovasz test is replaced by `insertion_index`, which returns the position column `stage` is moved to
+	(or None). After an insertion at position `i`, the Gram-Schmidt data of the columns `0,...,i-1`
+	is still valid and the loop resumes from stage `max(i, 1)`.
+
+	Args:
+		basis_matrix (np.ndarray): Lattice basis of shape (n, n), where each column is a basis vector.
+		gs_coeff_matrix (np.ndarray): Gram-Schmidt coefficients of the basis_matrix, or None.
+		gs_squared_norms (np.ndarray): Gram-Schmidt squared norms of the basis_matrix, or None.
+		start_stage (int): The index of the basis vector from which the reduction process begins.
+		Lovasz_cond_param (float): The Lovasz condition parameter (typically in ]1/2, 1[).
+		f_c (bool): A flag used to track floating-point precision issues.
+		depth (int): Width of the insertion window (see `insertion_window`).
+		insertion_index (callable): Either `deep_insertion_index` or `potential_insertion_index`.
+
+	Returns:
+		(tuple): The reduced basis, its Gram-Schmidt coefficients and its Gram-Schmidt squared norms.
+	"""
+	basis_matrix, gs_coeff_matrix, gs_squared_norms, stage, end_stage = initialize(
+		basis_matrix, gs_coeff_matrix, gs_squared_norms, start_stage
+	)
+
+	observer = observers.OBSERVER
+	if observer is not None:
+		observer.begin("lll", end_stage, start=stage)
+	# Enter reduction loop
+	while stage < end_stage:
+		if observer is not None:
+			observer.begin("gso")
+		# Append / update Gram-Schmidt orthogonalization with current column
+		gs_squared_norms[: stage + 1], gs_coeff_matrix[:, : stage + 1] = gso_step(
+			basis_matrix[:, : stage + 1],
+			gs_coeff_matrix[:, : stage + 1],
+			gs_squared_norms[: stage + 1],
+			stage,
+		)
+		if observer is not None:
+			observer.end("gso")
+			observer.begin("size_reduction")
+
+		# Size reduction step
+		f_c, gs_coeff_matrix, basis_matrix = size_reduction_loop(
+			stage, gs_coeff_matrix, basis_matrix, f_c
+		)
+		if observer is not None:
+			observer.end("size_reduction")
+
+		# Check for cumulated floating-point inaccuracies
+		if f_c:
+			if observer is not None:
+				observer.count("f_c_restarts")
+			f_c = False
+			stage = max(stage - 1, 1)
+			continue
+
+		if observer is not None:
+			observer.begin("deep_insertion")
+		i = insertion_index(gs_coeff_matrix, gs_squared_norms, stage, Lovasz_cond_param, depth)
+		if observer is not None:
+			observer.end("deep_insertion")
+		if i is None:
+			stage += 1
+			if observer is not None:
+				observer.update("lll")
+		else:
+			if observer is not None:
+				observer.begin("swap")
+			# Shift all columns from i to stage one position right. We end up with [..., b_i-1, b_stage, b_i, ..., b_stage-1, b_stage+1, ...]
+			basis_matrix[:, i : stage + 1] = np.roll(basis_matrix[:, i : stage + 1], shift=1, axis=1)
+			if observer is not None:
+				observer.end("swap")
+				observer.count("swaps")
+				if i < stage - 1:
+					observer.count("deep_insertions")
+			stage = max(i, 1)
+
+	if observer is not None:
+		observer.end("lll")
+
+	return basis_matrix, gs_coeff_matrix, gs_squared_norms
@@ -1,8 +1,10 @@
 import numpy as np
 
+from bkz import observers
 from bkz.L3FP.delete_zero import delete_zero_vector
 from bkz.L3FP.gsofp_se import gso_step
 from bkz.L3FP.initializer import initialize
+from bkz.L3FP.L3fp_deep import deep_insertion_index
 from bkz.L3FP.L3fp_params import LOVASZ_CONDITION_PARAM
 from bkz.L3FP.reducer import size_reduction_loop
 
@@ -14,6 +16,7 @@ def l3fp_deep_insert(
 	start_stage,
 	Lovasz_cond_param=LOVASZ_CONDITION_PARAM,
 	f_c=False,
+	depth=None,
 ):
 	"""Executes the floating-point LLL deep insertion algorithm as presented in:
 	Lattice Basis Reduction: Improved Practical Algorithms and Solving Subset Sum Problems
@@ -51,6 +54,10 @@ def l3fp_deep_insert(
 			A flag used to track floating-point precision issues. If set to True and a precision flaw
 			is detected, the algorithm will backtrack one step or restart from stage 1.
 
+		depth (int):
+			Width of the deep insertion window (see `L3fp_deep.insertion_window`). If None (default),
+			every position before the current stage is considered.
+
 	Returns:
 		(tuple):
 			-injected_basis_matrix (np.ndarray):
@@ -66,6 +73,7 @@ def l3fp_deep_insert(
 		injected_basis_matrix, gs_coeff_matrix, gs_squared_norms, start_stage
 	)
 
+	observer = observers.OBSERVER
 	# Enter reduction loop
 	while stage < end_stage:
 		# Append / update Gram-Schmidt orthogonalization with current column
@@ -89,34 +97,27 @@ def l3fp_deep_insert(
 
 		# Zero vector check (appears at some point if spanning matrix has linear dependencies between columns)
 		if np.all(injected_basis_matrix[:, stage] == 0):
+			if observer is not None:
+				observer.begin("delete_zero", stage=stage)
 			injected_basis_matrix, gs_squared_norms, gs_coeff_matrix = delete_zero_vector(
 				injected_basis_matrix, gs_squared_norms, gs_coeff_matrix, stage
 			)
+			if observer is not None:
+				observer.end("delete_zero")
 			# After deleting zero vector we back up to stage 1 to ensure correct structure for GSO
 			stage = 1
 			end_stage -= 1
 			continue
 
-		# Deep insertion loop
-		temp_gs_squared_norm = np.dot(
-			injected_basis_matrix[:, stage], injected_basis_matrix[:, stage]
-		)
-		i = 0
-		re_ordered = False
-		while i < stage:
-			if Lovasz_cond_param * gs_squared_norms[i] <= temp_gs_squared_norm:
-				temp_gs_squared_norm -= (gs_coeff_matrix[i, stage] ** 2) * gs_squared_norms[i]
-				i += 1
-			else:
-				# Shift all columns from i to stage one position right. We end up with [..., b_i-1, b_stage, b_i, ..., b_stage-1, b_stage+1, ...]
-				injected_basis_matrix[:, i : stage + 1] = np.roll(
-					injected_basis_matrix[:, i : stage + 1], shift=1, axis=1
-				)
-				re_ordered = True
-				stage = max(i - 1, 1)
-				break
-
-		if not re_ordered:
+		# Deep insertion test (projected lengths are derived from the Gram-Schmidt data)
+		i = deep_insertion_index(gs_coeff_matrix, gs_squared_norms, stage, Lovasz_cond_param, depth)
+		if i is None:
 			stage += 1
+		else:
+			# Shift all columns from i to stage one position right. We end up with [..., b_i-1, b_stage, b_i, ..., b_stage-1, b_stage+1, ...]
+			injected_basis_matrix[:, i : stage + 1] = np.roll(
+				injected_basis_matrix[:, i : stage + 1], shift=1, axis=1
+			)
+			stage = max(i - 1, 1)
 
 	return injected_basis_matrix, gs_coeff_matrix, gs_squared_norms
@@ -8,6 +8,12 @@ SIZE_REDUCTION_CONDITION_PARAM = 1 / 2
 
 TAU = 40
 
+# Progressive schedule of Lovasz condition parameters for LLL preprocessing (last entry = target)
+LOVASZ_SCHEDULE = (1 / 2, LOVASZ_CONDITION_PARAM)
+
+# Insertion window of the depth-bounded deep insertion variants (None = unbounded)
+DEEP_INSERTION_DEPTH = 5
+
 
 def update_tau(basis_matrix, precision_level="default"):
 	"""Calls compute_tau and updates the module-global TAU.
@@ -0,0 +1,10 @@
+from bkz.L3FP.L3fp import l3fp
+from bkz.L3FP.L3fp_all_swap import l3fp_all_swap
+from bkz.L3FP.L3fp_deep import l3fp_deep, l3fp_pot
+
+LLL_ALGORITHMS = {
+    "1": l3fp,
+    "2": l3fp_all_swap,
+    "3": l3fp_deep,
+    "4": l3fp_pot,
+}
@@ -0,0 +1,142 @@
+import numpy as np
+
+
+def lovasz_violations(gs_coeff_matrix, gs_squared_norms, Lovasz_cond_param):
+	"""Tests the Lovasz condition for all pairs of neighbouring columns at once.
+
+	Args:
+		gs_coeff_matrix (np.ndarray):
+			A 2D NumPy array of shape (m, m) representing the Gram-Schmidt coefficients.
+
+		gs_squared_norms (np.ndarray):
+			A 1D NumPy array of shape (m,) representing the squared lengths of the Gram-Schmidt vectors.
+
+		Lovasz_cond_param (float):
+			The Lovasz condition parameter (typically in ]1/2, 1[).
+
+	Returns:
+		(np.ndarray):
+			A boolean 1D NumPy array of shape (m-1,) whose entry `i` is True if the pair `(i, i+1)` violates the Lovasz condition.
+	"""
+	lower = np.arange(len(gs_squared_norms) - 1)
+	return Lovasz_cond_param * gs_squared_norms[lower] > (
+		gs_squared_norms[lower + 1] + gs_coeff_matrix[lower, lower + 1] ** 2 * gs_squared_norms[lower]
+	)
+
+
+def first_lovasz_violation(gs_coeff_matrix, gs_squared_norms, Lovasz_cond_param):
+	"""Returns the first stage at which an LLL pass with parameter `Lovasz_cond_param` has to start.
+	All columns before the returned stage are size-reduced and satisfy the Lovasz condition, so their
+	Gram-Schmidt data can be reused as is.
+
+	Args:
+		gs_coeff_matrix (np.ndarray): Gram-Schmidt coefficients of shape (m, m) of a size-reduced basis.
+		gs_squared_norms (np.ndarray): Gram-Schmidt squared norms of shape (m,).
+		Lovasz_cond_param (float): The Lovasz condition parameter (typically in ]1/2, 1[).
+
+	Returns:
+		(int): The smallest `stage` such that the pair `(stage-1, stage)` violates the Lovasz condition, or m if there is none.
+	"""
+	violated = np.flatnonzero(lovasz_violations(gs_coeff_matrix, gs_squared_norms, Lovasz_cond_param))
+	if violated.size == 0:
+		return len(gs_squared_norms)
+	return int(violated[0]) + 1
+
+
+def lovasz_satisfied_fraction(gs_coeff_matrix, gs_squared_norms, Lovasz_cond_param):
+	"""Computes the fraction of neighbouring column pairs that satisfy the Lovasz condition.
+
+	Args:
+		gs_coeff_matrix (np.ndarray): Gram-Schmidt coefficients of shape (m, m).
+		gs_squared_norms (np.ndarray): Gram-Schmidt squared norms of shape (m,).
+		Lovasz_cond_param (float): The Lovasz condition parameter (typically in ]1/2, 1[).
+
+	Returns:
+		(float): Fraction in [0, 1]. A basis with a single column counts as fully reduced.
+	"""
+	violations = lovasz_violations(gs_coeff_matrix, gs_squared_norms, Lovasz_cond_param)
+	if violations.size == 0:
+		return 1.0
+	return 1.0 - np.count_nonzero(violations) / violations.size
+
+
+def run_delta_schedule(
+	lll_reduce,
+	basis_matrix,
+	delta_schedule,
+	early_exit=None,
+	gs_coeff_matrix=None,
+	gs_squared_norms=None,
+	start_stage=0,
+	f_c=False,
+):
+	"""Runs an LLL algorithm with a progressive schedule of Lovasz condition parameters, e.g. `(0.5, 0.75, 0.99)`.
+	Cheap passes with small parameters perform most of the swaps, so the expensive final pass starts
+	from an almost reduced basis. Each pass reuses the Gram-Schmidt data of the previous one: it starts
+	at the first stage whose Lovasz condition is violated for the new parameter (and is skipped if there is none).
+
+	Args:
+		lll_reduce (callable):
+			An LLL algorithm with the signature of `l3fp`, e.g. an entry of `LLL_ALGORITHMS`.
+
+		basis_matrix (np.ndarray):
+			A 2D NumPy array of shape (n, n) representing a lattice basis, where each column is a basis vector.
+
+		delta_schedule (Sequence[float]):
+			Increasing Lovasz condition parameters, one per pass. The last entry is the target parameter.
+
+		early_exit (float):
+			If given, the remaining passes are skipped as soon as this fraction (in ]0, 1]) of neighbouring
+			column pairs satisfies the Lovasz condition for the target parameter. Intended for callers such as
+			the BKZ drivers that only need near-LLL quality. The returned basis is always size-reduced and
+			reduced with respect to the parameter of the last executed pass.
+
+		gs_coeff_matrix (np.ndarray):
+			Gram-Schmidt coefficients passed to the first pass (see `l3fp`).
+
+		gs_squared_norms (np.ndarray):
+			Gram-Schmidt squared norms passed to the first pass (see `l3fp`).
+
+		start_stage (int):
+			The index of the basis vector from which the first pass begins.
+
+		f_c (bool):
+			A flag used to track floating-point precision issues, passed to the first pass.
+
+	Returns:
+		(tuple):
+			-basis_matrix (np.ndarray):
+				A 2D Numpy array of shape (n, n) representing the reduced lattice basis.
+
+			-gs_coeff_matrix (np.ndarray):
+				A 2D Numpy array of shape (n, n) representing the updated Gram-Schmidt coefficients.
+
+			-gs_squared_norms (np.ndarray):
+				A 1D Numpy array of shape (n,) representing the updated squared lengths of The Gram-Schmidt vectors.
+	"""
+	for pass_index, delta in enumerate(delta_schedule):
+		if pass_index > 0:
+			start_stage = first_lovasz_violation(gs_coeff_matrix, gs_squared_norms, delta)
+			if start_stage == len(gs_squared_norms):
+				continue
+			gs_coeff_matrix = gs_coeff_matrix[:start_stage, :start_stage]
+			gs_squared_norms = gs_squared_norms[:start_stage]
+
+		basis_matrix, gs_coeff_matrix, gs_squared_norms = lll_reduce(
+			basis_matrix,
+			gs_coeff_matrix=gs_coeff_matrix,
+			gs_squared_norms=gs_squared_norms,
+			start_stage=start_stage,
+			Lovasz_cond_param=delta,
+			f_c=f_c,
+		)
+		f_c = False
+
+		if (
+			early_exit is not None
+			and lovasz_satisfied_fraction(gs_coeff_matrix, gs_squared_norms, delta_schedule[-1])
+			>= early_exit
+		):
+			break
+
+	return basis_matrix, gs_coeff_matrix, gs_squared_norms
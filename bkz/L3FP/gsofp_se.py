@@ -52,3 +52,120 @@ def gso_step(basis_slice, gs_coeff_matrix, gs_squared_norms, stage):
 	gs_coeff_matrix[stage, stage] = 1.0  # Diagonal elements should be 1 (by definition)
 
 	return gs_squared_norms[: stage + 1], gs_coeff_matrix[:, : stage + 1]
+
+
+def gso_step_banded(basis_slice, gs_coeff_matrix, gs_squared_norms, stage, supports):
+	"""Structure-aware counterpart of `gso_step` for bases whose columns have short row supports
+	(see `detect_supports`), such as q-ary bases. The Gram-Schmidt vector `b*_j` lies in the span of the columns
+	`0,...,j`, so `gs_coeff_matrix[j, stage]` vanishes as long as the joint support of these columns is disjoint
+	from the support of column `stage`; those coefficients are set to zero without any computation. The remaining
+	inner products are restricted to the rows where both supports overlap, and the correction terms are
+	accumulated with a single dot product over the non-vanishing coefficients.
+
+	Args:
+		basis_slice (np.ndarray):
+			2D NumPy array of shape (n, stage + 1) corresponding the slice of basis_matrix.
+
+		gs_coeff_matrix (np.ndarray):
+			A 2D NumPy array of shape (m, stage + 1), representing the Gram-Schmidt
+			coefficients. Values at index `stage` may not be up to date.
+
+		gs_squared_norms (np.ndarray):
+			A 1D NumPy array of shape (stage + 1,), representing the squared lengths of the
+			Gram-Schmidt vectors. The value at index `stage` may not be up to date.
+
+		stage (int):
+			The index of the column whose Gram-Schmidt data is computed.
+
+		supports (np.ndarray):
+			A 2D integer NumPy array of shape (2, stage + 1) with the row supports `[lo, hi)` of the columns.
+
+	Returns:
+		(tuple):
+			- gs_squared_norms (np.ndarray):
+				Gram-Schmidt squared norms with updated value(s) at index `stage` (and index 0 if `stage == 1`).
+
+			- gs_coeff_matrix (np.ndarray):
+				Gram-Schmidt coefficient matrix with updated values in column `stage`.
+	"""
+	if stage == 1:
+		first_column = basis_slice[supports[0, 0] : supports[1, 0], 0]
+		gs_squared_norms[0] = np.dot(first_column, first_column)
+
+	lo, hi = supports[0, stage], supports[1, stage]
+	column = basis_slice[lo:hi, stage]
+	gs_squared_norms[stage] = np.dot(column, column)
+
+	# First index j whose joint support with the preceding columns overlaps the support of column stage
+	prefix_lo = np.minimum.accumulate(supports[0, :stage])
+	prefix_hi = np.maximum.accumulate(supports[1, :stage])
+	overlapping = np.flatnonzero((prefix_lo < hi) & (prefix_hi > lo))
+	first = overlapping[0] if overlapping.size > 0 else stage
+
+	gs_coeff_matrix[:first, stage] = 0.0
+	for j in range(first, stage):
+		row_lo, row_hi = max(lo, supports[0, j]), min(hi, supports[1, j])
+		dot_product = 0.0
+		if row_lo < row_hi:
+			dot_product = np.dot(basis_slice[row_lo:row_hi, stage], basis_slice[row_lo:row_hi, j])
+		correction_term = np.dot(
+			gs_coeff_matrix[first:j, j] * gs_squared_norms[first:j], gs_coeff_matrix[first:j, stage]
+		)
+		gs_coeff_matrix[j, stage] = (dot_product - correction_term) / gs_squared_norms[j]
+		gs_squared_norms[stage] -= (gs_coeff_matrix[j, stage] ** 2) * gs_squared_norms[j]
+
+	gs_coeff_matrix[stage, stage] = 1.0
+
+	return gs_squared_norms[: stage + 1], gs_coeff_matrix[:, : stage + 1]
+
+
+def gso_full(basis_matrix):
+	"""Computes the complete Gram-Schmidt orthogonalization of a basis in one vectorized step.
+	Instead of appending one column at a time as `gso_step` does, the Gram-Schmidt data is
+	read from the R-factor of a QR decomposition `basis_matrix = QR`, where
+	`gs_squared_norms[i] = R[i, i]^2` and `gs_coeff_matrix[j, i] = R[j, i] / R[j, j]`.
+
+	Args:
+		basis_matrix (np.ndarray):
+			A 2D NumPy array of shape (n, m), where m<=n, whose columns are linearly independent.
+
+	Returns:
+		(tuple):
+			- gs_squared_norms (np.ndarray):
+				A 1D NumPy array of shape (m,) representing the squared lengths of the Gram-Schmidt vectors.
+
+			- gs_coeff_matrix (np.ndarray):
+				A 2D NumPy array of shape (m, m) representing the (upper triangular) Gram-Schmidt coefficients,
+				with ones on the diagonal.
+	"""
+	r_factor = np.linalg.qr(basis_matrix.astype(np.float64), mode="r")
+	diagonal = np.diag(r_factor).copy()
+	gs_squared_norms = diagonal**2
+	gs_coeff_matrix = np.triu(r_factor / diagonal[:, None])
+	np.fill_diagonal(gs_coeff_matrix, 1.0)
+
+	return gs_squared_norms, gs_coeff_matrix
+
+
+def projected_squared_norms(gs_coeff_matrix, gs_squared_norms, stage):
+	"""Computes the squared lengths of the projections of column `stage` orthogonally to the
+	first `i` basis vectors, for every `i < stage`, from Gram-Schmidt data that is already up to date.
+	The values satisfy `||pi_i(b_stage)||^2 = gs_squared_norms[stage] + sum_{l=i}^{stage-1} gs_coeff_matrix[l, stage]^2 * gs_squared_norms[l]`,
+	so no inner products of the (ambient) basis vectors are needed.
+
+	Args:
+		gs_coeff_matrix (np.ndarray):
+			A 2D NumPy array of shape (m, m) representing the Gram-Schmidt coefficients. Column `stage` must be up to date.
+
+		gs_squared_norms (np.ndarray):
+			A 1D NumPy array of shape (m,) representing the squared lengths of the Gram-Schmidt vectors.
+
+		stage (int):
+			The index of the basis vector whose projections are computed.
+
+	Returns:
+		(np.ndarray):
+			A 1D NumPy array of shape (stage,) whose entry `i` is `||pi_i(b_stage)||^2`.
+	"""
+	terms = gs_coeff_matrix[:stage, stage] ** 2 * gs_squared_norms[:stage]
+	return gs_squared_norms[stage] + np.cumsum(terms[::-1])[::-1]
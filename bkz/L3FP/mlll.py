@@ -0,0 +1,89 @@
+import numpy as np
+
+from bkz.L3FP.L3fp_deep_insertion import l3fp_deep_insert
+from bkz.L3FP.L3fp_params import LOVASZ_CONDITION_PARAM
+
+
+def column_chunks(generating_matrix, chunk_size):
+	"""Splits a generating set into chunks of columns.
+
+	Args:
+		generating_matrix (np.ndarray | Iterable[np.ndarray]):
+			A 2D NumPy array of shape (n, m) whose columns generate the lattice, or an iterable of
+			2D arrays of shape (n, m_i) (e.g. read lazily from disk), which is passed through unchanged.
+
+		chunk_size (int):
+			Number of columns per chunk for array inputs. If None, the whole array is a single chunk.
+
+	Yields:
+		(np.ndarray): A 2D NumPy array of shape (n, m_i).
+	"""
+	if not isinstance(generating_matrix, np.ndarray):
+		yield from generating_matrix
+		return
+	width = generating_matrix.shape[1]
+	step = width if chunk_size is None else chunk_size
+	for start in range(0, width, max(step, 1)):
+		yield generating_matrix[:, start : start + step]
+
+
+def mlll(generating_matrix, Lovasz_cond_param=LOVASZ_CONDITION_PARAM, chunk_size=None):
+	"""Executes the modified LLL algorithm (MLLL) for linearly dependent generating sets as described in
+	*A modification of the LLL reduction algorithm* by M. Pohst (1987).
+
+	The generating vectors are appended to the current reduced basis one chunk at a time and reduced with
+	`l3fp_deep_insert`, which starts at the first new column and removes the zero vectors created by linear
+	dependencies with `delete_zero_vector`. Only the current basis (at most `rank` columns) and one chunk are held in
+	memory, so wide generating sets can be streamed. Zero columns are filtered out before they enter the reduction.
+
+	Args:
+		generating_matrix (np.ndarray | Iterable[np.ndarray]):
+			A 2D integer NumPy array of shape (n, m) whose columns generate the lattice (m may exceed the rank),
+			or an iterable of 2D arrays of shape (n, m_i) holding the generating vectors chunk by chunk.
+
+		Lovasz_cond_param (float):
+			The Lovasz condition parameter (typically in ]1/2, 1[).
+
+		chunk_size (int):
+			Number of generating vectors appended per reduction round for array inputs. If None, all columns are
+			reduced in one round.
+
+	Returns:
+		(tuple):
+			-basis_matrix (np.ndarray):
+				A 2D Numpy array of shape (n, rank) representing an LLL-reduced basis of the generated lattice.
+
+			-gs_coeff_matrix (np.ndarray):
+				A 2D Numpy array of shape (rank, rank) representing the Gram-Schmidt coefficients of the basis.
+
+			-gs_squared_norms (np.ndarray):
+				A 1D Numpy array of shape (rank,) representing the squared lengths of the Gram-Schmidt vectors.
+
+			-rank (int):
+				The rank of the generated lattice.
+	"""
+	basis_matrix = None
+	gs_coeff_matrix = np.zeros((0, 0))
+	gs_squared_norms = np.zeros(0)
+	rank = 0
+
+	for chunk in column_chunks(generating_matrix, chunk_size):
+		chunk = chunk[:, np.any(chunk != 0, axis=0)]
+		if chunk.shape[1] == 0:
+			continue
+		spanning_matrix = chunk if basis_matrix is None else np.hstack((basis_matrix, chunk))
+		basis_matrix, gs_coeff_matrix, gs_squared_norms = l3fp_deep_insert(
+			spanning_matrix,
+			gs_coeff_matrix[:rank, :rank],
+			gs_squared_norms[:rank],
+			start_stage=rank,
+			Lovasz_cond_param=Lovasz_cond_param,
+		)
+		rank = basis_matrix.shape[1]
+		# A single remaining column is never visited by the reduction loop
+		gs_squared_norms[0] = np.dot(basis_matrix[:, 0], basis_matrix[:, 0])
+
+	if basis_matrix is None:
+		raise ValueError("The generating set contains no nonzero vector.")
+
+	return basis_matrix, gs_coeff_matrix, gs_squared_norms, rank
@@ -1,7 +1,11 @@
-from bkz.L3FP.L3fp_params import SIZE_REDUCTION_CONDITION_PARAM, TAU
+import numpy as np
 
+from bkz.L3FP import L3fp_params
+from bkz.L3FP.L3fp_params import SIZE_REDUCTION_CONDITION_PARAM
+from bkz.L3FP.structure import merge_supports
 
-def size_reduction_loop(stage, gs_coeff_matrix, spanning_matrix, f_c):
+
+def size_reduction_loop(stage, gs_coeff_matrix, spanning_matrix, f_c, supports=None):
 	"""Performs size reduction on the specified column of the Gram-Schmidt coefficient matrix.
 	This function iterates over the Gram-Schmidt coefficients of the column indexed by `stage`,
 	checking whether each coefficient satisfies the size reduction condition. If the absolute
@@ -22,6 +26,11 @@ def size_reduction_loop(stage, gs_coeff_matrix, spanning_matrix, f_c):
 	    f_c (bool):
 	        A flag used to track floating-point precision issues.
 
+	    supports (np.ndarray):
+	        Optional 2D integer NumPy array of shape (2, m) with the row supports `[lo, hi)` of the columns
+	        (see `detect_supports`). If given, only the rows in the support of the subtracted column are
+	        updated, and the support of column `stage` is updated in place.
+
 	Returns:
 	    (tuple):
 	        - f_c (bool): A flag used to track floating-point precision issues.
@@ -32,14 +41,17 @@ def size_reduction_loop(stage, gs_coeff_matrix, spanning_matrix, f_c):
 	"""
 	for i in range(stage - 1, -1, -1):
 		if abs(gs_coeff_matrix[i, stage]) > SIZE_REDUCTION_CONDITION_PARAM:
-			f_c, gs_coeff_matrix[:, stage], spanning_matrix[:, stage] = reduce(
+			rows = slice(None) if supports is None else slice(supports[0, i], supports[1, i])
+			f_c, gs_coeff_matrix[:, stage], spanning_matrix[rows, stage] = reduce(
 				f_c,
 				gs_coeff_matrix[:, stage],
 				gs_coeff_matrix[:, i],
-				spanning_matrix[:, stage],
-				spanning_matrix[:, i],
+				spanning_matrix[rows, stage],
+				spanning_matrix[rows, i],
 				i,
 			)
+			if supports is not None:
+				merge_supports(supports, stage, i)
 		# This part of the algorithm documentation is a bit unclear.
 		# END if |gs_coeff_matrix[i, stage]|
 		# if abs(gs_coeff_matrix[i, stage]) < 1e-10:
@@ -48,6 +60,99 @@ def size_reduction_loop(stage, gs_coeff_matrix, spanning_matrix, f_c):
 	return f_c, gs_coeff_matrix, spanning_matrix
 
 
+def size_reduce_entry(stage, index, gs_coeff_matrix, spanning_matrix, f_c, supports=None):
+	"""Size-reduces a single Gram-Schmidt coefficient `gs_coeff_matrix[index, stage]`.
+	This is the lazy counterpart of `size_reduction_loop`: the Lovasz test only needs
+	`gs_coeff_matrix[stage - 1, stage]`, and reducing column `stage` by column `stage - 1` first is
+	exactly what `size_reduction_loop` does, so the outcome of the Lovasz test is unchanged.
+
+	Args:
+	    stage (int): The index of the basis vector that is currently under investigation.
+
+	    index (int): The row of the Gram-Schmidt coefficient to reduce (`index < stage`).
+
+	    gs_coeff_matrix (np.ndarray):
+	        A 2D NumPy array of shape (m, m) representing the Gram-Schmidt coefficients
+	        of the spanning_matrix.
+
+	    spanning_matrix (np.ndarray):
+	        A 2D NumPy array of shape (n, m), where n<=m, representing a vector space
+	        (which correspond to basis_matrix or injected_basis_matrix).
+
+	    f_c (bool):
+	        A flag used to track floating-point precision issues.
+
+	    supports (np.ndarray):
+	        Optional 2D integer NumPy array of shape (2, m) with the row supports `[lo, hi)` of the columns
+	        (see `detect_supports`). If given, only the rows in the support of the subtracted column are
+	        updated, and the support of column `stage` is updated in place.
+
+	Returns:
+	    (tuple):
+	        - f_c (bool): A flag used to track floating-point precision issues.
+
+	        - gs_coeff_matrix (np.ndarray): Updated Gram-Schmidt coefficient matrix of shape (m, m).
+
+	        - spanning_matrix (np.ndarray): Updated spanning matrix of shape (n, m).
+	"""
+	if abs(gs_coeff_matrix[index, stage]) > SIZE_REDUCTION_CONDITION_PARAM:
+		rows = slice(None) if supports is None else slice(supports[0, index], supports[1, index])
+		f_c, gs_coeff_matrix[:, stage], spanning_matrix[rows, stage] = reduce(
+			f_c,
+			gs_coeff_matrix[:, stage],
+			gs_coeff_matrix[:, index],
+			spanning_matrix[rows, stage],
+			spanning_matrix[rows, index],
+			index,
+		)
+		if supports is not None:
+			merge_supports(supports, stage, index)
+
+	return f_c, gs_coeff_matrix, spanning_matrix
+
+
+def block_size_reduction(block_start, block_stop, gs_coeff_matrix, spanning_matrix, f_c):
+	"""Size-reduces the columns `block_start,...,block_stop-1` against all columns before `block_start`.
+	The rows `block_start - 1,...,0` are processed from the bottom up and each row reduces all columns of
+	the block at once, as in `bulk_size_reduction`. The Gram-Schmidt coefficients between the columns
+	of the block are not affected.
+
+	Args:
+	    block_start (int): Index of the first column of the block.
+
+	    block_stop (int): Index one past the last column of the block.
+
+	    gs_coeff_matrix (np.ndarray):
+	        A 2D NumPy array of shape (m, m) representing the Gram-Schmidt coefficients
+	        of the spanning_matrix.
+
+	    spanning_matrix (np.ndarray):
+	        A 2D NumPy array of shape (n, m), where n<=m, representing a vector space
+	        (which correspond to basis_matrix or injected_basis_matrix).
+
+	    f_c (bool):
+	        A flag used to track floating-point precision issues.
+
+	Returns:
+	    (tuple):
+	        - f_c (bool): A flag used to track floating-point precision issues.
+
+	        - gs_coeff_matrix (np.ndarray): Updated Gram-Schmidt coefficient matrix of shape (m, m).
+
+	        - spanning_matrix (np.ndarray): Updated spanning matrix of shape (n, m).
+	"""
+	for i in range(block_start - 1, -1, -1):
+		mu = np.round(gs_coeff_matrix[i, block_start:block_stop])
+		if not np.any(mu):
+			continue
+		if np.max(np.abs(mu)) > 2 ** (L3fp_params.TAU / 2):
+			f_c = True
+		spanning_matrix[:, block_start:block_stop] -= np.outer(spanning_matrix[:, i], mu)
+		gs_coeff_matrix[: i + 1, block_start:block_stop] -= np.outer(gs_coeff_matrix[: i + 1, i], mu)
+
+	return f_c, gs_coeff_matrix, spanning_matrix
+
+
 def reduce(f_c, gsc_k, gsc_l, spanning_vec_k, spanning_vec_l, l):
 	"""Performs size reduction by subtracting a multiple of one basis vector from another, updating the corresponding Gram-Schmidt coefficients and spanning vector.
 	This function computes `mu = round(gsc_k[l])` and, if `mu` exceeds a threshold, sets the
@@ -73,7 +178,7 @@ def reduce(f_c, gsc_k, gsc_l, spanning_vec_k, spanning_vec_l, l):
 	"""
 
 	mu = round(gsc_k[l])
-	if abs(mu) > 2 ** (TAU / 2):
+	if abs(mu) > 2 ** (L3fp_params.TAU / 2):
 		f_c = True
 	for j in range(0, l):
 		gsc_k[j] -= mu * gsc_l[j]
@@ -82,3 +187,43 @@ def reduce(f_c, gsc_k, gsc_l, spanning_vec_k, spanning_vec_l, l):
 	spanning_vec_k -= mu * spanning_vec_l
 
 	return f_c, gsc_k, spanning_vec_k
+
+
+def bulk_size_reduction(gs_coeff_matrix, spanning_matrix, f_c):
+	"""Size-reduces every column of the spanning matrix at once.
+	Rows of the Gram-Schmidt coefficient matrix are processed from the bottom up. For row `i`,
+	all columns `k > i` are reduced simultaneously by `round(gs_coeff_matrix[i, k])` times
+	column `i`. Reducing by column `i` only touches rows `0,...,i` of the coefficient matrix, so
+	rows already processed stay size-reduced and one sweep is sufficient.
+
+	Args:
+	    gs_coeff_matrix (np.ndarray):
+	        A 2D NumPy array of shape (m, m) representing the Gram-Schmidt coefficients
+	        of the spanning_matrix.
+
+	    spanning_matrix (np.ndarray):
+	        A 2D NumPy array of shape (n, m), where n<=m, representing a vector space
+	        (which correspond to basis_matrix or injected_basis_matrix).
+
+	    f_c (bool):
+	        A flag used to track floating-point precision issues.
+
+	Returns:
+	    (tuple):
+	        - f_c (bool): A flag used to track floating-point precision issues.
+
+	        - gs_coeff_matrix (np.ndarray): Updated Gram-Schmidt coefficient matrix of shape (m, m).
+
+	        - spanning_matrix (np.ndarray): Updated spanning matrix of shape (n, m).
+	"""
+	width = gs_coeff_matrix.shape[1]
+	for i in range(width - 2, -1, -1):
+		mu = np.round(gs_coeff_matrix[i, i + 1 :])
+		if not np.any(mu):
+			continue
+		if np.max(np.abs(mu)) > 2 ** (L3fp_params.TAU / 2):
+			f_c = True
+		spanning_matrix[:, i + 1 :] -= np.outer(spanning_matrix[:, i], mu)
+		gs_coeff_matrix[: i + 1, i + 1 :] -= np.outer(gs_coeff_matrix[: i + 1, i], mu)
+
+	return f_c, gs_coeff_matrix, spanning_matrix
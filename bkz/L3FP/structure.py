@@ -0,0 +1,60 @@
+import numpy as np
+
+
+def detect_supports(basis_matrix):
+	"""Detects the row supports of the columns of a basis. The support of a column is the
+	interval `[lo, hi)` of rows outside of which all its entries are zero. Bases with structure,
+	such as q-ary bases `[[q I, A], [0, I]]`, have many short supports that the structure-aware
+	routines (`gso_step_banded` and the `supports` argument of the size reduction functions) exploit.
+
+	Args:
+		basis_matrix (np.ndarray):
+			A 2D NumPy array of shape (n, m) whose columns are the basis vectors.
+
+	Returns:
+		(np.ndarray):
+			A 2D integer NumPy array of shape (2, m). Row 0 holds the first row `lo` and row 1 one past the
+			last row `hi` of each column's support. Zero columns get the empty support `[0, 0)`.
+	"""
+	nonzero = basis_matrix != 0
+	n = basis_matrix.shape[0]
+	occupied = nonzero.any(axis=0)
+	lo = np.where(occupied, np.argmax(nonzero, axis=0), 0)
+	hi = np.where(occupied, n - np.argmax(nonzero[::-1], axis=0), 0)
+	return np.vstack((lo, hi)).astype(np.int64)
+
+
+def resolve_supports(basis_matrix, supports):
+	"""Resolves the `supports` argument accepted by the structure-aware reduction routines.
+
+	Args:
+		basis_matrix (np.ndarray): A 2D NumPy array of shape (n, m) whose columns are the basis vectors.
+		supports (np.ndarray | str | None):
+			None for dense reduction, `"detect"` to detect the supports with `detect_supports`,
+			or a declared (2, m) array of supports, which is used as is.
+
+	Returns:
+		(np.ndarray | None): The supports array (shape (2, m)), or None for dense reduction.
+	"""
+	if supports is None:
+		return None
+	if isinstance(supports, str):
+		if supports != "detect":
+			raise ValueError(f"Unknown supports specification '{supports}', expected 'detect' or an array.")
+		return detect_supports(basis_matrix)
+	return supports
+
+
+def merge_supports(supports, target, source):
+	"""Updates the support of column `target` after a multiple of column `source` has been added to it.
+
+	Args:
+		supports (np.ndarray): A 2D integer NumPy array of shape (2, m). Updated in place.
+		target (int): Index of the modified column.
+		source (int): Index of the column that was added.
+	"""
+	if supports[0, target] == supports[1, target]:
+		supports[:, target] = supports[:, source]
+	elif supports[0, source] != supports[1, source]:
+		supports[0, target] = min(supports[0, target], supports[0, source])
+		supports[1, target] = max(supports[1, target], supports[1, source])
@@ -1,9 +1,32 @@
-from bkz.SVPsolvers.enum_schnorr_euchner import enum_se_solver
-from bkz.SVPsolvers.enum_schnorr_euchner_og import enum_se_og_solver
-from bkz.SVPsolvers.enum_schnorr_horner import enum_sh_solver
+from bkz.SVPsolvers.enum_schnorr_euchner import enum_se_kernel, enum_se_solver
+from bkz.SVPsolvers.enum_schnorr_euchner_og import enum_se_og_kernel, enum_se_og_solver
+from bkz.SVPsolvers.enum_schnorr_horner import enum_sh_kernel, enum_sh_solver
+from bkz.SVPsolvers.enum_frontier import enum_frontier_f32_solver, enum_frontier_solver
+from bkz.SVPsolvers.enum_solver import EnumSolver
+from bkz.SVPsolvers.small_block import lagrange_solver, small_enum_solver
 
 ENUM_ALGORITHMS = {
     "1": enum_se_og_solver,
     "2": enum_se_solver,
     "3": enum_sh_solver,
-}
\ No newline at end of file
+    "4": enum_frontier_solver,
+    "5": enum_frontier_f32_solver,
+}
+
+# Solver objects with persistent workspaces, keyed like ENUM_ALGORITHMS (used by the BKZ drivers).
+# The frontier solvers allocate their arrays per level and are used as is.
+ENUM_SOLVERS = {
+    "1": EnumSolver(enum_se_og_kernel),
+    "2": EnumSolver(enum_se_kernel),
+    "3": EnumSolver(enum_sh_kernel),
+    "4": enum_frontier_solver,
+    "5": enum_frontier_f32_solver,
+}
+
+# Dedicated solvers for tiny blocks, keyed by block dimension (dispatched automatically by the BKZ drivers
+# when they run a solver of ENUM_SOLVERS)
+SMALL_BLOCK_SOLVERS = {
+    2: lagrange_solver,
+    3: small_enum_solver,
+    4: small_enum_solver,
+}
@@ -0,0 +1,150 @@
+import numpy as np
+
+from bkz import observers
+
+# Largest number of tree nodes held in one frontier before the enumeration continues depth-first
+MAX_FRONTIER = 2**10
+# Relative inflation of the search radius for low-precision (float32) tree walks, covering their rounding errors
+LOW_PRECISION_RADIUS_INFLATION = 2**-10
+
+
+def level_ranges(coeffs, partial_norms, level, search_radius, gs_squared_norms, gs_coeffs):
+	"""Computes the coefficient ranges of `level` for every node of a frontier. For a node with the
+	coefficients `x_{level+1}, ..., x_k` the center is `c = -sum_j x_j mu_{level, j}` and the candidates
+	are the integers `x` with `(x - c)^2 B_level <= R - partial_norm`. While all higher coefficients are
+	zero only `x >= 0` is considered, because `v` and `-v` have the same norm.
+
+	Args:
+		coeffs (np.ndarray): A 2D array of shape (F, block_size) with the coefficients of the F frontier nodes.
+		partial_norms (np.ndarray): A 1D array of length F with the partial squared norms of the nodes.
+		level (int): Index of the coefficient to expand.
+		search_radius (float): The current (squared) search radius `R`.
+		gs_squared_norms (np.ndarray): A 1D array with the Gram-Schmidt squared norms of the block.
+		gs_coeffs (np.ndarray): A 2D array with the Gram-Schmidt coefficients of the block.
+
+	Returns:
+		(tuple):
+			- centers (np.ndarray): The centers `c` of the nodes.
+			- lower (np.ndarray): The smallest candidate of each node.
+			- counts (np.ndarray): The number of candidates of each node.
+	"""
+	higher = coeffs[:, level + 1 :]
+	centers = -(higher @ gs_coeffs[level, level + 1 :])
+	radii = np.sqrt(np.maximum(search_radius - partial_norms, 0) / gs_squared_norms[level])
+	lower = np.ceil(centers - radii)
+	lower = np.where(higher.any(axis=1), lower, np.maximum(lower, 0))
+	counts = np.maximum(np.floor(centers + radii) - lower + 1, 0).astype(np.int64)
+	return centers, lower, counts
+
+
+def expand_level(coeffs, partial_norms, level, search_radius, gs_squared_norms, ranges):
+	"""Expands every node of a frontier by all candidates of `level` (see `level_ranges`) and keeps
+	the children whose partial squared norm stays below the search radius.
+
+	Args:
+		coeffs (np.ndarray): A 2D array of shape (F, block_size) with the coefficients of the F frontier nodes.
+		partial_norms (np.ndarray): A 1D array of length F with the partial squared norms of the nodes.
+		level (int): Index of the coefficient to expand.
+		search_radius (float): The current (squared) search radius `R`.
+		gs_squared_norms (np.ndarray): A 1D array with the Gram-Schmidt squared norms of the block.
+		ranges (tuple): The `(centers, lower, counts)` of the frontier computed by `level_ranges`.
+
+	Returns:
+		(tuple):
+			- coeffs (np.ndarray): The coefficients of the children, with `level` filled in.
+			- partial_norms (np.ndarray): The partial squared norms of the children.
+	"""
+	centers, lower, counts = ranges
+	parents = np.repeat(np.arange(len(counts)), counts)
+	offsets = np.arange(parents.size) - np.repeat(np.cumsum(counts) - counts, counts)
+	values = lower[parents] + offsets
+	children_norms = partial_norms[parents] + np.square(values - centers[parents]) * gs_squared_norms[level]
+	keep = children_norms < search_radius
+
+	children = coeffs[parents[keep]]
+	children[:, level] = values[keep]
+	return children, children_norms[keep]
+
+
+def enum_frontier_solver(basis_block, gs_squared_norms, gs_coeffs, max_frontier=MAX_FRONTIER, dtype=np.float64):
+	"""Performs shortest vector enumeration breadth-first, one tree level at a time.
+
+	Instead of walking the enumeration tree one scalar node at a time like the Schnorr-Euchner
+	solvers, the whole live frontier is kept as NumPy arrays of partial coefficient vectors and
+	partial squared norms, and each level is expanded and pruned with vectorized operations
+	(`level_ranges` and `expand_level`). The pruning condition is the same as in `enum_se_og_solver`,
+	`tilde_c[t] < search_radius`, so the solver is exact.
+
+	The frontier memory is capped by `max_frontier`: if the next level would exceed it, the frontier
+	is split into chunks (shortest partial norms first) that are enumerated one after another, i.e.
+	depth-first below that level. The search radius shrinks whenever a chunk reaches the leaves,
+	which prunes the remaining chunks.
+
+	With `dtype=np.float32` the tree walk runs in single precision, which halves the memory traffic of the
+	frontier arrays. The pruning radius is inflated by `LOW_PRECISION_RADIUS_INFLATION` so that no candidate
+	is lost to rounding, and the leaves are rescored exactly in float64 before they are compared with
+	the (exact) search radius, so the result is the same as in double precision.
+
+	Args:
+		basis_block (np.ndarray):
+			A 2D array of shape (dimension, block_size) representing the lattice basis vectors of the block.
+		gs_squared_norms (np.ndarray):
+			A 1D array of length `block_size` containing the Gram-Schmidt squared norms of the block.
+		gs_coeffs (np.ndarray):
+			A 2D array of shape (block_size, block_size) containing the Gram-Schmidt coefficients of the block.
+		max_frontier (int):
+			Largest number of nodes expanded in one frontier.
+		dtype (np.dtype):
+			Floating point type of the tree walk, `np.float64` or `np.float32`.
+
+	Returns:
+		(tuple):
+			- search_radius (float): The smallest squared norm found during enumeration.
+			- u (np.ndarray): A 1D array of length `block_size` with the integer coefficient vector of the shortest vector found.
+			  If no vector shorter than `b_0` exists, `search_radius = gs_squared_norms[0]` and `u = e_0`.
+	"""
+	block_size = len(basis_block[0])
+	gs_squared_norms = np.asarray(gs_squared_norms[:block_size], dtype=np.float64)
+	gs_coeffs = np.triu(np.asarray(gs_coeffs[:block_size, :block_size], dtype=np.float64))
+	walk_norms, walk_coeffs = gs_squared_norms.astype(dtype), gs_coeffs.astype(dtype)
+	inflation = 1.0 if dtype == np.float64 else 1.0 + LOW_PRECISION_RADIUS_INFLATION
+	best = [gs_squared_norms[0], np.eye(block_size)[0]]
+	observer = observers.OBSERVER
+	nodes = np.zeros(block_size, dtype=np.int64)  # Expanded nodes per tree level
+
+	def enumerate_frontier(coeffs, partial_norms, level):
+		while level >= 0:
+			walk_radius = dtype(best[0] * inflation)
+			ranges = level_ranges(coeffs, partial_norms, level, walk_radius, walk_norms, walk_coeffs)
+			size = int(ranges[2].sum())
+			if size > max_frontier and len(coeffs) > 1:
+				# Continue depth-first over chunks of the frontier, most promising nodes first
+				order = np.argsort(partial_norms)
+				for chunk in np.array_split(order, -(-size // max_frontier)):
+					enumerate_frontier(coeffs[chunk], partial_norms[chunk], level)
+				return
+			coeffs, partial_norms = expand_level(coeffs, partial_norms, level, walk_radius, walk_norms, ranges)
+			nodes[level] += len(coeffs)
+			if len(coeffs) == 0:
+				return
+			level -= 1
+
+		leaves = coeffs[coeffs.any(axis=1)].astype(np.float64)
+		if len(leaves):
+			# Exact rescoring: ||pi(b)||^2 = sum_t B_t (sum_{j >= t} mu_{t, j} x_j)^2 with mu_{t, t} = 1
+			squared_norms = np.square(leaves @ gs_coeffs.T) @ gs_squared_norms
+			shortest = np.argmin(squared_norms)
+			if squared_norms[shortest] < best[0]:
+				best[0], best[1] = squared_norms[shortest], leaves[shortest]
+
+	enumerate_frontier(np.zeros((1, block_size), dtype=dtype), np.zeros(1, dtype=dtype), block_size - 1)
+	if observer is not None:
+		observer.count_levels("enum_nodes", nodes)
+	return best[0], best[1]
+
+
+def enum_frontier_f32_solver(basis_block, gs_squared_norms, gs_coeffs, max_frontier=MAX_FRONTIER):
+	"""Runs `enum_frontier_solver` with the tree walk in float32 and exact float64 rescoring of the candidates.
+	Arguments and return values are those of `enum_frontier_solver`.
+	"""
+	return enum_frontier_solver(basis_block, gs_squared_norms, gs_coeffs, max_frontier=max_frontier, dtype=np.float32)
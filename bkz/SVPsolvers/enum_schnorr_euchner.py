@@ -1,5 +1,7 @@
 import numpy as np
 
+from bkz.SVPsolvers.enum_solver import allocate_workspace
+
 
 def enum_se_solver(basis_block, gs_squared_norms, gs_coeffs):
     """Performs shortest vector enumeration using the Schnorr–Euchner strategy for
@@ -42,19 +44,33 @@ def enum_se_solver(basis_block, gs_squared_norms, gs_coeffs):
 	    "Lattice basis reduction: Improved practical algorithms and solving subset sum problems",
 	    Mathematical Programming, 1994.
     """
-    k = len(basis_block[0]) - 1
-    tilde_c = np.zeros(k + 2)  # Partial squared norms during enumeration
-    tilde_u = np.zeros(k + 2)  # Stores current coefficient vector
-    u = np.zeros(k +1)  # Best coefficient vector found
-    y = np.zeros(k + 1)  # Stores intermediate projections
-    tri = np.zeros(k + 2)  # Controls stepping during enumeration
-    v = np.zeros(k + 2)  # Stores rounded values of tilde_u
-    delta = np.ones(k + 2)  # Controls direction of stepping
+    block_size = len(basis_block[0])
+    return enum_se_kernel(gs_squared_norms, gs_coeffs, block_size, allocate_workspace(block_size))
+
+
+def enum_se_kernel(gs_squared_norms, gs_coeffs, block_size, workspace):
+    """Enumeration loop of `enum_se_solver` on a preallocated workspace (see `allocate_workspace`).
+    The workspace arrays are reset here, so `EnumSolver` can reuse them across calls.
+    The returned `u` is a view into the workspace.
+    """
+    k = block_size - 1
+    tilde_c = workspace["tilde_c"]  # Partial squared norms during enumeration
+    tilde_u = workspace["tilde_u"]  # Stores current coefficient vector
+    u = workspace["u"]  # Best coefficient vector found
+    y = workspace["y"]  # Stores intermediate projections
+    tri = workspace["tri"]  # Controls stepping during enumeration
+    v = workspace["v"]  # Stores rounded values of tilde_u
+    delta = workspace["delta"]  # Controls direction of stepping
+    nodes = workspace["nodes"]  # Visited nodes per tree level
+    for array in (tilde_c, tilde_u, u, y, tri, v, nodes):
+        array.fill(0)
+    delta.fill(1)
     s, t = 0, 0  # s = max enumeration tree depth reached, t = current index in recursion
     min_squared_norm = gs_squared_norms[0]  # Start with max first squared norm !!!!HOX!!!
     tilde_u[0], u[0] = 1, 1  # Initialize first coefficient
 
     while t <= k:
+        nodes[t] += 1
         #  Compute the squared length of the current enumerated vector using Gram-Schmidt norms.
         # Helps prune out long vectors early.
         tilde_c[t] = tilde_c[t + 1] + np.square(y[t] + tilde_u[t]) * gs_squared_norms[t]
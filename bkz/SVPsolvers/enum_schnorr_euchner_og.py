@@ -1,5 +1,8 @@
 import numpy as np
 
+from bkz.SVPsolvers.enum_solver import allocate_workspace
+
+
 def enum_se_og_solver(basis_block, gs_squared_norms, gs_coeffs):
     """Performs shortest vector enumeration using the *original* Schnorr–Euchner
     	(1991, FCT) strategy on a lattice block.
@@ -53,13 +56,25 @@ def enum_se_og_solver(basis_block, gs_squared_norms, gs_coeffs):
     	      sum problems", *International Symposium on Fundamentals of Computation
     	      Theory (FCT)*, 1991, pp. 68–85.
     	"""
+    block_size = len(basis_block[0])
+    return enum_se_og_kernel(gs_squared_norms, gs_coeffs, block_size, allocate_workspace(block_size))
+
+
+def enum_se_og_kernel(gs_squared_norms, gs_coeffs, block_size, workspace):
+    """Enumeration loop of `enum_se_og_solver` on a preallocated workspace (see `allocate_workspace`).
+    The workspace arrays are reset here, so `EnumSolver` can reuse them across calls.
+    The returned `u` is a view into the workspace.
+    """
     # Step 1 (initiation)
-    k = len(basis_block[0]) - 1 # Fixed for indexing that starts from 0.
+    k = block_size - 1 # Fixed for indexing that starts from 0.
     search_radius = gs_squared_norms[0]
-    tilde_c = np.zeros(k + 2)
-    tilde_u = np.zeros(k + 2)
-    u = np.zeros(k + 1)
-    y = np.zeros(k + 1)
+    tilde_c = workspace["tilde_c"]
+    tilde_u = workspace["tilde_u"]
+    u = workspace["u"]
+    y = workspace["y"]
+    nodes = workspace["nodes"]  # Visited nodes per tree level
+    for array in (tilde_c, tilde_u, u, y, nodes):
+        array.fill(0)
     t = k
     u[0] = 1
 
@@ -72,6 +87,7 @@ def enum_se_og_solver(basis_block, gs_squared_norms, gs_coeffs):
 
     while True:
         # Step 3
+        nodes[t] += 1
         tilde_c[t] = (tilde_c[t + 1] + np.square(y[t] + tilde_u[t]) * gs_squared_norms[t])
         if tilde_c[t] < search_radius:
             if t > 0:
@@ -1,5 +1,7 @@
 import numpy as np
 
+from bkz.SVPsolvers.enum_solver import allocate_workspace
+
 
 def enum_sh_solver(basis_block, gs_squared_norms, gs_coeffs):
 	"""Performs a shortest vector enumeration within a given lattice block using
@@ -43,14 +45,26 @@ def enum_sh_solver(basis_block, gs_squared_norms, gs_coeffs):
 	    EUROCRYPT 1995.
 	"""
 	# Number of columns (dimension of the sublattice) -> the current block size
-	k = len(basis_block[0])
+	block_size = len(basis_block[0])
+	return enum_sh_kernel(gs_squared_norms, gs_coeffs, block_size, allocate_workspace(block_size))
+
+
+def enum_sh_kernel(gs_squared_norms, gs_coeffs, block_size, workspace):
+	"""Enumeration loop of `enum_sh_solver` on a preallocated workspace (see `allocate_workspace`).
+	The workspace arrays are reset here, so `EnumSolver` can reuse them across calls.
+	The returned `u` is a view into the workspace.
+	"""
+	k = block_size
 	# Squared norms of each Gram-Schmidt vectors (used for pruning)
 	# c = gs_squared_norms (in original paper)
-	# Initialize tilde_c, tilde_u, u, y, tri, v with zero entries
-	tilde_c = np.zeros(k + 1)  # Partial squared norms during enumeration
-	tilde_u = np.zeros(k + 1)  # Stores current coefficient vector
-	u = np.zeros(k)  # Best coefficient vector found
-	y = np.zeros(k)  # Stores intermediate projections
+	# Reset tilde_c, tilde_u, u, y to zero entries
+	tilde_c = workspace["tilde_c"]  # Partial squared norms during enumeration
+	tilde_u = workspace["tilde_u"]  # Stores current coefficient vector
+	u = workspace["u"]  # Best coefficient vector found
+	y = workspace["y"]  # Stores intermediate projections
+	nodes = workspace["nodes"]  # Visited nodes per tree level
+	for array in (tilde_c, tilde_u, u, y, nodes):
+		array.fill(0)
 	# Initialize s, t as zero
 	t_max, t = 0, 0  # s = max enumeration tree depth reached, t = current index in recursion
 	# Stores the best/smallest squared norm found so far (notated as "barred_c" in the original paper)
@@ -59,6 +73,7 @@ def enum_sh_solver(basis_block, gs_squared_norms, gs_coeffs):
 
 	# This loop explores all possible integer coefficients of the lattice basis vectors, backtracking if necessary.
 	while t < k:
+		nodes[t] += 1
 		#  Compute the squared length of the current enumerated vector using Gram-Schmidt norms.
 		tilde_c[t] = (
 			tilde_c[t + 1] + np.square(y[t] + tilde_u[t]) * gs_squared_norms[t]
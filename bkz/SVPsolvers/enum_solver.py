@@ -0,0 +1,79 @@
+import numpy as np
+
+from bkz import observers
+
+# Names of the workspace arrays used by the enumeration kernels (`nodes` counts the visited nodes per tree level)
+WORKSPACE_ARRAYS = ("tilde_c", "tilde_u", "u", "y", "tri", "v", "delta", "nodes")
+
+
+def allocate_workspace(block_size):
+	"""Allocates the arrays used by the enumeration kernels for one block size.
+	Every array has length `block_size + 1`, which covers the largest array of all kernels.
+	The kernels reset the arrays they use, so a workspace can be reused for any number of calls.
+
+	Args:
+		block_size (int): Number of basis vectors in the enumerated block.
+
+	Returns:
+		(dict[str, np.ndarray]): The workspace arrays, keyed by the names in `WORKSPACE_ARRAYS`.
+	"""
+	return {name: np.zeros(block_size + 1) for name in WORKSPACE_ARRAYS}
+
+
+class EnumSolver:
+	"""Reusable enumeration solver that keeps preallocated workspaces keyed by block size.
+	BKZ calls its SVP solver once per block with only a few distinct block sizes, so the
+	workspace arrays are allocated once per block size instead of once per call.
+
+	Instances are callable with the signature of the functions in `ENUM_ALGORITHMS`,
+	`solver(basis_block, gs_squared_norms, gs_coeffs)`, so the BKZ drivers can use either.
+
+	Args:
+		kernel (Callable):
+			An enumeration kernel `kernel(gs_squared_norms, gs_coeffs, block_size, workspace)` returning
+			`(search_radius, u)`, e.g. `enum_se_kernel`.
+	"""
+
+	def __init__(self, kernel):
+		self.kernel = kernel
+		self.workspaces = {}
+
+	def workspace(self, block_size):
+		"""Returns the workspace for `block_size`, allocating it on first use."""
+		if block_size not in self.workspaces:
+			self.workspaces[block_size] = allocate_workspace(block_size)
+		return self.workspaces[block_size]
+
+	def solve(self, basis_block, gs_squared_norms, gs_coeffs):
+		"""Solves the SVP in one block.
+
+		Args:
+			basis_block (np.ndarray): A 2D array of shape (dimension, block_size) with the basis vectors of the block.
+			gs_squared_norms (np.ndarray): A 1D array of length `block_size` with the Gram-Schmidt squared norms of the block.
+			gs_coeffs (np.ndarray): A 2D array of shape (block_size, block_size) with the Gram-Schmidt coefficients of the block.
+
+		Returns:
+			(tuple):
+				- search_radius (float): The smallest squared norm found during enumeration.
+				- u (np.ndarray): A 1D array of length `block_size` with the coefficient vector of the shortest vector found.
+				  It is a copy, so it stays valid when the workspace is reused.
+		"""
+		block_size = len(basis_block[0])
+		workspace = self.workspace(block_size)
+		search_radius, u = self.kernel(gs_squared_norms, gs_coeffs, block_size, workspace)
+		if observers.OBSERVER is not None:
+			observers.OBSERVER.count_levels("enum_nodes", workspace["nodes"][:block_size])
+		return search_radius, u.copy()
+
+	__call__ = solve
+
+	def solve_many(self, blocks):
+		"""Solves the SVP in several blocks, reusing the workspaces across all of them.
+
+		Args:
+			blocks (Iterable[tuple]): Tuples `(basis_block, gs_squared_norms, gs_coeffs)` as accepted by `solve`.
+
+		Returns:
+			(list[tuple]): The `(search_radius, u)` results of `solve`, in the order of `blocks`.
+		"""
+		return [self.solve(*block) for block in blocks]
@@ -0,0 +1,103 @@
+import math
+
+import numpy as np
+
+
+def lagrange_solver(basis_block, gs_squared_norms, gs_coeffs):
+	"""Solves the SVP in a 2-dimensional block with the Lagrange (Gauss) reduction algorithm.
+	The reduction runs on the 2x2 Gram matrix derived from the Gram-Schmidt data of the block,
+	`<b_0, b_0> = B_0`, `<b_0, b_1> = mu_01 * B_0` and `<b_1, b_1> = B_1 + mu_01^2 * B_0`,
+	while the coefficient vectors of both reduced vectors are tracked. No NumPy workspace is allocated.
+
+	Args:
+		basis_block (np.ndarray):
+			A 2D array of shape (dimension, 2) representing the lattice basis vectors of the block.
+			Only used for compatibility with the enumeration solvers.
+		gs_squared_norms (np.ndarray):
+			A 1D array of length 2 containing the Gram-Schmidt squared norms of the block.
+		gs_coeffs (np.ndarray):
+			A 2D array of shape (2, 2) containing the (local) Gram-Schmidt coefficients of the block.
+
+	Returns:
+		(tuple):
+			- search_radius (float): The squared norm of the shortest (projected) vector of the block.
+			- u (np.ndarray): A 1D array of length 2 with the integer coefficients of the shortest vector.
+			  If `b_0` is already shortest, `search_radius = gs_squared_norms[0]` and `u = (1, 0)`.
+	"""
+	first_norm = float(gs_squared_norms[0])
+	cross = float(gs_coeffs[0, 1]) * first_norm
+	second_norm = float(gs_squared_norms[1]) + float(gs_coeffs[0, 1]) * cross
+	first, second = (1, 0), (0, 1)
+
+	while True:
+		if second_norm < first_norm:
+			first_norm, second_norm = second_norm, first_norm
+			first, second = second, first
+		q = round(cross / first_norm)
+		if q == 0:
+			break
+		# second <- second - q * first
+		second_norm += q * q * first_norm - 2 * q * cross
+		cross -= q * first_norm
+		second = (second[0] - q * first[0], second[1] - q * first[1])
+		if second_norm >= first_norm:
+			break
+
+	if first[1] == 0 or first_norm >= gs_squared_norms[0]:
+		return gs_squared_norms[0], np.array([1.0, 0.0])
+	return first_norm, np.array(first, dtype=np.float64)
+
+
+def small_enum_solver(basis_block, gs_squared_norms, gs_coeffs):
+	"""Solves the SVP exactly in a block of dimension 3 or 4 (any small dimension works) by a
+	depth-first enumeration on Python scalars. For such tiny blocks the setup of the NumPy
+	workspaces of the general solvers costs more than the search itself, so the coefficient ranges
+	`|u_t + y_t| <= sqrt((R - c_t) / B_t)` of every level are enumerated directly, shrinking the
+	search radius `R` whenever a shorter nonzero vector is found.
+
+	Args:
+		basis_block (np.ndarray):
+			A 2D array of shape (dimension, block_size) representing the lattice basis vectors of the block.
+			Only used for compatibility with the enumeration solvers.
+		gs_squared_norms (np.ndarray):
+			A 1D array of length `block_size` containing the Gram-Schmidt squared norms of the block.
+		gs_coeffs (np.ndarray):
+			A 2D array of shape (block_size, block_size) containing the (local) Gram-Schmidt coefficients of the block.
+
+	Returns:
+		(tuple):
+			- search_radius (float): The squared norm of the shortest (projected) vector of the block.
+			- u (np.ndarray): A 1D array of length `block_size` with the integer coefficients of the shortest vector.
+			  If `b_0` is already shortest, `search_radius = gs_squared_norms[0]` and `u = e_0`.
+	"""
+	dim = len(gs_squared_norms)
+	norms = np.asarray(gs_squared_norms, dtype=np.float64).tolist()
+	mu = np.asarray(gs_coeffs[:dim, :dim], dtype=np.float64).tolist()
+	coeffs = [0] * dim
+	best = [norms[0], [1] + [0] * (dim - 1)]
+
+	def search(t, partial_norm, leading_zeros):
+		center = -sum(coeffs[j] * mu[t][j] for j in range(t + 1, dim))
+		remaining = best[0] - partial_norm
+		if remaining <= 0:
+			return
+		radius = math.sqrt(remaining / norms[t])
+		# While all higher coefficients are zero, v and -v are both reachable, so only x >= 0 is enumerated
+		low = max(math.ceil(center - radius), 0) if leading_zeros else math.ceil(center - radius)
+		# Closest candidates first, so the search stops at the first one that is too long
+		for x in sorted(range(low, math.floor(center + radius) + 1), key=lambda x: abs(x - center)):
+			norm = partial_norm + (x - center) ** 2 * norms[t]
+			if norm >= best[0]:
+				break
+			coeffs[t] = x
+			if t > 0:
+				search(t - 1, norm, leading_zeros and x == 0)
+			elif any(coeffs):
+				best[0], best[1] = norm, coeffs.copy()
+		coeffs[t] = 0
+
+	search(dim - 1, 0.0, True)
+
+	if best[1][0] in (1, -1) and not any(best[1][1:]):
+		return gs_squared_norms[0], np.eye(dim)[0]
+	return best[0], np.array(best[1], dtype=np.float64)
@@ -1,8 +1,14 @@
-from bkz.bkz_schnorr_euchner import bkz_se
-from bkz.bkz_schnorr_euchner_progress_check import bkz_se_pc
+from bkz.bkz_schnorr_euchner import bkz_se, bkz_se_steps
+from bkz.bkz_schnorr_euchner_progress_check import bkz_se_pc, bkz_se_pc_steps
 
 
 BKZ_ALGORITHMS = {
     "1": bkz_se_pc,
     "2": bkz_se,
-}
\ No newline at end of file
+}
+
+# Generator cores of the BKZ_ALGORITHMS entries (see `bkz_stream.iter_bkz`)
+BKZ_STEPS = {
+    "1": bkz_se_pc_steps,
+    "2": bkz_se_steps,
+}
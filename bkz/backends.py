@@ -0,0 +1,228 @@
+import numpy as np
+
+from bkz.bkz_params import BKZ_FINAL_LOVASZ_PARAM
+from bkz.L3FP.L3fp_params import LOVASZ_CONDITION_PARAM
+from bkz.local_block import refresh_gso
+
+try:
+	import fpylll
+except ImportError:  # fpylll is only needed for the fpylll backend
+	fpylll = None
+
+# Scale of the integer Gram matrices handed to the fpylll enumeration (largest entry ~ 2^GRAM_SCALE_BITS)
+GRAM_SCALE_BITS = 40
+
+
+def require_fpylll():
+	"""Raises an ImportError if fpylll is not installed."""
+	if fpylll is None:
+		raise ImportError("The fpylll backend requires the fpylll package (pip install fpylll).")
+
+
+def integer_rows(matrix):
+	"""Rounds a matrix with integral entries to int64 and returns its rows as lists of Python ints, the input of
+	`fpylll.IntegerMatrix.from_matrix`. fpylll has no constructor from a NumPy buffer, so every entry becomes a
+	Python int; this list conversion is about twice as fast as handing over the array itself (which fpylll reads
+	entry by entry) and takes about 20 ms for a 200 x 200 matrix, little next to a reduction of that dimension.
+
+	Args:
+		matrix (np.ndarray): A 2D NumPy array with integral entries.
+
+	Returns:
+		(list[list[int]]): The rows of the matrix.
+	"""
+	rounded = np.rint(matrix)
+	if rounded.size and np.abs(rounded).max() >= 2.0**63:
+		raise OverflowError("Matrix entries of 2^63 or more do not fit into int64 for the conversion to fpylll.")
+	return rounded.astype(np.int64).tolist()
+
+
+def to_integer_matrix(basis_matrix):
+	"""Converts a basis with the basis vectors as columns into an fpylll `IntegerMatrix` (basis vectors as rows),
+	see `integer_rows` for the cost of the conversion.
+
+	Args:
+		basis_matrix (np.ndarray): A 2D NumPy array of shape (n, m) with integral entries, where each column is a basis vector.
+
+	Returns:
+		(fpylll.IntegerMatrix): An m x n integer matrix whose rows are the basis vectors.
+	"""
+	require_fpylll()
+	return fpylll.IntegerMatrix.from_matrix(integer_rows(basis_matrix.T))
+
+
+def from_integer_matrix(integer_matrix):
+	"""Converts an fpylll `IntegerMatrix` (basis vectors as rows) into a float64 basis with the basis vectors as columns.
+
+	Args:
+		integer_matrix (fpylll.IntegerMatrix): An m x n integer matrix whose rows are the basis vectors.
+
+	Returns:
+		(np.ndarray): A 2D NumPy array of shape (n, m), where each column is a basis vector.
+	"""
+	rows = np.zeros((integer_matrix.nrows, integer_matrix.ncols), dtype=np.int64)
+	integer_matrix.to_matrix(rows)
+	return rows.T.astype(np.float64)
+
+
+def fpylll_lll(
+	basis_matrix,
+	gs_coeff_matrix=None,
+	gs_squared_norms=None,
+	start_stage=0,
+	Lovasz_cond_param=LOVASZ_CONDITION_PARAM,
+	f_c=False,
+):
+	"""LLL-reduces a basis with fpylll's `LLL.reduction`, with the signature of `l3fp`.
+	The Gram-Schmidt data of the result is recomputed with `refresh_gso`, which also size-reduces
+	the basis and runs `l3fp` from the first violated Lovasz condition (if any) under our own
+	floating-point Gram-Schmidt data, so the returned triple satisfies the same conditions as the one of `l3fp`.
+
+	Args:
+		basis_matrix (np.ndarray):
+			A 2D NumPy array of shape (n, n) representing a lattice basis, where each column is a basis vector.
+
+		gs_coeff_matrix (np.ndarray): Ignored, fpylll reduces the whole basis.
+
+		gs_squared_norms (np.ndarray): Ignored, fpylll reduces the whole basis.
+
+		start_stage (int): Ignored, fpylll reduces the whole basis.
+
+		Lovasz_cond_param (float):
+			The Lovasz condition parameter (typically in ]1/2, 1[).
+
+		f_c (bool): Ignored.
+
+	Returns:
+		(tuple): The reduced basis, its Gram-Schmidt coefficients and its Gram-Schmidt squared norms.
+	"""
+	integer_matrix = to_integer_matrix(basis_matrix)
+	fpylll.LLL.reduction(integer_matrix, delta=Lovasz_cond_param)
+	return refresh_gso(from_integer_matrix(integer_matrix), Lovasz_cond_param)
+
+
+def fpylll_bkz(
+	basis_matrix,
+	block_size,
+	enum_algo=None,
+	lll_algo="1",
+	local_blocks=True,
+	supports=None,
+	gs_coeff_matrix=None,
+	gs_squared_norms=None,
+):
+	"""BKZ-reduces a basis with fpylll's `BKZ.reduction`, with the signature of `bkz_se`.
+	Like the BKZ drivers, the result is finished with `refresh_gso` for `BKZ_FINAL_LOVASZ_PARAM`.
+
+	Args:
+		basis_matrix (np.ndarray):
+			A 2D NumPy array of shape (n, n) representing a lattice basis, where each column is a basis vector.
+
+		block_size (int):
+			The BKZ block size (clamped to the lattice dimension).
+
+		enum_algo (string): Ignored, fpylll uses its own enumeration.
+
+		lll_algo (string): Ignored, fpylll uses its own LLL.
+
+		local_blocks (bool): Ignored.
+
+		supports (np.ndarray | str): Ignored.
+
+		gs_coeff_matrix (np.ndarray): Ignored, fpylll computes its own Gram-Schmidt data.
+
+		gs_squared_norms (np.ndarray): Ignored, fpylll computes its own Gram-Schmidt data.
+
+	Returns:
+		(tuple): The reduced basis, its Gram-Schmidt coefficients and its Gram-Schmidt squared norms.
+	"""
+	integer_matrix = to_integer_matrix(basis_matrix)
+	parameters = fpylll.BKZ.Param(
+		block_size=min(block_size, integer_matrix.nrows), delta=BKZ_FINAL_LOVASZ_PARAM
+	)
+	fpylll.BKZ.reduction(integer_matrix, parameters)
+	return refresh_gso(from_integer_matrix(integer_matrix), BKZ_FINAL_LOVASZ_PARAM)
+
+
+def block_gso(gs_squared_norms, gs_coeffs):
+	"""Builds the fpylll GSO object of a projected block from its Gram matrix `mu^T diag(B) mu`, scaled to
+	integers (largest entry about `2^GRAM_SCALE_BITS`).
+
+	Args:
+		gs_squared_norms (np.ndarray): A 1D array with the Gram-Schmidt squared norms of the block.
+		gs_coeffs (np.ndarray): A 2D upper triangular array with the Gram-Schmidt coefficients of the block.
+
+	Returns:
+		(tuple): The updated Gram-based `fpylll.GSO.Mat` and the scale of its Gram matrix.
+	"""
+	require_fpylll()
+	gram = (gs_coeffs.T * gs_squared_norms) @ gs_coeffs
+	scale = 2.0**GRAM_SCALE_BITS / np.abs(gram).max()
+	gso = fpylll.GSO.Mat(fpylll.IntegerMatrix.from_matrix(integer_rows(gram * scale)), gram=True)
+	gso.update_gso()
+	return gso, scale
+
+
+def fpylll_enum_solver(basis_block, gs_squared_norms, gs_coeffs):
+	"""Solves the SVP in a block with fpylll's `Enumeration`, with the signature of the solvers in `ENUM_ALGORITHMS`.
+	The projected block is described by its Gram matrix `mu^T diag(B) mu`, which is scaled to integers
+	(largest entry about `2^GRAM_SCALE_BITS`) and handed to fpylll as a Gram-based GSO object.
+	The solution is rescored exactly in float64 from the Gram-Schmidt data of the block.
+
+	Args:
+		basis_block (np.ndarray):
+			A 2D array of shape (dimension, block_size) representing the lattice basis vectors of the block.
+		gs_squared_norms (np.ndarray):
+			A 1D array of length `block_size` containing the Gram-Schmidt squared norms of the block.
+		gs_coeffs (np.ndarray):
+			A 2D array of shape (block_size, block_size) containing the Gram-Schmidt coefficients of the block.
+
+	Returns:
+		(tuple):
+			- search_radius (float): The squared norm of the shortest (projected) vector found.
+			- u (np.ndarray): A 1D array of length `block_size` with the integer coefficients of the shortest vector.
+			  If no vector shorter than `b_0` is found, `search_radius = gs_squared_norms[0]` and `u = e_0`.
+	"""
+	require_fpylll()
+	block_size = len(basis_block[0])
+	gs_squared_norms = np.asarray(gs_squared_norms[:block_size], dtype=np.float64)
+	gs_coeffs = np.triu(np.asarray(gs_coeffs[:block_size, :block_size], dtype=np.float64))
+	gso, scale = block_gso(gs_squared_norms, gs_coeffs)
+
+	no_improvement = (gs_squared_norms[0], np.eye(block_size)[0])
+	try:
+		solutions = fpylll.Enumeration(gso).enumerate(0, block_size, gs_squared_norms[0] * scale, 0)
+	except fpylll.EnumerationError:
+		return no_improvement
+	u = np.array(solutions[0][1], dtype=np.float64)
+	# Exact rescoring: ||pi(b)||^2 = sum_t B_t (sum_{j >= t} mu_{t, j} u_j)^2 with mu_{t, t} = 1
+	squared_norm = np.square(gs_coeffs @ u) @ gs_squared_norms
+	if squared_norm >= gs_squared_norms[0]:
+		return no_improvement
+	return squared_norm, u
+
+
+# Acceleration backends. The native backend runs the pure-Python routines selected from
+# LLL_ALGORITHMS, BKZ_ALGORITHMS and ENUM_ALGORITHMS; other backends replace them. The "svp" routine
+# replaces the SVP solver of the native BKZ drivers (see `run_bkz` in main.py).
+BACKENDS = {
+	"1": {},
+	"2": {"lll": fpylll_lll, "bkz": fpylll_bkz, "svp": fpylll_enum_solver},
+}
+
+
+def backend_routine(backend, kind, default):
+	"""Selects a routine of a backend.
+
+	Args:
+		backend (str): A string key selecting the backend from `BACKENDS`.
+		kind (str): The kind of routine, `"lll"`, `"bkz"` or `"svp"`.
+		default (Callable): The native routine, returned if the backend does not replace it.
+
+	Returns:
+		(Callable): The routine to run.
+	"""
+	routine = BACKENDS[backend].get(kind, default)
+	if routine is not default:
+		require_fpylll()
+	return routine
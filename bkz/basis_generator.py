@@ -1,13 +1,13 @@
 import numpy as np
 
 
-def basis_gen(dim, entry_bound):
+def basis_gen(dim, entry_bound, rng=None):
 	"""Generates a random full-rank integer lattice basis.
 	This function creates a square integer matrix of size `dim x dim` where each entry
-	is sampled uniformly from `[0, entry_bound - 1]`. The matrix is constructed row by row,
-	ensuring that the rank increases with each addition. If adding a new row does not
-	increase the rank, that row is discarded. The final matrix is transposed so that
-	basis vectors are represented as columns.
+	is sampled uniformly from `[0, entry_bound - 1]`. The whole matrix is drawn at once
+	and its rank is checked with a single `np.linalg.matrix_rank` call (O(dim^3)). In the
+	rare case that the matrix is singular, it is discarded and drawn again. Basis vectors
+	are represented as columns.
 
 	Args:
 	    dim (int):
@@ -16,19 +16,20 @@ def basis_gen(dim, entry_bound):
 	    entry_bound (int):
 	        Upper bound for random integer entries (exclusive).
 	        Defaults to `bkz.constants.ENTRY_BOUND`.
+	    rng (np.random.Generator | int | None):
+	        Source of randomness. Either a `np.random.Generator` or a seed passed to
+	        `np.random.default_rng`. If None, fresh OS entropy is used.
 
 	Returns:
 	    (np.ndarray):
 	        A 2D NumPy array of shape `(dim, dim)` representing a full-rank lattice
 
 	"""
-
-	matrix = np.empty((0, dim), int)
-
-	while matrix.shape[0] < dim:
-		vec = np.random.randint(0, entry_bound, dim)
-		matrix = np.vstack([matrix, vec])
-		if np.linalg.matrix_rank(matrix) != matrix.shape[0]:
-			matrix = matrix[:-1]
-
-	return matrix.T
+	if entry_bound < 2:
+		raise ValueError("entry_bound must be at least 2 to generate a full-rank basis.")
+
+	rng = np.random.default_rng(rng)
+	while True:
+		matrix = rng.integers(0, entry_bound, size=(dim, dim), dtype=np.int64)
+		if np.linalg.matrix_rank(matrix) == dim:
+			return matrix
@@ -6,3 +6,7 @@ ENTRY_BOUND = 173
 BLOCK_SIZE = LATTICE_DIMENSION//2
 # Reduction parameter 1/2 < DELTA < 1
 DELTA = 3/4
+# Fraction of Lovasz-reduced column pairs after which the LLL preprocessing of BKZ stops early
+PREPROCESSING_EARLY_EXIT = 0.9
+# Lovasz condition parameter of the final LLL pass of the BKZ drivers (see `local_block.refresh_gso`)
+BKZ_FINAL_LOVASZ_PARAM = 0.99
@@ -1,13 +1,32 @@
+from functools import partial
+
 import numpy as np
-from tqdm import tqdm
 
-from bkz.bkz_params import DELTA
+from bkz import observers
+from bkz.bkz_params import BKZ_FINAL_LOVASZ_PARAM, DELTA, PREPROCESSING_EARLY_EXIT
+from bkz.bkz_stream import run_steps
+from bkz.L3FP import LLL_ALGORITHMS
+from bkz.L3FP.delta_schedule import run_delta_schedule
 from bkz.L3FP.L3fp import l3fp
 from bkz.L3FP.L3fp_deep_insertion import l3fp_deep_insert
-from bkz.SVPsolvers import ENUM_ALGORITHMS
+from bkz.L3FP.L3fp_params import LOVASZ_SCHEDULE
+from bkz.L3FP.structure import detect_supports, resolve_supports
+from bkz.local_block import insert_in_block, refresh_gso
+from bkz.SVPsolvers import ENUM_SOLVERS, SMALL_BLOCK_SOLVERS
 
 
-def bkz_se(basis_matrix, block_size, enum_algo):
+def bkz_se(
+	basis_matrix,
+	block_size,
+	enum_algo,
+	lll_algo="1",
+	local_blocks=True,
+	supports=None,
+	gs_coeff_matrix=None,
+	gs_squared_norms=None,
+	checkpoint=None,
+	resume_position=None,
+):
 	"""Executes the BKZ reduction algorithm as presented in
 	*Lattice Basis Reduction: Improved Practical Algorithms and Solving Subset Sum Problems*
 	by C. P. Schnorr, M. Euchner (1994).
@@ -17,12 +36,41 @@ def bkz_se(basis_matrix, block_size, enum_algo):
 			A 2D NumPy array of shape (n, n) representing a lattice basis, where each column is a basis vector.
 		block_size (int):
 			An integer that determines the width of the search window for svp-solver.
-		enum_algo (string):
-            A string key selecting the enumeration algorithm variant from `ENUM_ALGORITHMS`.
+		enum_algo (string | Callable):
+            A string key selecting the enumeration algorithm variant from `ENUM_ALGORITHMS`,
+            which is run by its reusable solver object in `ENUM_SOLVERS`, or an SVP solver with the same
+            signature (e.g. `backends.fpylll_enum_solver`).
+            With a string key, blocks of dimension 2 to 4 are solved by the dedicated kernels in
+            `SMALL_BLOCK_SOLVERS`; a callable solves every block.
+		lll_algo (string):
+			A string key selecting the LLL algorithm variant from `LLL_ALGORITHMS` used for preprocessing.
+		local_blocks (bool):
+			If True, a candidate vector is inserted with `insert_in_block`, which works on the projected
+			Gram-Schmidt data of the block and applies the resulting integer transform to the basis with a
+			single matrix product. If False, the candidate is injected into the full basis prefix and removed
+			again with `l3fp_deep_insert`.
+		supports (np.ndarray | str):
+			Enables structure-aware reduction (see `l3fp`): a declared 2D integer array of shape (2, n) with the
+			row supports of the columns, or `"detect"`. Requires the l3fp preprocessing (`lll_algo="1"`).
+		gs_coeff_matrix (np.ndarray):
+			Warm start: the Gram-Schmidt coefficients of an already LLL-reduced `basis_matrix`, e.g. the output of
+			`l3fp`. If given together with `gs_squared_norms`, the LLL preprocessing is skipped. The inputs are not modified.
+		gs_squared_norms (np.ndarray):
+			Warm start: the Gram-Schmidt squared norms of an already LLL-reduced `basis_matrix`.
+		checkpoint (BKZCheckpoint):
+			Receives the parameters and, before every block, the loop state, and writes periodic snapshots
+			(see `checkpoint.BKZCheckpoint`). If None, no snapshots are written.
+		resume_position (tuple):
+			The block position `j`, the counter `z` and the numbers of processed `blocks` and completed `tours`
+			of a snapshot, to continue an interrupted run with its saved basis and Gram-Schmidt data as warm start
+			(see `checkpoint.resume_bkz`).
 
 	Notes:
 	    - Our implementation uses 0-based indices (`0,...,n-1`) for basis and block boundaries,
 	    whereas the original Schnorr–Euchner paper uses 1-based indices (`1,...,n`).
+	    - The loop only keeps the Gram-Schmidt data of the columns up to the current block up to date, so the
+	    result is finished with `refresh_gso` (recomputed Gram-Schmidt data, size reduction and LLL for
+	    `BKZ_FINAL_LOVASZ_PARAM`). The returned triple is therefore consistent, also for later columns.
 
 	Returns:
 		(tuple):
@@ -36,61 +84,186 @@ def bkz_se(basis_matrix, block_size, enum_algo):
 			-gs_squared_norms (np.ndarray):
 				A 1D Numpy array of shape (n,) representing the updated squared lengths of The Gram-Schmidt vectors.
 	"""
-	svp_solver = ENUM_ALGORITHMS[enum_algo]
+	return run_steps(
+		bkz_se_steps(
+			basis_matrix,
+			block_size,
+			enum_algo,
+			lll_algo,
+			local_blocks,
+			supports,
+			gs_coeff_matrix,
+			gs_squared_norms,
+			checkpoint,
+			resume_position,
+		)
+	)
+
+
+def bkz_se_steps(
+	basis_matrix,
+	block_size,
+	enum_algo,
+	lll_algo="1",
+	local_blocks=True,
+	supports=None,
+	gs_coeff_matrix=None,
+	gs_squared_norms=None,
+	checkpoint=None,
+	resume_position=None,
+):
+	"""Generator core of `bkz_se`, which runs it to completion. Takes the arguments of `bkz_se`.
+
+	Yields:
+		(dict): The loop state before every block: `basis_matrix`, `gs_coeff_matrix`, `gs_squared_norms`,
+		`supports`, the block position `j`, the counter `z` of blocks without change, and the numbers of
+		processed `blocks` and completed `tours`. The arrays are the working arrays of the reduction, so they
+		are only valid until the generator resumes and must not be modified.
+
+	Returns:
+		(tuple): The result of `bkz_se` (the value of the final `StopIteration`).
+	"""
+	svp_solver = ENUM_SOLVERS[enum_algo] if isinstance(enum_algo, str) else enum_algo
+	# Only the built-in solvers defer tiny blocks to the dedicated kernels
+	small_block_solvers = SMALL_BLOCK_SOLVERS if isinstance(enum_algo, str) else {}
+	lll_reduce = LLL_ALGORITHMS[lll_algo]
+	supports = resolve_supports(basis_matrix, supports)
+	if supports is not None:
+		if lll_reduce is not l3fp:
+			raise ValueError("Structure-aware reduction requires the l3fp preprocessing (lll_algo '1').")
+		lll_reduce = partial(l3fp, supports=supports)
 	m = len(basis_matrix[0]) - 1
-	basis_matrix, gs_coeff_matrix, gs_squared_norms = l3fp(basis_matrix)
+	if gs_coeff_matrix is None or gs_squared_norms is None:
+		basis_matrix, gs_coeff_matrix, gs_squared_norms = run_delta_schedule(
+			lll_reduce, basis_matrix, LOVASZ_SCHEDULE, early_exit=PREPROCESSING_EARLY_EXIT
+		)
+	else:
+		# Warm start from a reduced basis, copied so that the caller can reuse it (e.g. for other block sizes)
+		basis_matrix, gs_coeff_matrix, gs_squared_norms = (
+			np.array(data, dtype=np.float64) for data in (basis_matrix, gs_coeff_matrix, gs_squared_norms)
+		)
 	z = 0
 	j = -1  # Ensure that we start the first loop from j=0
-	pbar = tqdm(
-		total=m,
-		desc="BKZ (Schnorr-Euchner) reduction loop",
-		leave=False,
-		ascii="-##",
-		colour="yellow",
-		position=1,
-	)
-	while z < m:
-		j += 1
-		k = min(j + block_size - 1, m)
-		if j == m:
-			j = 0
-			k = block_size
-		candidate_proj_len, candidate_coeff_vec = svp_solver(
-			basis_matrix[:, j:k + 1], gs_squared_norms[j:k + 1], gs_coeff_matrix[:, j:k + 1]
+	blocks = tours = 0
+	if resume_position is not None:
+		j, z, blocks, tours = resume_position
+	if checkpoint is not None:
+		checkpoint.start(
+			{
+				"algorithm": "bkz_se",
+				"block_size": block_size,
+				"enum_algo": enum_algo if isinstance(enum_algo, str) else None,
+				"lll_algo": lll_algo,
+				"local_blocks": local_blocks,
+			}
 		)
-		block_end = min(k + 1, m)
-		if DELTA * gs_squared_norms[j] > candidate_proj_len:
-			b_new = np.dot(basis_matrix[:, j:k + 1], candidate_coeff_vec)
-			injected_basis = np.insert(basis_matrix[:, :block_end + 1], j, np.transpose(b_new), axis=1)
-
-			(
-				basis_matrix[:, :block_end + 1],
-				gs_coeff_matrix[:block_end + 1, :block_end + 1],
-				gs_squared_norms[:block_end + 1],
-			) = l3fp_deep_insert(
-				injected_basis_matrix=injected_basis,
-				gs_coeff_matrix=gs_coeff_matrix[:j, :j],
-				gs_squared_norms=gs_squared_norms[:j],
-				start_stage=j,
-                Lovasz_cond_param=DELTA,
-				f_c=True,
+	observer = observers.OBSERVER
+	if observer is not None:
+		observer.begin("bkz", m)
+		observer.begin("tour", index=tours)
+	# The open phases are ended even if the consumer stops the generator early (see `iter_bkz`)
+	try:
+		while z < m:
+			state = {
+				"basis_matrix": basis_matrix,
+				"gs_coeff_matrix": gs_coeff_matrix,
+				"gs_squared_norms": gs_squared_norms,
+				"supports": supports,
+				"j": j,
+				"z": z,
+				"blocks": blocks,
+				"tours": tours,
+			}
+			if checkpoint is not None:
+				checkpoint.update(state)
+			yield state
+			blocks += 1
+			j += 1
+			k = min(j + block_size - 1, m)
+			if j == m:
+				tours += 1
+				if observer is not None:
+					observer.count("tours")
+					observer.end("tour")
+					observer.begin("tour", index=tours)
+				j = 0
+				k = block_size
+			# Tiny blocks (e.g. at the end of a tour) are solved by dedicated kernels, unless the caller passed a solver
+			block_solver = small_block_solvers.get(k - j + 1, svp_solver)
+			if observer is not None:
+				observer.begin("svp", start=j, end=k)
+			# The solvers index the coefficients with block-local rows, so they get the diagonal block
+			candidate_proj_len, candidate_coeff_vec = block_solver(
+				basis_matrix[:, j:k + 1], gs_squared_norms[j:k + 1], gs_coeff_matrix[j:k + 1, j:k + 1]
 			)
-			z = 0
+			if observer is not None:
+				observer.end("svp")
+			block_end = min(k + 1, m)
+			prefix_supports = None if supports is None else supports[:, :block_end + 1]
+			if DELTA * gs_squared_norms[j] > candidate_proj_len:
+				if observer is not None:
+					observer.begin("insertion", start=j, end=k)
+					observer.count("insertions")
+				if local_blocks:
+					# Insert and reduce within the block, then continue LLL from where the block left it
+					basis_matrix, gs_coeff_matrix, gs_squared_norms, restart_stage = insert_in_block(
+						basis_matrix, gs_coeff_matrix, gs_squared_norms, j, k + 1, candidate_coeff_vec, DELTA
+					)
+					if supports is not None:
+						supports[:, j:k + 1] = detect_supports(basis_matrix[:, j:k + 1])
+					(
+						basis_matrix[:, :block_end + 1],
+						gs_coeff_matrix[:block_end + 1, :block_end + 1],
+						gs_squared_norms[:block_end + 1],
+					) = l3fp(
+						basis_matrix=basis_matrix[:, :block_end + 1],
+						gs_coeff_matrix=gs_coeff_matrix[:restart_stage, :restart_stage],
+						gs_squared_norms=gs_squared_norms[:restart_stage],
+						start_stage=restart_stage,
+						Lovasz_cond_param=DELTA,
+						supports=prefix_supports,
+					)
+				else:
+					b_new = np.dot(basis_matrix[:, j:k + 1], candidate_coeff_vec)
+					injected_basis = np.insert(basis_matrix[:, :block_end + 1], j, np.transpose(b_new), axis=1)
 
-		else:
-			z += 1
-			(
-				basis_matrix[:, :block_end + 1],
-				gs_coeff_matrix[:block_end + 1, :block_end + 1],
-				gs_squared_norms[:block_end + 1],
-			) = l3fp(
-				basis_matrix=basis_matrix[:, :block_end + 1],
-				gs_coeff_matrix=gs_coeff_matrix[: block_end, : block_end],
-				gs_squared_norms=gs_squared_norms[: block_end],
-				start_stage=block_end - 1,
-				Lovasz_cond_param=0.99,
-			)
-			pbar.update(1)
+					(
+						basis_matrix[:, :block_end + 1],
+						gs_coeff_matrix[:block_end + 1, :block_end + 1],
+						gs_squared_norms[:block_end + 1],
+					) = l3fp_deep_insert(
+						injected_basis_matrix=injected_basis,
+						gs_coeff_matrix=gs_coeff_matrix[:j, :j],
+						gs_squared_norms=gs_squared_norms[:j],
+						start_stage=j,
+						Lovasz_cond_param=DELTA,
+						f_c=True,
+					)
+					if supports is not None:
+						supports[:, :block_end + 1] = detect_supports(basis_matrix[:, :block_end + 1])
+				if observer is not None:
+					observer.end("insertion")
+				z = 0
 
-	pbar.close()
-	return basis_matrix, gs_coeff_matrix, gs_squared_norms
+			else:
+				z += 1
+				(
+					basis_matrix[:, :block_end + 1],
+					gs_coeff_matrix[:block_end + 1, :block_end + 1],
+					gs_squared_norms[:block_end + 1],
+				) = l3fp(
+					basis_matrix=basis_matrix[:, :block_end + 1],
+					gs_coeff_matrix=gs_coeff_matrix[: block_end, : block_end],
+					gs_squared_norms=gs_squared_norms[: block_end],
+					start_stage=block_end - 1,
+					Lovasz_cond_param=0.99,
+					supports=prefix_supports,
+				)
+				if observer is not None:
+					observer.update("bkz")
+		# The loop keeps the Gram-Schmidt data current only up to the processed block
+		return refresh_gso(basis_matrix, BKZ_FINAL_LOVASZ_PARAM, supports)
+	finally:
+		if observer is not None:
+			observer.end("tour")
+			observer.end("bkz")
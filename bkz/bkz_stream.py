@@ -0,0 +1,126 @@
+import numpy as np
+
+from bkz.BasisQualityEvaluation.basis_quality_characteristics import compute_root_hermite_factor
+
+
+def read_only(array):
+	"""Returns a read-only view of `array` (no copy)."""
+	view = array.view()
+	view.flags.writeable = False
+	return view
+
+
+def run_steps(steps):
+	"""Runs the generator core of a BKZ driver (e.g. `bkz_se_steps`) to completion.
+
+	Args:
+		steps (Generator): The generator, which yields the loop states and returns the result.
+
+	Returns:
+		(tuple): The return value of the generator, i.e. the result of the driver.
+	"""
+	while True:
+		try:
+			next(steps)
+		except StopIteration as stop:
+			return stop.value
+
+
+class BKZSnapshot:
+	"""Lightweight snapshot of a running BKZ reduction, yielded by `iter_bkz`.
+
+	The arrays are read-only views of the working arrays of the reduction, so taking a snapshot copies
+	nothing. They are only valid until the consumer asks for the next snapshot; `copy` returns an
+	independent snapshot that can be kept.
+
+	Attributes:
+		basis_matrix (np.ndarray): The current basis (read-only view).
+		gs_coeff_matrix (np.ndarray): Its Gram-Schmidt coefficients (read-only view).
+		gs_squared_norms (np.ndarray): Its Gram-Schmidt squared norms, the GS profile (read-only view).
+		j (int): The position of the next block.
+		z (int): The number of consecutive blocks without change.
+		blocks (int): The number of processed blocks.
+		tours (int): The number of completed tours.
+		done (bool): True for the final snapshot of the reduced basis.
+	"""
+
+	def __init__(self, basis_matrix, gs_coeff_matrix, gs_squared_norms, j, z, blocks, tours, done=False):
+		self.basis_matrix = read_only(basis_matrix)
+		self.gs_coeff_matrix = read_only(gs_coeff_matrix)
+		self.gs_squared_norms = read_only(gs_squared_norms)
+		self.j = j
+		self.z = z
+		self.blocks = blocks
+		self.tours = tours
+		self.done = done
+
+	@property
+	def root_hermite_factor(self):
+		"""The root Hermite factor of the current basis, computed from the GS profile: `||b_0||^2 = B_0` and
+		`log Vol(L) = sum_i log(B_i) / 2`."""
+		log_volume = np.sum(np.log(self.gs_squared_norms)) / 2
+		return compute_root_hermite_factor(np.sqrt(self.gs_squared_norms[0]), log_volume, len(self.gs_squared_norms))
+
+	def copy(self):
+		"""Returns a snapshot with copies of the arrays, which stays valid while the reduction continues."""
+		return BKZSnapshot(
+			self.basis_matrix.copy(),
+			self.gs_coeff_matrix.copy(),
+			self.gs_squared_norms.copy(),
+			self.j,
+			self.z,
+			self.blocks,
+			self.tours,
+			self.done,
+		)
+
+
+def iter_bkz(basis_matrix, block_size, enum_algo, bkz_version="1", per="tour", **driver_kwargs):
+	"""Runs a BKZ driver step by step and yields a `BKZSnapshot` after every tour or block.
+	The consumer can stop the reduction at any time, e.g. once the root Hermite factor is good enough,
+	by no longer iterating. The last snapshot (`done=True`) holds the result of the driver.
+
+	Example:
+		`for snapshot in iter_bkz(basis, 20, "4"): if snapshot.root_hermite_factor < 1.012: break`
+
+	Args:
+		basis_matrix (np.ndarray):
+			A 2D NumPy array of shape (n, n) representing a lattice basis, where each column is a basis vector.
+		block_size (int): The BKZ block size.
+		enum_algo (string | Callable): The SVP solver (see `bkz_se`).
+		bkz_version (str): A string key selecting the BKZ driver from `BKZ_STEPS`.
+		per (str): `"tour"` for a snapshot at the start of every tour, `"block"` for one before every block.
+		**driver_kwargs: Further arguments of the driver (`lll_algo`, `local_blocks`, `supports`, warm start, `checkpoint`, ...).
+
+	Yields:
+		(BKZSnapshot): The snapshots of the reduction.
+	"""
+	from bkz import BKZ_STEPS
+
+	if per not in ("tour", "block"):
+		raise ValueError(f"Unknown snapshot frequency '{per}', expected 'tour' or 'block'.")
+	steps = BKZ_STEPS[bkz_version](basis_matrix, block_size, enum_algo, **driver_kwargs)
+	state = {"j": 0, "z": 0, "blocks": -1, "tours": -1}
+	try:
+		while True:
+			try:
+				next_state = next(steps)
+			except StopIteration as stop:
+				result = stop.value
+				break
+			if per == "block" or next_state["tours"] > state["tours"]:
+				yield BKZSnapshot(
+					next_state["basis_matrix"],
+					next_state["gs_coeff_matrix"],
+					next_state["gs_squared_norms"],
+					next_state["j"],
+					next_state["z"],
+					next_state["blocks"],
+					next_state["tours"],
+				)
+			state = next_state
+	finally:
+		# Ends the open observer phases of the driver if the consumer stops early
+		steps.close()
+
+	yield BKZSnapshot(*result, state["j"], state["z"], state["blocks"] + 1, max(state["tours"], 0), done=True)
@@ -0,0 +1,134 @@
+import json
+import time
+
+import numpy as np
+
+from bkz.L3FP import L3fp_params
+from bkz.result_cache import atomic_savez
+
+
+class BKZCheckpoint:
+	"""Periodic on-disk snapshots of a running BKZ reduction (see `bkz_se` and `bkz_se_pc`).
+
+	The drivers call `start` once with their parameters and `update` with their loop state (basis,
+	Gram-Schmidt data, supports, block position `j`, counter `z` and the numbers of processed blocks and
+	completed tours) before every block. A snapshot is written every `every_blocks` blocks and/or every
+	`every_seconds` seconds, atomically (see `atomic_savez`), so an interrupted run leaves the last complete
+	snapshot behind. The snapshot also holds the precision parameter `L3fp_params.TAU` of the run (see
+	`update_tau`). `resume_bkz` continues the reduction from it with the same result as the uninterrupted run.
+
+	Any object with `start(parameters)` and `update(state)` methods can be passed to the drivers instead.
+
+	Args:
+		path (str): Path of the snapshot (`.npz`) file.
+		every_blocks (int): Number of blocks between two snapshots. If None, snapshots are only time-based.
+		every_seconds (float): Number of seconds between two snapshots. If None, snapshots are only block-based.
+	"""
+
+	def __init__(self, path, every_blocks=None, every_seconds=None):
+		if every_blocks is None and every_seconds is None:
+			raise ValueError("A checkpoint needs every_blocks, every_seconds or both.")
+		self.path = path
+		self.every_blocks = every_blocks
+		self.every_seconds = every_seconds
+		self.parameters = {}
+		self.blocks = 0
+		self.last_save = time.monotonic()
+
+	def start(self, parameters):
+		"""Records the parameters of the reduction, which are stored with every snapshot.
+
+		Args:
+			parameters (dict): JSON-serializable parameters of the driver (`algorithm`, `block_size`, `enum_algo`, ...).
+		"""
+		self.parameters = parameters
+		self.blocks = 0
+		self.last_save = time.monotonic()
+
+	def update(self, state):
+		"""Writes a snapshot if one is due.
+
+		Args:
+			state (dict): The loop state of the driver before the next block: `basis_matrix`, `gs_coeff_matrix`,
+				`gs_squared_norms`, `supports` (or None), `j`, `z`, `blocks` and `tours`.
+		"""
+		# The block count of the driver, which continues from the snapshot in a resumed run
+		self.blocks = state["blocks"]
+		due = self.blocks > 0 and (
+			(self.every_blocks is not None and self.blocks % self.every_blocks == 0)
+			or (self.every_seconds is not None and time.monotonic() - self.last_save >= self.every_seconds)
+		)
+		if due:
+			self.save(state)
+
+	def save(self, state):
+		"""Writes a snapshot of `state` (see `update`) and the parameters atomically."""
+		arrays = {
+			name: state[name] for name in ("basis_matrix", "gs_coeff_matrix", "gs_squared_norms", "supports") if state[name] is not None
+		}
+		position = {name: int(state[name]) for name in ("j", "z", "blocks", "tours")}
+		metadata = {"parameters": self.parameters, "position": position, "tau": L3fp_params.TAU}
+		atomic_savez(self.path, metadata=np.array(json.dumps(metadata)), **arrays)
+		self.last_save = time.monotonic()
+
+
+def load_checkpoint(path):
+	"""Loads a snapshot written by `BKZCheckpoint`.
+
+	Args:
+		path (str): Path of the snapshot file.
+
+	Returns:
+		(dict): The arrays of the snapshot (`supports` is None for dense reduction), the driver `parameters`,
+		the loop `position` (`j`, `z` and the numbers of processed `blocks` and completed `tours`) and the
+		precision parameter `tau` of the run.
+	"""
+	with np.load(path) as stored:
+		snapshot = {name: stored[name] for name in stored.files if name != "metadata"}
+		snapshot.update(json.loads(str(stored["metadata"])))
+	snapshot.setdefault("supports", None)
+	return snapshot
+
+
+def resume_bkz(path, enum_algo=None, checkpoint=None):
+	"""Continues a BKZ reduction from a snapshot written by `BKZCheckpoint`.
+	The driver restarts at the saved block position with the saved basis, Gram-Schmidt data and block and tour
+	counts, under the precision parameter `L3fp_params.TAU` of the interrupted run (restored afterwards), so the
+	result is the same as the one of the uninterrupted run, also in a fresh process.
+
+	Args:
+		path (str): Path of the snapshot file.
+		enum_algo (string | Callable):
+			The SVP solver. Required if the interrupted run used a solver callable (only string keys are stored).
+		checkpoint (BKZCheckpoint):
+			Checkpoint of the resumed run, e.g. `BKZCheckpoint(path, every_blocks=...)` to keep checkpointing. If None, none.
+
+	Returns:
+		(tuple): The BKZ-reduced basis, its Gram-Schmidt coefficients and its Gram-Schmidt squared norms.
+	"""
+	from bkz import BKZ_ALGORITHMS
+
+	snapshot = load_checkpoint(path)
+	parameters = snapshot["parameters"]
+	enum_algo = parameters["enum_algo"] if enum_algo is None else enum_algo
+	if enum_algo is None:
+		raise ValueError("The interrupted run used an SVP solver callable; pass it as enum_algo.")
+	drivers = {driver.__name__: driver for driver in BKZ_ALGORITHMS.values()}
+	position = snapshot["position"]
+	previous_tau = L3fp_params.TAU
+	L3fp_params.TAU = snapshot["tau"]
+	try:
+		return drivers[parameters["algorithm"]](
+			snapshot["basis_matrix"],
+			parameters["block_size"],
+			enum_algo,
+			parameters["lll_algo"],
+			local_blocks=parameters["local_blocks"],
+			supports=snapshot["supports"],
+			gs_coeff_matrix=snapshot["gs_coeff_matrix"],
+			gs_squared_norms=snapshot["gs_squared_norms"],
+			checkpoint=checkpoint,
+			resume_position=(position["j"], position["z"], position["blocks"], position["tours"]),
+		)
+	finally:
+		L3fp_params.TAU = previous_tau
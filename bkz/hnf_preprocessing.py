@@ -0,0 +1,188 @@
+import numpy as np
+
+from bkz.local_block import extended_gcd
+
+# Largest entry size for which a float64 cast of an integer basis is exact
+FLOAT_EXACT_BOUND = 2**53
+
+
+def bareiss_eliminate(rows, pivot_columns):
+	"""Fraction-free Gaussian elimination (Bareiss algorithm) on a matrix of Python integers.
+	All intermediate values are integers (determinants of minors), so no precision is lost and the
+	entry sizes stay polynomial. Rows are swapped if a zero pivot is met.
+
+	Args:
+		rows (list[list[int]]): The matrix as a list of rows. Updated in place.
+		pivot_columns (int): Number of leading columns to eliminate (at most the number of rows).
+
+	Returns:
+		(int): The sign (+1 or -1) of the row permutation, or 0 if a pivot column has no nonzero entry.
+	"""
+	sign = 1
+	previous_pivot = 1
+	for k in range(pivot_columns):
+		if rows[k][k] == 0:
+			swap = next((i for i in range(k + 1, len(rows)) if rows[i][k] != 0), None)
+			if swap is None:
+				return 0
+			rows[k], rows[swap] = rows[swap], rows[k]
+			sign = -sign
+		pivot_row = rows[k]
+		pivot = pivot_row[k]
+		for i in range(k + 1, len(rows)):
+			row = rows[i]
+			factor = row[k]
+			for j in range(k + 1, len(row)):
+				row[j] = (row[j] * pivot - factor * pivot_row[j]) // previous_pivot
+			row[k] = 0
+		previous_pivot = pivot
+
+	return sign
+
+
+def bareiss_determinant(basis_matrix):
+	"""Computes the exact determinant of a square integer matrix with `bareiss_eliminate`.
+
+	Args:
+		basis_matrix (np.ndarray): A 2D integer NumPy array of shape (n, n).
+
+	Returns:
+		(int): The determinant as a Python integer.
+	"""
+	rows = [[int(x) for x in row] for row in basis_matrix]
+	sign = bareiss_eliminate(rows, len(rows))
+	if sign == 0 or not rows:
+		return 0 if rows else 1
+	return sign * rows[-1][-1]
+
+
+def solve_exact(basis_matrix, target_matrix):
+	"""Solves `basis_matrix @ X = target_matrix` exactly for an integer solution `X`.
+	The augmented system is triangularized with `bareiss_eliminate` and solved by back substitution.
+	Every division is checked to be exact, so a non-integral solution raises an error.
+
+	Args:
+		basis_matrix (np.ndarray): A 2D integer NumPy array of shape (n, n) with nonzero determinant.
+		target_matrix (np.ndarray): A 2D integer NumPy array of shape (n, m).
+
+	Returns:
+		(np.ndarray): A 2D NumPy array of shape (n, m) and dtype object holding Python integers.
+	"""
+	n = basis_matrix.shape[0]
+	rows = [
+		[int(x) for x in basis_row] + [int(x) for x in target_row]
+		for basis_row, target_row in zip(basis_matrix, target_matrix)
+	]
+	if bareiss_eliminate(rows, n) == 0:
+		raise ValueError("The basis matrix is singular.")
+
+	width = len(rows[0]) - n
+	solution = [[0] * width for _ in range(n)]
+	for c in range(width):
+		for i in range(n - 1, -1, -1):
+			residual = rows[i][n + c] - sum(rows[i][j] * solution[j][c] for j in range(i + 1, n))
+			value, remainder = divmod(residual, rows[i][i])
+			if remainder != 0:
+				raise ValueError("The system has no integral solution.")
+			solution[i][c] = value
+
+	return np.array(solution, dtype=object)
+
+
+def hnf_mod_determinant(basis_matrix, determinant):
+	"""Computes the Hermite normal form of a full-rank lattice basis modulo a multiple of its determinant, following
+	*A Course in Computational Algebraic Number Theory* by H. Cohen (1993), Algorithm 2.4.8. Because
+	`determinant * Z^n` is a sublattice, all column operations can be carried out modulo (a divisor of) the determinant,
+	so the entries never grow beyond it. All arithmetic uses Python integers.
+
+	Args:
+		basis_matrix (np.ndarray):
+			A 2D integer NumPy array of shape (n, n) representing a lattice basis, where each column is a basis vector.
+
+		determinant (int):
+			A nonzero multiple of the determinant of the lattice.
+
+	Returns:
+		(np.ndarray):
+			A 2D NumPy array of shape (n, n) and dtype object holding the upper triangular Hermite normal form `H`
+			(columns are basis vectors, `H[i, i] > 0` and `0 <= H[i, j] < H[i, i]` for `j > i`).
+	"""
+	n = basis_matrix.shape[0]
+	columns = [[int(x) for x in basis_matrix[:, c]] for c in range(basis_matrix.shape[1])]
+	hnf_columns = [None] * n
+	modulus = abs(int(determinant))
+	i = n - 1
+	k = j = len(columns) - 1
+	while True:
+		# Eliminate row i of the columns left of column k
+		while j > 0:
+			j -= 1
+			a_ij = columns[j][i]
+			if a_ij == 0:
+				continue
+			a_ik = columns[k][i]
+			d, u, v = extended_gcd(a_ik, a_ij)
+			combined = [(u * x + v * y) % modulus for x, y in zip(columns[k], columns[j])]
+			columns[j] = [((a_ik // d) * y - (a_ij // d) * x) % modulus for x, y in zip(columns[k], columns[j])]
+			columns[k] = combined
+
+		# Final reductions of row i
+		d, u, _ = extended_gcd(columns[k][i], modulus)
+		hnf_column = [(u * x) % modulus for x in columns[k]]
+		if hnf_column[i] == 0:
+			hnf_column[i] = modulus
+		for later in range(i + 1, n):
+			q = hnf_columns[later][i] // hnf_column[i]
+			hnf_columns[later] = [x - q * y for x, y in zip(hnf_columns[later], hnf_column)]
+		hnf_columns[i] = hnf_column
+
+		if i == 0:
+			break
+		modulus //= d
+		i -= 1
+		k -= 1
+		j = k
+		if columns[k][i] == 0:
+			columns[k][i] = modulus
+
+	return np.array(hnf_columns, dtype=object).T
+
+
+def hnf_preprocess(basis_matrix, max_entry=FLOAT_EXACT_BOUND):
+	"""Optional preprocessing front-end for integer bases before LLL.
+	The Hermite normal form modulo the determinant (`hnf_mod_determinant`) is a basis of the same lattice whose entries are
+	bounded by the determinant. For lattices with a small determinant compared to their entries (e.g. q-ary and knapsack
+	lattices, or bases with large redundant entries) this shrinks the numbers `l3fp` works on. The HNF is only adopted if its
+	largest entry is smaller than the largest entry of the input and below `max_entry`, so that the float64 cast in `l3fp`
+	stays exact. The unimodular transform is computed exactly, so reduced bases can be related back to the input basis.
+
+	Args:
+		basis_matrix (np.ndarray):
+			A 2D integer NumPy array of shape (n, n) representing a full-rank lattice basis, where each column is a basis vector.
+
+		max_entry (int):
+			Upper bound (exclusive) for the entries of an adopted HNF.
+
+	Returns:
+		(tuple):
+			- basis_matrix (np.ndarray):
+				The HNF as a 2D int64 NumPy array if it was adopted, otherwise the input basis.
+
+			- transform (np.ndarray):
+				A unimodular 2D NumPy array of dtype object with `input_basis @ transform == basis_matrix`
+				(the identity if the HNF was not adopted).
+	"""
+	n = basis_matrix.shape[1]
+	identity = np.eye(n, dtype=np.int64).astype(object)
+	determinant = bareiss_determinant(basis_matrix)
+	if determinant == 0:
+		raise ValueError("HNF preprocessing requires a full-rank basis.")
+
+	hnf = hnf_mod_determinant(basis_matrix, determinant)
+	largest_hnf_entry = max(abs(x) for x in hnf.flat)
+	largest_input_entry = max(abs(int(x)) for x in basis_matrix.flat)
+	if largest_hnf_entry >= min(largest_input_entry, max_entry):
+		return basis_matrix, identity
+
+	transform = solve_exact(basis_matrix, hnf)
+	return hnf.astype(np.int64), transform
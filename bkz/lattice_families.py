@@ -0,0 +1,182 @@
+import numpy as np
+
+from bkz.basis_generator import basis_gen
+
+# Bases for the deterministic Miller-Rabin test, sufficient for all n < 3.3 * 10^24
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+
+def is_prime(n):
+	"""Deterministic Miller-Rabin primality test for the integer sizes used as lattice moduli.
+
+	Args:
+		n (int): Integer to test.
+
+	Returns:
+		(bool): True if `n` is prime, otherwise False.
+	"""
+	if n < 2:
+		return False
+	for p in MILLER_RABIN_BASES:
+		if n % p == 0:
+			return n == p
+	d, s = n - 1, 0
+	while d % 2 == 0:
+		d //= 2
+		s += 1
+	for a in MILLER_RABIN_BASES:
+		x = pow(a, d, n)
+		if x in (1, n - 1):
+			continue
+		for _ in range(s - 1):
+			x = pow(x, 2, n)
+			if x == n - 1:
+				break
+		else:
+			return False
+	return True
+
+
+def random_prime(entry_bound, rng):
+	"""Draws a random prime from `[entry_bound // 2, entry_bound - 1]`.
+
+	Args:
+		entry_bound (int): Upper bound (exclusive) for the prime. Must be at least 3.
+		rng (np.random.Generator): Source of randomness.
+
+	Returns:
+		(int): A prime number.
+	"""
+	if entry_bound < 3:
+		raise ValueError("entry_bound must be at least 3 to draw a prime.")
+	low = max(entry_bound // 2, 2)
+	while True:
+		candidate = int(rng.integers(low, entry_bound))
+		if is_prime(candidate):
+			return candidate
+
+
+def qary_basis(dim, entry_bound, rng=None):
+	"""Generates a basis of the q-ary lattice `{x : x_top = A x_bottom mod q}` with `q = entry_bound`.
+	The basis has the block form `[[q I_k, A], [0, I_{dim-k}]]` with `k = dim // 2` and `A` uniform modulo `q`,
+	so the q-vectors come first, as in the lattices of SIS/LWE-type problems. Its determinant is `q^k`.
+
+	Args:
+		dim (int): Dimension of the lattice basis (number of basis vectors).
+		entry_bound (int): The modulus `q` (at least 2).
+		rng (np.random.Generator | int | None): Source of randomness, or a seed for `np.random.default_rng`.
+
+	Returns:
+		(np.ndarray): A 2D NumPy array of shape `(dim, dim)` whose columns are the basis vectors.
+	"""
+	if entry_bound < 2:
+		raise ValueError("entry_bound must be at least 2 to serve as a modulus.")
+	rng = np.random.default_rng(rng)
+	k = dim // 2
+	basis = np.eye(dim, dtype=np.int64)
+	basis[:k, :k] *= entry_bound
+	basis[:k, k:] = rng.integers(0, entry_bound, size=(k, dim - k), dtype=np.int64)
+	return basis
+
+
+def knapsack_basis(dim, entry_bound, rng=None):
+	"""Generates a knapsack (subset sum) lattice basis as in *Solving low-density subset sum problems*
+	by J. C. Lagarias and A. M. Odlyzko (1985). With `dim - 1` random weights `a_i` from `[1, entry_bound - 1]`
+	and the target `s` of a random non-empty subset, the basis vectors are `(e_i, a_i)` and `(0, -s)`.
+	The subset corresponds to a short vector of the lattice.
+
+	Args:
+		dim (int): Dimension of the lattice basis (number of basis vectors, at least 2).
+		entry_bound (int): Upper bound (exclusive) for the knapsack weights (at least 2).
+		rng (np.random.Generator | int | None): Source of randomness, or a seed for `np.random.default_rng`.
+
+	Returns:
+		(np.ndarray): A 2D NumPy array of shape `(dim, dim)` whose columns are the basis vectors.
+	"""
+	if dim < 2 or entry_bound < 2:
+		raise ValueError("knapsack lattices need dim >= 2 and entry_bound >= 2.")
+	rng = np.random.default_rng(rng)
+	weights = rng.integers(1, entry_bound, size=dim - 1, dtype=np.int64)
+	subset = rng.integers(0, 2, size=dim - 1).astype(bool)
+	subset[rng.integers(0, dim - 1)] = True
+	basis = np.eye(dim, dtype=np.int64)
+	basis[-1, :-1] = weights
+	basis[-1, -1] = -weights[subset].sum()
+	return basis
+
+
+def ntru_basis(dim, entry_bound, rng=None):
+	"""Generates an NTRU-like lattice basis `[[I_N, 0], [H, q I_N]]` with `N = dim // 2` and `q = entry_bound`,
+	where `H` is a random circulant matrix modulo `q` (the matrix of multiplication by a public key polynomial
+	in `Z_q[x] / (x^N - 1)`).
+
+	Args:
+		dim (int): Dimension of the lattice basis (number of basis vectors). Must be even.
+		entry_bound (int): The modulus `q` (at least 2).
+		rng (np.random.Generator | int | None): Source of randomness, or a seed for `np.random.default_rng`.
+
+	Returns:
+		(np.ndarray): A 2D NumPy array of shape `(dim, dim)` whose columns are the basis vectors.
+	"""
+	if dim % 2 != 0 or entry_bound < 2:
+		raise ValueError("NTRU-like lattices need an even dim and entry_bound >= 2.")
+	rng = np.random.default_rng(rng)
+	n = dim // 2
+	public_key = rng.integers(0, entry_bound, size=n, dtype=np.int64)
+	shifts = (np.arange(n)[:, None] - np.arange(n)[None, :]) % n
+	basis = np.eye(dim, dtype=np.int64)
+	basis[n:, :n] = public_key[shifts]
+	basis[n:, n:] *= entry_bound
+	return basis
+
+
+def goldstein_mayer_basis(dim, entry_bound, rng=None):
+	"""Generates a Goldstein-Mayer lattice basis as in *On the equidistribution of Hecke points*
+	by D. Goldstein and A. Mayer (2003), the random lattices of the SVP challenge. For a random prime
+	`p < entry_bound` and random `x_i` from `[0, p - 1]`, the basis vectors are `p e_0` and `x_i e_0 + e_i`.
+
+	Args:
+		dim (int): Dimension of the lattice basis (number of basis vectors).
+		entry_bound (int): Upper bound (exclusive) for the prime `p` (at least 3).
+		rng (np.random.Generator | int | None): Source of randomness, or a seed for `np.random.default_rng`.
+
+	Returns:
+		(np.ndarray): A 2D NumPy array of shape `(dim, dim)` whose columns are the basis vectors.
+	"""
+	rng = np.random.default_rng(rng)
+	p = random_prime(entry_bound, rng)
+	basis = np.eye(dim, dtype=np.int64)
+	basis[0, 0] = p
+	basis[0, 1:] = rng.integers(0, p, size=dim - 1, dtype=np.int64)
+	return basis
+
+
+LATTICE_FAMILIES = {
+	"1": basis_gen,
+	"2": qary_basis,
+	"3": knapsack_basis,
+	"4": ntru_basis,
+	"5": goldstein_mayer_basis,
+}
+
+
+def lattice_stream(family, dim, entry_bound, rng=None, count=None):
+	"""Lazily generates lattice bases of one family. All bases are drawn from the same random
+	generator, so a seed reproduces the whole sequence.
+
+	Args:
+		family (str): A string key selecting the lattice family from `LATTICE_FAMILIES`.
+		dim (int): Dimension of the lattice bases.
+		entry_bound (int): Entry bound or modulus, interpreted by the selected family.
+		rng (np.random.Generator | int | None): Source of randomness, or a seed for `np.random.default_rng`.
+		count (int): Number of bases to generate. If None, the generator is infinite.
+
+	Yields:
+		(np.ndarray): A 2D NumPy array of shape `(dim, dim)` whose columns are the basis vectors.
+	"""
+	generate = LATTICE_FAMILIES[family]
+	rng = np.random.default_rng(rng)
+	generated = 0
+	while count is None or generated < count:
+		yield generate(dim, entry_bound, rng)
+		generated += 1
@@ -0,0 +1,244 @@
+import numpy as np
+
+from bkz.L3FP import L3fp_params
+from bkz.L3FP.delta_schedule import first_lovasz_violation
+from bkz.L3FP.gsofp_se import gso_full
+from bkz.L3FP.L3fp import l3fp
+from bkz.L3FP.reducer import block_size_reduction, bulk_size_reduction
+from bkz.L3FP.structure import detect_supports
+
+
+def extended_gcd(a, b):
+	"""Extended Euclidean algorithm.
+
+	Args:
+		a (int): First integer.
+		b (int): Second integer.
+
+	Returns:
+		(tuple): `(g, x, y)` with `g = gcd(a, b) >= 0` and `x * a + y * b = g`.
+	"""
+	old_r, r = a, b
+	old_x, x = 1, 0
+	old_y, y = 0, 1
+	while r != 0:
+		q = old_r // r
+		old_r, r = r, old_r - q * r
+		old_x, x = x, old_x - q * x
+		old_y, y = y, old_y - q * y
+	if old_r < 0:
+		return -old_r, -old_x, -old_y
+	return old_r, old_x, old_y
+
+
+def unimodular_completion(coeff_vec):
+	"""Completes an integer coefficient vector to a unimodular transform of the block.
+	Neighbouring coefficients are merged from the last one to the first with extended gcd steps.
+	Every step is a unimodular 2x2 column operation, so the returned matrix `T` has determinant +-1
+	and its first column is `coeff_vec / gcd(coeff_vec)`. Applying `T` to the block therefore puts the
+	candidate vector first without creating a linear dependency.
+
+	Args:
+		coeff_vec (np.ndarray): A 1D array of length `block_size` with the (integral) coefficients of the candidate vector.
+
+	Returns:
+		(np.ndarray): A 2D integer NumPy array of shape (block_size, block_size).
+	"""
+	coeffs = [int(c) for c in np.rint(coeff_vec)]
+	block_size = len(coeffs)
+	transform = np.eye(block_size, dtype=np.int64)
+	for i in range(block_size - 1, 0, -1):
+		a, b = coeffs[i - 1], coeffs[i]
+		if b == 0:
+			continue
+		g, x, y = extended_gcd(a, b)
+		column_a = transform[:, i - 1].copy()
+		column_b = transform[:, i].copy()
+		transform[:, i - 1] = (a // g) * column_a + (b // g) * column_b
+		transform[:, i] = -y * column_a + x * column_b
+		coeffs[i - 1], coeffs[i] = g, 0
+
+	return transform
+
+
+def local_l3fp(gs_coeff_block, gs_squared_norms_block, transform, Lovasz_cond_param):
+	"""LLL-reduces a block given only its projected Gram-Schmidt data.
+	The block is represented by its Gram-Schmidt coefficients and squared norms (local coordinates).
+	Size reductions and swaps are carried out on this data with the update formulas of
+	*A Course in Computational Algebraic Number Theory* by H. Cohen (1993), Algorithm 2.6.3,
+	and every column operation is mirrored on the integer matrix `transform`. The cost depends on the
+	block size only, not on the dimension of the ambient lattice.
+	As in `l3fp`, a size reduction coefficient above 2^(TAU/2) signals that the floating-point data is too
+	imprecise. The local data cannot be recomputed, so the reduction stops there with `f_c` set and the caller
+	continues with the global `l3fp` (see `insert_in_block`). The transform stays unimodular.
+
+	Args:
+		gs_coeff_block (np.ndarray):
+			A 2D NumPy array of shape (block_size, block_size) with the Gram-Schmidt coefficients of the block. Updated in place.
+
+		gs_squared_norms_block (np.ndarray):
+			A 1D NumPy array of shape (block_size,) with the Gram-Schmidt squared norms of the block. Updated in place.
+
+		transform (np.ndarray):
+			A 2D integer NumPy array of shape (block_size, block_size). Updated in place.
+
+		Lovasz_cond_param (float):
+			The Lovasz condition parameter (typically in ]1/2, 1[).
+
+	Returns:
+		(tuple): The updated `gs_coeff_block`, `gs_squared_norms_block` and `transform`, and the flag `f_c`
+		of a precision issue.
+	"""
+	mu, norms = gs_coeff_block, gs_squared_norms_block
+	block_size = len(norms)
+	stage = 1
+	while stage < block_size:
+		# Size reduction of column stage
+		for i in range(stage - 1, -1, -1):
+			x = round(mu[i, stage])
+			if abs(x) > 2 ** (L3fp_params.TAU / 2):
+				return mu, norms, transform, True
+			if x != 0:
+				mu[: i + 1, stage] -= x * mu[: i + 1, i]
+				transform[:, stage] -= x * transform[:, i]
+
+		# Lovasz condition check
+		coeff = mu[stage - 1, stage]
+		swapped_norm = norms[stage] + coeff**2 * norms[stage - 1]
+		if Lovasz_cond_param * norms[stage - 1] > swapped_norm:
+			swapped_coeff = coeff * norms[stage - 1] / swapped_norm
+			norms[stage] = norms[stage - 1] * norms[stage] / swapped_norm
+			norms[stage - 1] = swapped_norm
+			mu[: stage - 1, [stage - 1, stage]] = mu[: stage - 1, [stage, stage - 1]]
+			mu[stage - 1, stage] = swapped_coeff
+			upper = mu[stage, stage + 1 :].copy()
+			mu[stage, stage + 1 :] = mu[stage - 1, stage + 1 :] - coeff * upper
+			mu[stage - 1, stage + 1 :] = upper + swapped_coeff * mu[stage, stage + 1 :]
+			transform[:, [stage - 1, stage]] = transform[:, [stage, stage - 1]]
+			stage = max(stage - 1, 1)
+		else:
+			stage += 1
+
+	return mu, norms, transform, False
+
+
+def insert_in_block(
+	basis_matrix, gs_coeff_matrix, gs_squared_norms, block_start, block_stop, coeff_vec, Lovasz_cond_param
+):
+	"""Inserts the vector `basis_matrix[:, block_start:block_stop] @ coeff_vec` into the block in local coordinates.
+	The block is first rewritten with `unimodular_completion`, so that the candidate vector becomes its first
+	column, and then LLL-reduced with `local_l3fp` on the projected `block_size x block_size` Gram-Schmidt data.
+	The accumulated integer transform is applied to the basis with a single matrix product, the Gram-Schmidt
+	coefficients of the block with respect to the preceding columns are updated with a second one, and the
+	block is finally size-reduced against the preceding columns.
+
+	Args:
+		basis_matrix (np.ndarray):
+			A 2D NumPy array of shape (n, n) representing a lattice basis. Updated in place.
+
+		gs_coeff_matrix (np.ndarray):
+			A 2D NumPy array of shape (n, n) representing the Gram-Schmidt coefficients. Updated in place.
+
+		gs_squared_norms (np.ndarray):
+			A 1D NumPy array of shape (n,) representing the Gram-Schmidt squared norms. Updated in place.
+
+		block_start (int):
+			Index of the first column of the block.
+
+		block_stop (int):
+			Index one past the last column of the block.
+
+		coeff_vec (np.ndarray):
+			A 1D array of length `block_stop - block_start` with the coefficients of the inserted vector.
+
+		Lovasz_cond_param (float):
+			The Lovasz condition parameter (typically in ]1/2, 1[) used by the local LLL.
+
+	Returns:
+		(tuple):
+			- basis_matrix (np.ndarray): The updated basis.
+
+			- gs_coeff_matrix (np.ndarray): The updated Gram-Schmidt coefficients. Columns after the block are
+			  not updated and have to be recomputed (e.g. by `l3fp`) before they are used.
+
+			- gs_squared_norms (np.ndarray): The updated Gram-Schmidt squared norms.
+
+			- restart_stage (int): The first stage from which `l3fp` has to continue: the start of the block if
+			  it violates the Lovasz condition with its predecessor (or if a precision issue was detected),
+			  otherwise the first column after the block.
+	"""
+	transform = unimodular_completion(coeff_vec)
+
+	# Projected block in the orthonormal coordinates of its Gram-Schmidt vectors, rewritten by the transform
+	local_basis = np.sqrt(gs_squared_norms[block_start:block_stop])[:, None] * gs_coeff_matrix[
+		block_start:block_stop, block_start:block_stop
+	]
+	local_norms, local_coeffs = gso_full(local_basis @ transform)
+	local_coeffs, local_norms, transform, f_c = local_l3fp(
+		local_coeffs, local_norms, transform, Lovasz_cond_param
+	)
+
+	# Apply the accumulated transform to the ambient basis and the coefficients of the preceding columns
+	basis_matrix[:, block_start:block_stop] = basis_matrix[:, block_start:block_stop] @ transform
+	gs_coeff_matrix[:block_start, block_start:block_stop] = (
+		gs_coeff_matrix[:block_start, block_start:block_stop] @ transform
+	)
+	gs_coeff_matrix[block_start:block_stop, block_start:block_stop] = local_coeffs
+	gs_squared_norms[block_start:block_stop] = local_norms
+
+	# A precision issue of the local LLL restarts the global l3fp at the block like one of the size reduction
+	f_c, gs_coeff_matrix, basis_matrix = block_size_reduction(
+		block_start, block_stop, gs_coeff_matrix, basis_matrix, f_c
+	)
+
+	restart_stage = block_stop
+	if block_start > 0 and (
+		f_c
+		or Lovasz_cond_param * gs_squared_norms[block_start - 1]
+		> gs_squared_norms[block_start]
+		+ gs_coeff_matrix[block_start - 1, block_start] ** 2 * gs_squared_norms[block_start - 1]
+	):
+		restart_stage = block_start
+	elif block_start == 0 and f_c:
+		restart_stage = 1
+
+	return basis_matrix, gs_coeff_matrix, gs_squared_norms, restart_stage
+
+
+def refresh_gso(basis_matrix, Lovasz_cond_param, supports=None):
+	"""Recomputes the Gram-Schmidt data of the whole basis at the end of a BKZ run.
+	The BKZ drivers only keep the Gram-Schmidt data up to date for the columns up to the current block, so
+	after the final tour the data of later columns can be stale (a swap in an earlier column changes their
+	coefficients). The data is recomputed with `gso_full`, the basis is size-reduced with `bulk_size_reduction`
+	and `l3fp` continues from the first pair of columns that violates the Lovasz condition, if any.
+
+	Args:
+		basis_matrix (np.ndarray):
+			A 2D NumPy array of shape (n, n) representing a lattice basis. Updated in place.
+
+		Lovasz_cond_param (float):
+			The Lovasz condition parameter (typically in ]1/2, 1[).
+
+		supports (np.ndarray):
+			Optional row supports of the columns for structure-aware reduction (see `l3fp`). Updated in place.
+
+	Returns:
+		(tuple): The basis, its Gram-Schmidt coefficients and its Gram-Schmidt squared norms.
+	"""
+	gs_squared_norms, gs_coeff_matrix = gso_full(basis_matrix)
+	f_c, gs_coeff_matrix, basis_matrix = bulk_size_reduction(gs_coeff_matrix, basis_matrix, False)
+	if supports is not None:
+		# The bulk size reduction adds columns to later ones without tracking their supports
+		supports[:] = detect_supports(basis_matrix)
+	stage = 1 if f_c else first_lovasz_violation(gs_coeff_matrix, gs_squared_norms, Lovasz_cond_param)
+	if stage < len(gs_squared_norms):
+		basis_matrix, gs_coeff_matrix, gs_squared_norms = l3fp(
+			basis_matrix,
+			gs_coeff_matrix[:stage, :stage],
+			gs_squared_norms[:stage],
+			start_stage=stage,
+			Lovasz_cond_param=Lovasz_cond_param,
+			supports=supports,
+		)
+
+	return basis_matrix, gs_coeff_matrix, gs_squared_norms
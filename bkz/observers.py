@@ -0,0 +1,288 @@
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# Observer notified by the reduction loops (`l3fp`, `bkz_se`, `bkz_se_pc`). None disables all notifications,
+# the loops then only test `observer is not None`.
+OBSERVER = None
+
+# Progress bar style of every phase reported by the reduction loops
+PHASE_STYLES = {
+	"bkz": {"desc": "BKZ reduction loop", "colour": "yellow", "position": 1},
+	"lll": {"desc": "LLL reduction loop", "colour": "white", "position": 2},
+}
+# Phases and counters recorded by `TraceRecorder` by default (the per-stage steps of `l3fp` are left out)
+TRACE_PHASES = ("bkz", "tour", "svp", "insertion", "lll", "delete_zero")
+TRACE_COUNTERS = ("tours", "insertions")
+# Default capacity of the `TraceRecorder` ring buffer (events)
+TRACE_BUFFER_EVENTS = 2**20
+
+
+class Observer:
+	"""No-op base class of the observers of the reduction loops. Observers are duck-typed, so any object with
+	these methods can be attached with `set_observer`; subclassing only saves writing the unused methods.
+
+	The loops report phases by name and nest them, e.g. every block of a BKZ tour runs `l3fp`:
+
+	- `"bkz"`: a BKZ driver (`bkz_se`, `bkz_se_pc`), split into `"tour"`s (detail `index`) with the steps
+	  `"svp"` (SVP solver call) and `"insertion"` (insertion of a shorter vector and the following LLL),
+	  both with the block boundaries `start` and `end` as details.
+	- `"lll"`: a call of an `LLL_ALGORITHMS` variant (detail `start`, the start stage), with the steps `"gso"`
+	  (Gram-Schmidt update), `"size_reduction"` and `"swap"` (a column swap, or a column move in the deep
+	  insertion variants), plus `"deep_insertion"` (search of the insertion position) in `l3fp_deep` and `l3fp_pot`.
+	- `"delete_zero"`: removal of a zero vector in `l3fp_deep_insert` (detail `stage`).
+
+	Counters are reported with `count` (`"swaps"`, `"deep_insertions"` (moves past more than one column),
+	`"f_c_restarts"`, `"insertions"`, `"tours"`) and
+	per-level counters with `count_levels` (`"enum_nodes"`, the visited enumeration nodes per tree level).
+	"""
+
+	def begin(self, phase, total=None, **details):
+		"""Called when a phase starts. `total` is its number of steps, if known, and `details` describe the
+		phase instance (e.g. the block boundaries)."""
+
+	def update(self, phase, amount=1):
+		"""Called when a phase advances by `amount` steps."""
+
+	def end(self, phase):
+		"""Called when a phase finishes."""
+
+	def count(self, name, amount=1):
+		"""Called when the counter `name` increases by `amount`."""
+
+	def count_levels(self, name, counts):
+		"""Called with the per-level counts `counts` (a 1D array, index = level) of one call, e.g. of one enumeration."""
+
+
+class TqdmObserver(Observer):
+	"""Shows one tqdm progress bar per phase in `styles` (other phases are ignored). A bar is created on the first
+	`begin` of its phase and reset on later ones, so the many short `l3fp` calls of a BKZ run reuse one bar.
+	`close` removes the bars.
+
+	Args:
+		styles (dict): Keyword arguments of `tqdm` per phase, defaults to `PHASE_STYLES`.
+	"""
+
+	def __init__(self, styles=None):
+		self.styles = PHASE_STYLES if styles is None else styles
+		self.bars = {}
+
+	def begin(self, phase, total=None, **details):
+		from tqdm import tqdm
+
+		if phase in self.bars:
+			self.bars[phase].reset(total=total)
+		elif phase in self.styles:
+			self.bars[phase] = tqdm(total=total, leave=False, ascii="-##", **self.styles[phase])
+
+	def update(self, phase, amount=1):
+		if phase in self.bars:
+			self.bars[phase].update(amount)
+
+	def close(self):
+		"""Closes all progress bars."""
+		for bar in self.bars.values():
+			bar.close()
+		self.bars = {}
+
+
+class CompositeObserver(Observer):
+	"""Forwards every notification to several observers, in order.
+
+	Args:
+		*observers: The observers.
+	"""
+
+	def __init__(self, *observers):
+		self.observers = observers
+
+	def begin(self, phase, total=None, **details):
+		for observer in self.observers:
+			observer.begin(phase, total, **details)
+
+	def update(self, phase, amount=1):
+		for observer in self.observers:
+			observer.update(phase, amount)
+
+	def end(self, phase):
+		for observer in self.observers:
+			observer.end(phase)
+
+	def count(self, name, amount=1):
+		for observer in self.observers:
+			observer.count(name, amount)
+
+	def count_levels(self, name, counts):
+		for observer in self.observers:
+			observer.count_levels(name, counts)
+
+	def close(self):
+		"""Closes the observers that have a `close` method."""
+		for observer in self.observers:
+			if hasattr(observer, "close"):
+				observer.close()
+
+
+class StatsObserver(Observer):
+	"""Collects the time spent in every phase, the number of calls of every phase and all counters.
+	Nested phases are timed separately, so the time of `"lll"` includes the time of its `"gso"` steps.
+	"""
+
+	def __init__(self):
+		self.times = {}
+		self.calls = {}
+		self.counters = {}
+		self.levels = {}
+		self.starts = {}
+
+	def begin(self, phase, total=None, **details):
+		self.starts.setdefault(phase, []).append(time.perf_counter())
+
+	def end(self, phase):
+		elapsed = time.perf_counter() - self.starts[phase].pop()
+		self.times[phase] = self.times.get(phase, 0.0) + elapsed
+		self.calls[phase] = self.calls.get(phase, 0) + 1
+
+	def count(self, name, amount=1):
+		self.counters[name] = self.counters.get(name, 0) + amount
+
+	def count_levels(self, name, counts):
+		total = self.levels.get(name, np.zeros(0, dtype=np.int64))
+		if len(counts) > len(total):
+			total = np.pad(total, (0, len(counts) - len(total)))
+		total[: len(counts)] += np.asarray(counts, dtype=np.int64)
+		self.levels[name] = total
+
+	def summary(self):
+		"""Returns the statistics as a JSON-serializable dict with the keys `times` (seconds per phase),
+		`calls` (calls per phase), `counters` and `levels` (per-level counters as lists)."""
+		return {
+			"times": dict(self.times),
+			"calls": dict(self.calls),
+			"counters": dict(self.counters),
+			"levels": {name: counts.tolist() for name, counts in self.levels.items()},
+		}
+
+
+class TraceRecorder(Observer):
+	"""Records a timeline of the reduction as trace events (Chrome trace-event format), which timeline viewers
+	such as Perfetto, `chrome://tracing` or speedscope open directly.
+
+	Every phase in `phases` becomes a begin (`"B"`) and an end (`"E"`) event; the details of the phase (e.g.
+	block boundaries) are the arguments of the begin event, and per-level counts reported during the phase
+	(e.g. the enumeration nodes of an SVP call) are summed into the arguments of its end event. Counters in
+	`counters` become counter (`"C"`) events with their running totals.
+
+	The events are kept in a ring buffer of `max_events` entries, so memory stays bounded on long runs;
+	once it is full, the oldest events are dropped (`dropped` counts them).
+
+	Args:
+		phases (Iterable[str]): The recorded phases, defaults to `TRACE_PHASES`.
+		counters (Iterable[str]): The recorded counters, defaults to `TRACE_COUNTERS`.
+		max_events (int): Capacity of the ring buffer.
+	"""
+
+	def __init__(self, phases=TRACE_PHASES, counters=TRACE_COUNTERS, max_events=TRACE_BUFFER_EVENTS):
+		self.phases = set(phases)
+		self.counters = set(counters)
+		self.events = deque(maxlen=max_events)
+		self.dropped = 0
+		self.totals = {}
+		self.pending = []
+		self.origin = time.perf_counter()
+
+	def record(self, event):
+		"""Appends an event with the current timestamp (microseconds since the creation of the recorder)."""
+		if len(self.events) == self.events.maxlen:
+			self.dropped += 1
+		event.update(ts=(time.perf_counter() - self.origin) * 1e6, pid=0, tid=0)
+		self.events.append(event)
+
+	def begin(self, phase, total=None, **details):
+		if phase in self.phases:
+			self.pending.append({})
+			self.record({"name": phase, "ph": "B", "args": details})
+
+	def end(self, phase):
+		if phase in self.phases:
+			self.record({"name": phase, "ph": "E", "args": self.pending.pop() if self.pending else {}})
+
+	def count(self, name, amount=1):
+		if name in self.counters:
+			self.totals[name] = self.totals.get(name, 0) + amount
+			self.record({"name": name, "ph": "C", "args": {name: self.totals[name]}})
+
+	def count_levels(self, name, counts):
+		if self.pending:
+			self.pending[-1][name] = self.pending[-1].get(name, 0) + int(np.sum(counts))
+
+	def trace(self):
+		"""Returns the trace as a JSON-serializable dict in the trace-event format."""
+		return {"traceEvents": list(self.events), "displayTimeUnit": "ms", "otherData": {"dropped_events": self.dropped}}
+
+	def write(self, path):
+		"""Writes the trace to a JSON file."""
+		with open(path, "w") as trace_file:
+			json.dump(self.trace(), trace_file)
+
+
+def with_stats(reduce, *args, **kwargs):
+	"""Runs a reduction with a `StatsObserver` attached (next to the currently attached observer, if any).
+
+	Example:
+		`(basis, gs_coeffs, gs_norms), stats = with_stats(bkz_se, basis, 20, "4")`
+
+	Args:
+		reduce (Callable): The reduction, e.g. `l3fp` or `bkz_se`.
+		*args: Positional arguments of `reduce`.
+		**kwargs: Keyword arguments of `reduce`.
+
+	Returns:
+		(tuple): The result of `reduce` and the statistics (see `StatsObserver.summary`).
+	"""
+	stats = StatsObserver()
+	previous = set_observer(combine_observers(OBSERVER, stats))
+	try:
+		result = reduce(*args, **kwargs)
+	finally:
+		set_observer(previous)
+	return result, stats.summary()
+
+
+def combine_observers(*observers):
+	"""Combines observers, skipping None entries.
+
+	Returns:
+		None if no observer is given, the observer if only one is given, otherwise a `CompositeObserver`.
+	"""
+	observers = [observer for observer in observers if observer is not None]
+	if len(observers) <= 1:
+		return observers[0] if observers else None
+	return CompositeObserver(*observers)
+
+
+def set_observer(observer):
+	"""Attaches `observer` to the reduction loops of this process (None detaches it).
+
+	Returns:
+		The previously attached observer.
+	"""
+	global OBSERVER
+	previous, OBSERVER = OBSERVER, observer
+	return previous
+
+
+@contextmanager
+def observe(observer):
+	"""Context manager that attaches `observer` for the duration of the block and restores the previous one.
+	Closes the observer afterwards if it has a `close` method (e.g. `TqdmObserver`)."""
+	previous = set_observer(observer)
+	try:
+		yield observer
+	finally:
+		set_observer(previous)
+		if hasattr(observer, "close"):
+			observer.close()
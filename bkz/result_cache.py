@@ -0,0 +1,232 @@
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+# Age in seconds after which a temporary file of `atomic_savez` is taken to be left behind by a crashed writer
+STALE_TEMPORARY_SECONDS = 3600
+
+
+def array_digest(array):
+	"""Returns the hex SHA-256 digest of an array (dtype, shape and bytes)."""
+	array = np.ascontiguousarray(array)
+	digest = hashlib.sha256()
+	digest.update(f"{array.dtype.str}{array.shape}".encode())
+	digest.update(array.tobytes())
+	return digest.hexdigest()
+
+
+def encode_parameter(value):
+	"""JSON encoder for the parameters of a cache key: arrays (e.g. a warm start or supports) are encoded by
+	their digest and callables (e.g. an SVP solver) by their qualified name, everything else by `str`."""
+	if isinstance(value, np.ndarray):
+		return {"array": array_digest(value)}
+	if callable(value):
+		return f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', repr(value))}"
+	return str(value)
+
+
+def atomic_savez(path, **arrays):
+	"""Writes arrays to an uncompressed `.npz` file atomically: they are written to a temporary file in the
+	same directory, which then replaces `path` with `os.replace`. Readers see either the old or the new file.
+
+	Args:
+		path (str): Path of the `.npz` file.
+		**arrays (np.ndarray): The arrays to store, keyed by name.
+	"""
+	directory = os.path.dirname(os.path.abspath(path))
+	with tempfile.NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False) as temporary_file:
+		np.savez(temporary_file, **arrays)
+	os.replace(temporary_file.name, path)
+
+
+class ReductionCache:
+	"""Content-addressed on-disk cache of reduction results.
+
+	A result is keyed by the SHA-256 hash of the input basis (dtype, shape and bytes) together with the
+	parameters of the reduction (algorithm, block size, solver, Lovasz parameters, precision, ...), and is stored
+	as an uncompressed `.npz` file holding the reduced basis, its Gram-Schmidt data and JSON metadata (e.g. the
+	original run time). `cached` wraps a reduction function (e.g. `l3fp` or `bkz_se`) so that its calls go through
+	the cache. Files are written atomically (temporary file and `os.replace`), so concurrent workers can
+	share one cache directory. The total size of the cache is capped: after every write, the least recently used
+	files (by modification time, which is refreshed on every hit) are removed until the cap is met.
+
+	Args:
+		cache_dir (str): Directory of the cache files. Created if it does not exist.
+		max_bytes (int): Size cap of the cache in bytes. If None, the cache is unbounded.
+	"""
+
+	def __init__(self, cache_dir, max_bytes=None):
+		self.cache_dir = cache_dir
+		self.max_bytes = max_bytes
+		os.makedirs(cache_dir, exist_ok=True)
+
+	def key(self, basis_matrix, parameters):
+		"""Computes the cache key of a reduction.
+
+		Args:
+			basis_matrix (np.ndarray): The input basis.
+			parameters (dict): JSON-serializable parameters that determine the result of the reduction.
+
+		Returns:
+			(str): The hex SHA-256 digest of the basis and the parameters.
+		"""
+		basis_matrix = np.ascontiguousarray(basis_matrix)
+		digest = hashlib.sha256()
+		digest.update(f"{basis_matrix.dtype.str}{basis_matrix.shape}".encode())
+		digest.update(basis_matrix.tobytes())
+		digest.update(json.dumps(parameters, sort_keys=True, default=encode_parameter).encode())
+		return digest.hexdigest()
+
+	def path(self, key):
+		"""Returns the path of the cache file of `key`."""
+		return os.path.join(self.cache_dir, key + ".npz")
+
+	def load(self, key):
+		"""Loads a cached result and marks it as recently used.
+
+		Args:
+			key (str): The cache key.
+
+		Returns:
+			(tuple | None): `((basis_matrix, gs_coeff_matrix, gs_squared_norms), metadata)`, or None on a miss.
+		"""
+		path = self.path(key)
+		try:
+			with np.load(path) as stored:
+				result = (stored["basis_matrix"], stored["gs_coeff_matrix"], stored["gs_squared_norms"])
+				metadata = json.loads(str(stored["metadata"]))
+			os.utime(path)
+		except (FileNotFoundError, KeyError, ValueError, OSError):
+			# Missing, evicted concurrently or truncated files are misses
+			return None
+		return result, metadata
+
+	def store(self, key, result, metadata):
+		"""Stores a result atomically and evicts the least recently used files if the size cap is exceeded.
+
+		Args:
+			key (str): The cache key.
+			result (tuple): The reduced basis, its Gram-Schmidt coefficients and its Gram-Schmidt squared norms.
+			metadata (dict): JSON-serializable run metadata.
+		"""
+		basis_matrix, gs_coeff_matrix, gs_squared_norms = result
+		atomic_savez(
+			self.path(key),
+			basis_matrix=basis_matrix,
+			gs_coeff_matrix=gs_coeff_matrix,
+			gs_squared_norms=gs_squared_norms,
+			metadata=np.array(json.dumps(metadata, default=encode_parameter)),
+		)
+		self.evict()
+
+	def evict(self):
+		"""Removes the least recently used cache files until the total size is at most `max_bytes`.
+
+		Temporary `.tmp` files of `atomic_savez` count towards the size as well. Those left behind by a crashed
+		writer are removed once they are older than `STALE_TEMPORARY_SECONDS`; younger ones may still be written
+		and are kept. Stale temporary files are removed also when the cache is unbounded.
+		"""
+		entries = []
+		total = 0
+		now = time.time()
+		for entry in os.scandir(self.cache_dir):
+			if not entry.name.endswith((".npz", ".tmp")):
+				continue
+			try:
+				status = entry.stat()
+			except FileNotFoundError:
+				continue
+			if entry.name.endswith(".npz"):
+				entries.append((status.st_mtime, status.st_size, entry.path))
+			elif now - status.st_mtime > STALE_TEMPORARY_SECONDS:
+				try:
+					os.remove(entry.path)
+				except FileNotFoundError:
+					pass
+				continue
+			total += status.st_size
+		if self.max_bytes is None:
+			return
+		for _, size, path in sorted(entries):
+			if total <= self.max_bytes:
+				break
+			try:
+				os.remove(path)
+			except FileNotFoundError:
+				pass
+			total -= size
+
+	def run(self, reduce, basis_matrix, parameters):
+		"""Returns the cached result of a reduction, or runs it and caches the result. A hit skips the reduction entirely.
+
+		Args:
+			reduce (Callable): The reduction, called as `reduce(basis_matrix)` and returning the usual triple
+				`(basis_matrix, gs_coeff_matrix, gs_squared_norms)`.
+			basis_matrix (np.ndarray): The input basis.
+			parameters (dict): JSON-serializable parameters that determine the result of the reduction.
+
+		Returns:
+			(tuple):
+				- result (tuple): The reduced basis, its Gram-Schmidt coefficients and its Gram-Schmidt squared norms.
+				- run_time (float): The run time of the reduction, 0.0 on a hit (the run time of the original run
+				  stays in the metadata returned by `load`).
+		"""
+		key = self.key(basis_matrix, parameters)
+		cached = self.load(key)
+		if cached is not None:
+			result, _ = cached
+			return result, 0.0
+
+		start = time.time()
+		result = reduce(basis_matrix)
+		run_time = time.time() - start
+		self.store(key, result, {"run_time": run_time, "parameters": parameters})
+		return result, run_time
+
+	def cached(self, reduce):
+		"""Wraps a reduction function so that its calls go through the cache, e.g. `cache.cached(l3fp)(basis)`
+		or `@cache.cached` on a function definition.
+
+		The key covers the qualified name of the function and all further arguments, arrays by their digest
+		(see `encode_parameter`). Solver callables are keyed by their qualified name, so differently behaving
+		callables need different names.
+
+		Args:
+			reduce (Callable): The reduction, called as `reduce(basis_matrix, *args, **kwargs)` and returning the
+				usual triple `(basis_matrix, gs_coeff_matrix, gs_squared_norms)` (e.g. `l3fp`, `bkz_se`, `bkz_se_pc`).
+
+		Returns:
+			(Callable): The cached reduction, with the signature and result of `reduce`.
+		"""
+
+		@functools.wraps(reduce)
+		def cached_reduce(basis_matrix, *args, **kwargs):
+			parameters = {"function": encode_parameter(reduce), "args": args, "kwargs": kwargs}
+			result, _ = self.run(lambda basis: reduce(basis, *args, **kwargs), basis_matrix, parameters)
+			return result
+
+		return cached_reduce
+
+
+def cached_run(cache, reduce, basis_matrix, parameters):
+	"""Runs a reduction through `ReductionCache.run`, or directly (timed) if `cache` is None.
+
+	Args:
+		cache (ReductionCache | None): The cache, or None to disable caching.
+		reduce (Callable): The reduction, called as `reduce(basis_matrix)`.
+		basis_matrix (np.ndarray): The input basis.
+		parameters (dict): JSON-serializable parameters that determine the result of the reduction.
+
+	Returns:
+		(tuple): The result triple of the reduction and its run time (0.0 on a cache hit).
+	"""
+	if cache is not None:
+		return cache.run(reduce, basis_matrix, parameters)
+	start = time.time()
+	result = reduce(basis_matrix)
+	return result, time.time() - start
@@ -1,17 +1,27 @@
 import argparse
-import time
+import json
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import shared_memory
+
+import numpy as np
 
 from tqdm import tqdm
 
 import plotter
 from bkz import BKZ_ALGORITHMS
-from bkz.basis_generator import basis_gen
+from bkz.backends import backend_routine
 from bkz.BasisQualityEvaluation.basis_quality_evaluation import (
 	compute_basis_quality_characteristics,
 )
 from bkz.bkz_params import *
-from bkz.L3FP.L3fp import l3fp
-from bkz.L3FP.L3fp_params import update_tau
+from bkz.hnf_preprocessing import hnf_preprocess
+from bkz.L3FP import LLL_ALGORITHMS
+from bkz.L3FP.delta_schedule import run_delta_schedule
+from bkz.L3FP.L3fp_params import LOVASZ_SCHEDULE, update_tau
+from bkz.lattice_families import LATTICE_FAMILIES
+from bkz.observers import StatsObserver, TqdmObserver, TraceRecorder, combine_observers, observe
+from bkz.result_cache import ReductionCache, cached_run
 
 # RUN: python3 main.py --lattice_dimension 10 --entry_bound 73 --bkz_version 1 --svp_solver 1 --block_size 5 --precision default --repetitions 5
 # Simple RUN: # RUN: python3 main.py
@@ -34,63 +44,280 @@ def positive_integer(value):
 
 
 def compute_and_print_quality_metrics(args):
-	results_original = []
-	results_lll = []
-	results_bkz = []
+	# One independent random stream per lattice ID, so the bases do not depend on the number of workers
+	seed_sequences = np.random.SeedSequence(args.seed).spawn(args.repetitions)
+	generate = LATTICE_FAMILIES[args.lattice_family]
+	# Generate bases of the selected family using either provided or default dimension
+	lattice_bases = (
+		generate(args.lattice_dimension, args.entry_bound, np.random.default_rng(seed_sequence))
+		for seed_sequence in seed_sequences
+	)
 
-	for i in tqdm(
-		range(0, args.repetitions), desc="Repetitions", position=0, ascii="-##", colour="green"
-	):
-		# Generate basis using either provided or default dimension
-		original_basis = basis_gen(args.lattice_dimension, args.entry_bound)
-		update_tau(original_basis, args.precision)
-		characteristics_original = compute_basis_quality_characteristics(original_basis, False)
-		characteristics_original.append(0.0)  # append Run time = 0.0
-		results_original.append(characteristics_original)
-
-		lll_start = time.time()
-		lll_reduced_basis = run_lll(original_basis)
-		lll_end = time.time()
-		lll_time = lll_end - lll_start
-		characteristics_lll = compute_basis_quality_characteristics(lll_reduced_basis, reduced=True)
-		characteristics_lll.append(lll_time)
-		results_lll.append(characteristics_lll)
-
-		bkz_start = time.time()
-		bkz_reduced_basis = run_bkz(
-			original_basis, args.block_size, args.bkz_version, args.svp_solver
-		)
-		bkz_end = time.time()
-		bkz_time = bkz_end - bkz_start
-		characteristics_bkz = compute_basis_quality_characteristics(bkz_reduced_basis, reduced=True)
-		characteristics_bkz.append(bkz_time)
-		results_bkz.append(characteristics_bkz)
+	if args.workers > 1:
+		results = run_pipelines_in_pool(lattice_bases, args)
+	else:
+		# Progress bars, statistics and trace of the reduction loops (sequential runs only, worker processes do not report)
+		stats = StatsObserver() if args.stats else None
+		trace = TraceRecorder() if args.trace else None
+		with observe(combine_observers(TqdmObserver() if args.progress else None, stats, trace)):
+			results = np.array(
+				[
+					run_pipeline(original_basis, args)
+					for original_basis in tqdm(
+						lattice_bases, total=args.repetitions, desc="Repetitions", position=0, ascii="-##", colour="green"
+					)
+				]
+			)
+		if stats is not None:
+			with open(args.stats, "w") as stats_file:
+				json.dump(stats.summary(), stats_file, indent=2)
+		if trace is not None:
+			trace.write(args.trace)
 
+	results_original, results_lll, results_bkz = (results[:, stage].tolist() for stage in range(3))
 	plotter.print_results_data_in_tables(
 		results_original, results_lll, results_bkz, lattice_dimension=args.lattice_dimension
 	)
 
 
-def run_lll(basis):
+def run_pipeline(original_basis, args):
+	"""Runs the reductions of one repetition and evaluates the quality of the original, LLL-reduced and BKZ-reduced basis.
+	The LLL-reduced basis is the warm start of BKZ, so the LLL reduction runs only once (see `run_lll_stage` and `run_bkz_stage`).
+
+	Args:
+		original_basis (np.ndarray):
+			A 2D NumPy array of shape (n, n) representing a lattice basis, where each column is a basis vector.
+		args (argparse.Namespace):
+			The parsed command line arguments.
+
+	Returns:
+		(list): Three lists `[first vector length, root Hermite factor, orthogonality defect, run time]`
+		for the original, the LLL-reduced and the BKZ-reduced basis.
+	"""
+	characteristics_original, characteristics_lll, lll_result = run_lll_stage(original_basis, args)
+	characteristics_bkz = run_bkz_stage(lll_result, args)
+	return [characteristics_original, characteristics_lll, characteristics_bkz]
+
+
+def run_lll_stage(original_basis, args):
+	"""Evaluates the original basis, LLL-reduces it (after the optional HNF front-end) and evaluates the result.
+
+	Args:
+		original_basis (np.ndarray):
+			A 2D NumPy array of shape (n, n) representing a lattice basis, where each column is a basis vector.
+		args (argparse.Namespace):
+			The parsed command line arguments.
+
+	Returns:
+		(tuple):
+			- characteristics_original (list): Quality metrics and run time (0.0) of the original basis.
+			- characteristics_lll (list): Quality metrics and run time (HNF and LLL, 0.0 on a cache hit) of the LLL-reduced basis.
+			- lll_result (tuple): The LLL-reduced basis, its Gram-Schmidt coefficients and squared norms (the BKZ warm start).
+	"""
+	update_tau(original_basis, args.precision)
+	characteristics_original = compute_basis_quality_characteristics(original_basis, False)
+	characteristics_original.append(0.0)  # append Run time = 0.0
+
+	def reduce(basis):
+		# Optional HNF front-end, its run time is added to the LLL reduction
+		reduction_input = hnf_preprocess(basis)[0] if args.hnf else basis
+		return run_lll(reduction_input, args.lll_version, "detect" if args.structure else None, args.backend)
+
+	lll_parameters = {
+		"stage": "lll",
+		"lll_version": args.lll_version,
+		"backend": args.backend,
+		"structure": args.structure,
+		"hnf": args.hnf,
+		"precision": args.precision,
+		"lovasz_schedule": LOVASZ_SCHEDULE,
+	}
+	lll_result, lll_time = cached_run(open_cache(args), reduce, original_basis, lll_parameters)
+	characteristics_lll = compute_basis_quality_characteristics(lll_result[0], reduced=True)
+	characteristics_lll.append(lll_time)
+
+	return characteristics_original, characteristics_lll, lll_result
+
+
+def run_bkz_stage(lll_result, args):
+	"""BKZ-reduces an LLL-reduced basis (warm start) and evaluates the result.
+	The LLL result is not modified, so it can be shared by several BKZ runs (e.g. a block size sweep).
+
+	Args:
+		lll_result (tuple): The LLL-reduced basis, its Gram-Schmidt coefficients and squared norms (see `run_lll_stage`).
+		args (argparse.Namespace): The parsed command line arguments.
+
+	Returns:
+		(list): Quality metrics and run time (BKZ only, 0.0 on a cache hit) of the BKZ-reduced basis.
+	"""
+	lll_reduced_basis, gs_coeff_matrix, gs_squared_norms = lll_result
+
+	def reduce(basis):
+		return run_bkz(
+			basis,
+			args.block_size,
+			args.bkz_version,
+			args.svp_solver,
+			args.lll_version,
+			"detect" if args.structure else None,
+			args.backend,
+			gs_coeff_matrix,
+			gs_squared_norms,
+			return_gso=True,
+			svp_backend=args.svp_backend,
+		)
+
+	bkz_parameters = {
+		"stage": "bkz",
+		"block_size": args.block_size,
+		"bkz_version": args.bkz_version,
+		"svp_solver": args.svp_solver,
+		"lll_version": args.lll_version,
+		"backend": args.backend,
+		"svp_backend": args.svp_backend,
+		"structure": args.structure,
+		"precision": args.precision,
+		"delta": DELTA,
+	}
+	# The key covers the LLL-reduced input basis, whose Gram-Schmidt data is determined by it
+	bkz_result, bkz_time = cached_run(open_cache(args), reduce, lll_reduced_basis, bkz_parameters)
+	bkz_reduced_basis = bkz_result[0]
+	characteristics_bkz = compute_basis_quality_characteristics(bkz_reduced_basis, reduced=True)
+	characteristics_bkz.append(bkz_time)
+
+	return characteristics_bkz
+
+
+def open_cache(args):
+	"""Opens the reduction result cache selected by the command line arguments.
+
+	Args:
+		args (argparse.Namespace): The parsed command line arguments.
+
+	Returns:
+		(ReductionCache | None): The cache in `args.cache_dir`, capped at `args.cache_size_mb` megabytes, or None if no cache directory is given.
+	"""
+	# Namespaces built without the cache arguments (e.g. by scripts and tests) run uncached
+	cache_dir = getattr(args, "cache_dir", None)
+	if cache_dir is None:
+		return None
+	return ReductionCache(cache_dir, int(args.cache_size_mb * 2**20))
+
+
+def run_pipelines_in_pool(lattice_bases, args):
+	"""Runs `run_pipeline` for every basis on a pool of `args.workers` processes.
+	The bases are written into one shared memory block and every worker writes its results into a second one,
+	so neither travels through pickling. The results are stored by lattice ID, so their order does not depend
+	on the order in which the workers finish.
+
+	Args:
+		lattice_bases (Iterable[np.ndarray]): The `args.repetitions` bases of shape (n, n).
+		args (argparse.Namespace): The parsed command line arguments.
+
+	Returns:
+		(np.ndarray): A 3D array of shape (repetitions, 3, 4) with the results of `run_pipeline`, in lattice ID order.
+	"""
+	basis_shape = (args.repetitions, args.lattice_dimension, args.lattice_dimension)
+	results_shape = (args.repetitions, 3, 4)
+	basis_memory = shared_memory.SharedMemory(create=True, size=int(np.prod(basis_shape)) * 8)
+	results_memory = shared_memory.SharedMemory(create=True, size=int(np.prod(results_shape)) * 8)
+	try:
+		bases = np.ndarray(basis_shape, dtype=np.int64, buffer=basis_memory.buf)
+		for lattice_id, original_basis in enumerate(lattice_bases):
+			bases[lattice_id] = original_basis
+		jobs = [
+			(lattice_id, basis_memory.name, basis_shape, results_memory.name, results_shape, args)
+			for lattice_id in range(args.repetitions)
+		]
+		with ProcessPoolExecutor(max_workers=args.workers) as pool:
+			for _ in tqdm(
+				pool.map(run_shared_pipeline, jobs),
+				total=args.repetitions,
+				desc="Repetitions",
+				position=0,
+				ascii="-##",
+				colour="green",
+			):
+				pass
+		results = np.ndarray(results_shape, dtype=np.float64, buffer=results_memory.buf).copy()
+		del bases
+	finally:
+		for memory in (basis_memory, results_memory):
+			memory.close()
+			memory.unlink()
+
+	return results
+
+
+def run_shared_pipeline(job):
+	"""Worker of `run_pipelines_in_pool`: reads one basis from shared memory, runs `run_pipeline`
+	and writes the results into the shared results array.
+
+	Args:
+		job (tuple): The lattice ID, the name and shape of the shared bases, the name and shape of the shared results and the arguments.
+
+	Returns:
+		(int): The lattice ID.
+	"""
+	lattice_id, basis_name, basis_shape, results_name, results_shape, args = job
+	basis_memory = shared_memory.SharedMemory(name=basis_name)
+	results_memory = shared_memory.SharedMemory(name=results_name)
+	try:
+		original_basis = np.ndarray(basis_shape, dtype=np.int64, buffer=basis_memory.buf)[lattice_id].copy()
+		results = np.ndarray(results_shape, dtype=np.float64, buffer=results_memory.buf)
+		results[lattice_id] = run_pipeline(original_basis, args)
+		del results
+	finally:
+		basis_memory.close()
+		results_memory.close()
+
+	return lattice_id
+
+
+def run_lll(basis, lll_version="1", supports=None, backend="1"):
 	"""Calls the LLL-reduction algorithm.
 
 	Args:
 		basis (np.ndarray):
 			A 2D NumPy array of shape (n, n) representing a lattice basis,
 			where each column is a basis vector.
+		lll_version (str):
+			A string key selecting the LLL algorithm variant from `LLL_ALGORITHMS`.
+		supports (np.ndarray | str):
+			Row supports of the basis columns (or `"detect"`) for structure-aware reduction with `l3fp`.
+		backend (str):
+			A string key selecting the acceleration backend from `BACKENDS`.
 
 	Returns:
-		lll_reduced_basis (np.ndarray):
-			A 2D NumPy array of shape (n, n) representing a LLL-reduced lattice basis,
-			where each column is a basis vector.
+		(tuple):
+			- lll_reduced_basis (np.ndarray): A 2D NumPy array of shape (n, n) representing a LLL-reduced lattice basis,
+			  where each column is a basis vector.
+			- gs_coeff_matrix (np.ndarray): The Gram-Schmidt coefficients of the reduced basis.
+			- gs_squared_norms (np.ndarray): The Gram-Schmidt squared norms of the reduced basis.
 	"""
 
-	lll_reduced_basis, gs_coeff_matrix, gs_squared_norms = l3fp(basis)
-
-	return lll_reduced_basis
+	native_lll = LLL_ALGORITHMS[lll_version]
+	lll_reduce = backend_routine(backend, "lll", native_lll)
+	# Backend routines reduce the whole basis in one call, so only the target parameter is run
+	delta_schedule = LOVASZ_SCHEDULE if lll_reduce is native_lll else LOVASZ_SCHEDULE[-1:]
+	if supports is not None:
+		lll_reduce = partial(lll_reduce, supports=supports)
+	return run_delta_schedule(lll_reduce, basis, delta_schedule)
 
 
-def run_bkz(basis, block_size, bkz_version, svp_solver):
+def run_bkz(
+	basis,
+	block_size,
+	bkz_version,
+	svp_solver,
+	lll_version="1",
+	supports=None,
+	backend="1",
+	gs_coeff_matrix=None,
+	gs_squared_norms=None,
+	return_gso=False,
+	svp_backend="1",
+):
 	"""Executes a BKZ (Block Korkine–Zolotarev) reduction on a given lattice basis. This function serves as a unified entry point for invoking one of the
 	available BKZ variants registered in `BKZ_ALGORITHMS`. The selected BKZ
 	routine will repeatedly call the provided SVP solver on local blocks,
@@ -106,19 +333,66 @@ def run_bkz(basis, block_size, bkz_version, svp_solver):
 			A string key selecting the BKZ algorithm variant from `BKZ_ALGORITHMS`.
 		svp_solver (str):
 			A string key referring to an entry in `ENUM_ALGORITHMS`.
+		lll_version (str):
+			A string key selecting the LLL algorithm variant from `LLL_ALGORITHMS` used for preprocessing.
+		supports (np.ndarray | str):
+			Row supports of the basis columns (or `"detect"`) for structure-aware reduction.
+		backend (str):
+			A string key selecting the acceleration backend from `BACKENDS`.
+		gs_coeff_matrix (np.ndarray):
+			Gram-Schmidt coefficients of an LLL-reduced `basis` (warm start, see `bkz_se`). If None, BKZ runs its own LLL preprocessing.
+		gs_squared_norms (np.ndarray):
+			Gram-Schmidt squared norms of an LLL-reduced `basis` (warm start).
+		return_gso (bool):
+			If True, the Gram-Schmidt coefficients and squared norms of the reduced basis are returned as well.
+		svp_backend (str):
+			A string key selecting the backend from `BACKENDS` whose `"svp"` routine replaces the SVP solver
+			`svp_solver` of the native BKZ driver (e.g. `"2"` for native BKZ with fpylll enumeration).
 
 	Returns:
 		bkz_reduced_basis (np.ndarray):
 			A 2D NumPy array of shape (n, n) representing the BKZ-reduced lattice basis, where each column is a basis vector.
+			With `return_gso`, the tuple `(bkz_reduced_basis, gs_coeff_matrix, gs_squared_norms)`.
 	"""
-	bkz_reduce = BKZ_ALGORITHMS[bkz_version]
-	bkz_reduced_basis, gs_coeff_matrix, gs_squared_norms = bkz_reduce(basis, block_size, svp_solver)
+	bkz_reduce = backend_routine(backend, "bkz", BKZ_ALGORITHMS[bkz_version])
+	enum_algo = backend_routine(svp_backend, "svp", svp_solver)
+	bkz_reduced_basis, gs_coeff_matrix, gs_squared_norms = bkz_reduce(
+		basis,
+		block_size,
+		enum_algo,
+		lll_version,
+		supports=supports,
+		gs_coeff_matrix=gs_coeff_matrix,
+		gs_squared_norms=gs_squared_norms,
+	)
 
+	if return_gso:
+		return bkz_reduced_basis, gs_coeff_matrix, gs_squared_norms
 	return bkz_reduced_basis
 
 
-def main():
-	parser = argparse.ArgumentParser(
+class ParameterParser(argparse.ArgumentParser):
+	"""Argument parser that records its arguments by destination in `parameter_actions`, so their types and
+	choices can be looked up (e.g. by `sweep.py` to convert manifest values)."""
+
+	def __init__(self, *args, **kwargs):
+		self.parameter_actions = {}
+		super().__init__(*args, **kwargs)
+
+	def add_argument(self, *args, **kwargs):
+		action = super().add_argument(*args, **kwargs)
+		self.parameter_actions[action.dest] = action
+		return action
+
+
+def build_parser():
+	"""Builds the command line parser of `main.py`. Also used by `sweep.py` for the default parameters
+	and the types of the parameters.
+
+	Returns:
+		(ParameterParser): The parser.
+	"""
+	parser = ParameterParser(
 		formatter_class=argparse.ArgumentDefaultsHelpFormatter,
 		description="Run lattice reduction algorithms.",
 	)
@@ -134,6 +408,12 @@ def main():
 		default=ENTRY_BOUND,
 		help="Bound for basis entry values",
 	)
+	parser.add_argument(
+		"--lattice_family",
+		choices=["1", "2", "3", "4", "5"],
+		default="1",
+		help="Specify the family of generated lattices: 1: uniform random, 2: q-ary (modulus entry_bound), 3: knapsack, 4: NTRU-like (even dimension), 5: Goldstein-Mayer",
+	)
 	parser.add_argument(
 		"--bkz_version",
 		choices=["1", "2"],
@@ -142,9 +422,37 @@ def main():
 	)
 	parser.add_argument(
 		"--svp_solver",
-		choices=["1", "2", "3"],
+		choices=["1", "2", "3", "4", "5"],
+		default="1",
+		help="Specify the svp_solver utilized during bkz execution: 1: enum_se_og_solver, 2: enum_se_solver, 3: enum_sh_solver, 4: enum_frontier_solver, 5: enum_frontier_f32_solver (float32 tree walk). Blocks of dimension 2 to 4 are always solved by the dedicated small-block kernels (Lagrange reduction, small enumeration); --svp_backend 2 solves every block with fpylll.",
+	)
+	parser.add_argument(
+		"--lll_version",
+		choices=["1", "2", "3", "4"],
 		default="1",
-		help="Specify the svp_solver utilized during bkz execution: 1: enum_se_og_solver, 2: enum_se_solver, 3: enum_sh_solver",
+		help="Specify the LLL algorithm used on its own and as bkz preprocessing: 1: l3fp, 2: l3fp_all_swap, 3: l3fp_deep, 4: l3fp_pot",
+	)
+	parser.add_argument(
+		"--backend",
+		choices=["1", "2"],
+		default="1",
+		help="Specify the backend running the LLL and BKZ reductions: 1: native (pure Python), 2: fpylll",
+	)
+	parser.add_argument(
+		"--svp_backend",
+		choices=["1", "2"],
+		default="1",
+		help="Specify the backend of the SVP solver of the native BKZ drivers: 1: native (--svp_solver), 2: fpylll enumeration. Requires --backend 1.",
+	)
+	parser.add_argument(
+		"--structure",
+		action="store_true",
+		help="Detect the row supports of the basis columns and use structure-aware reduction (e.g. for q-ary bases). Requires --lll_version 1.",
+	)
+	parser.add_argument(
+		"--hnf",
+		action="store_true",
+		help="Replace each basis by its Hermite normal form modulo the determinant before reduction, if this shrinks its entries.",
 	)
 	parser.add_argument(
 		"--block_size", type=int, default=BLOCK_SIZE, help="Desired block size for bkz."
@@ -158,16 +466,78 @@ def main():
 	parser.add_argument(
 		"--repetitions", type=int, default=5, help="Number of random lattice bases to operate on."
 	)
-	args = parser.parse_args()
+	parser.add_argument(
+		"--workers",
+		type=int,
+		default=1,
+		help="Number of worker processes running the repetitions in parallel.",
+	)
+	parser.add_argument(
+		"--seed",
+		type=int,
+		default=None,
+		help="Seed for the random lattice bases. If omitted, every run uses fresh randomness.",
+	)
+	parser.add_argument(
+		"--progress",
+		action="store_true",
+		help="Show progress bars of the LLL and BKZ reduction loops (with --workers 1).",
+	)
+	parser.add_argument(
+		"--stats",
+		default=None,
+		help="Path of a JSON file for the statistics of all reductions: time and calls per phase (LLL, GSO updates, size reduction, swaps, SVP calls, insertions, ...), counters and enumeration nodes per tree level. Requires --workers 1.",
+	)
+	parser.add_argument(
+		"--trace",
+		default=None,
+		help="Path of a JSON trace-event file with the timeline of all reductions (BKZ tours, SVP calls, insertions and LLL calls), for timeline viewers such as Perfetto or speedscope. Requires --workers 1.",
+	)
+	parser.add_argument(
+		"--cache_dir",
+		default=None,
+		help="Directory of an on-disk cache of LLL and BKZ results. A cached result skips the reduction and reports a run time of 0.0. If omitted, nothing is cached.",
+	)
+	parser.add_argument(
+		"--cache_size_mb",
+		type=float,
+		default=1024,
+		help="Size cap of the result cache in megabytes. The least recently used results are evicted first.",
+	)
+	return parser
 
+
+def validate_args(args):
+	"""Checks the parsed command line arguments.
+
+	Args:
+		args (argparse.Namespace): The parsed command line arguments.
+	"""
 	if (
 		not positive_integer(args.lattice_dimension)
 		or not positive_integer(args.entry_bound)
 		or not positive_integer(args.repetitions)
 		or not positive_integer(args.block_size)
+		or not positive_integer(args.workers)
 	):
 		raise TypeError("All numerical command line arguments should be positive integers.")
+	if args.stats is not None and args.workers != 1:
+		raise ValueError("Statistics (--stats) require --workers 1.")
+	if args.trace is not None and args.workers != 1:
+		raise ValueError("Tracing (--trace) requires --workers 1.")
+	if args.cache_size_mb <= 0:
+		raise ValueError("The cache size (--cache_size_mb) should be positive.")
+	if args.structure and args.lll_version != "1":
+		raise ValueError("Structure-aware reduction (--structure) requires --lll_version 1.")
+	if args.structure and args.backend != "1":
+		raise ValueError("Structure-aware reduction (--structure) requires --backend 1.")
+	if args.svp_backend != "1" and args.backend != "1":
+		raise ValueError("An SVP backend (--svp_backend) requires the native BKZ drivers (--backend 1).")
+
 
+def main():
+	args = build_parser().parse_args()
+	validate_args(args)
 	compute_and_print_quality_metrics(args)
 
 
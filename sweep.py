@@ -0,0 +1,259 @@
+import argparse
+import hashlib
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from tqdm import tqdm
+
+from bkz.lattice_families import LATTICE_FAMILIES
+from main import build_parser, run_bkz_stage, run_lll_stage, validate_args
+
+# RUN: python3 sweep.py manifest.json --results sweep_results.jsonl --workers 4
+
+# Manifest keys that control the sweep itself instead of a single pipeline run
+SWEEP_KEYS = ("repetitions", "workers", "progress", "stats", "trace", "cache_dir", "cache_size_mb")
+# Top-level manifest keys, which a manifest that is a single grid holds next to its parameters
+MANIFEST_KEYS = ("grids", "repetitions", "seed")
+DEFAULT_SEED = 0
+# Parameters that only affect BKZ; jobs that differ only in these share one LLL result
+BKZ_PARAMETERS = ("block_size", "bkz_version", "svp_solver")
+
+
+def coerce_parameter(parser, name, value):
+	"""Converts a manifest value to the type of the corresponding `main.py` argument.
+
+	Args:
+		parser (main.ParameterParser): The parser of `main.py` (see `main.build_parser`).
+		name (str): The argument name, e.g. `"block_size"`.
+		value: The value from the manifest.
+
+	Returns:
+		The converted value, e.g. an int for `block_size` or a string key for `svp_solver`.
+	"""
+	action = parser.parameter_actions.get(name)
+	if action is None or name == "help":
+		raise ValueError(f"Unknown sweep parameter '{name}'.")
+	if action.type is not None:
+		return action.type(value)
+	if action.choices is not None:
+		return str(value)
+	return value
+
+
+def expand_manifest(manifest, parser=None):
+	"""Expands a sweep manifest into jobs. A manifest holds one parameter grid (a dict) or a list of grids
+	under `"grids"`, plus optional `"repetitions"` and `"seed"`. Every grid maps `main.py` argument names
+	to a list of values (or a single value), and is expanded into the Cartesian product of its values.
+	Each parameter combination yields one job per lattice ID. Jobs are keyed by a hash of their parameters,
+	so combinations that occur in several grids are run only once. Keys of `SWEEP_KEYS` and `"seed"` apply to the
+	whole sweep, so a grid holding one raises a ValueError.
+
+	Example:
+		`{"grids": [{"lattice_dimension": [20, 30], "block_size": [5, 10], "svp_solver": [1, 4]}], "repetitions": 3, "seed": 1}`
+
+	Args:
+		manifest (dict): The manifest.
+		parser (main.ParameterParser): The parser of `main.py`. If None, it is built with `main.build_parser`.
+
+	Returns:
+		(dict[str, dict]): The resolved parameters of every job (all `main.py` arguments except `SWEEP_KEYS`,
+		plus `lattice_id`), keyed by `job_key`.
+	"""
+	parser = build_parser() if parser is None else parser
+	grids = manifest.get("grids", manifest)
+	grids = [grids] if isinstance(grids, dict) else grids
+	repetitions = int(manifest.get("repetitions", 1))
+	seed = int(manifest.get("seed", DEFAULT_SEED))
+
+	defaults = vars(parser.parse_args([]))
+	jobs = {}
+	for grid in grids:
+		names = [name for name in grid if grid is not manifest or name not in MANIFEST_KEYS]
+		for name in names:
+			if name in SWEEP_KEYS or name == "seed":
+				raise ValueError(f"The sweep key '{name}' cannot be part of a parameter grid; set it for the whole sweep.")
+		value_lists = [grid[name] if isinstance(grid[name], list) else [grid[name]] for name in names]
+		for values in itertools.product(*value_lists):
+			parameters = {**defaults, **{name: coerce_parameter(parser, name, value) for name, value in zip(names, values)}}
+			validate_args(argparse.Namespace(**parameters))
+			# Jobs are keyed by all resolved parameters, so an explicit default value is the same job as an omitted one
+			for name in SWEEP_KEYS:
+				parameters.pop(name)
+			for lattice_id in range(repetitions):
+				job = {**parameters, "seed": seed, "lattice_id": lattice_id}
+				jobs[job_key(job)] = job
+
+	return jobs
+
+
+def job_key(parameters):
+	"""Hashes the parameters of a job.
+
+	Args:
+		parameters (dict): The parameters of a job.
+
+	Returns:
+		(str): The first 16 hex digits of the SHA-256 hash of the canonical JSON encoding of the parameters.
+	"""
+	encoded = json.dumps(parameters, sort_keys=True, separators=(",", ":")).encode()
+	return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def completed_jobs(results_path):
+	"""Reads the keys of the jobs whose results were already appended to the results file.
+	A last line that was cut off by an interruption is ignored, so that job runs again.
+
+	Args:
+		results_path (str): Path of the JSON Lines results file.
+
+	Returns:
+		(set[str]): The job keys found in the file (empty if the file does not exist).
+	"""
+	if not os.path.exists(results_path):
+		return set()
+	keys = set()
+	with open(results_path) as results_file:
+		for line in results_file:
+			try:
+				keys.add(json.loads(line)["job"])
+			except (json.JSONDecodeError, KeyError):
+				continue
+	return keys
+
+
+def group_jobs(jobs):
+	"""Groups jobs that differ only in `BKZ_PARAMETERS`, so that they can share one LLL result.
+
+	Args:
+		jobs (dict[str, dict]): The parameters of the jobs, keyed by job key.
+
+	Returns:
+		(list[list[tuple]]): The groups, each a list of `(key, parameters)` pairs.
+	"""
+	groups = {}
+	for key, parameters in jobs.items():
+		lll_parameters = {name: value for name, value in parameters.items() if name not in BKZ_PARAMETERS}
+		groups.setdefault(job_key(lll_parameters), []).append((key, parameters))
+	return list(groups.values())
+
+
+def run_job_group(group, cache_dir=None, cache_size_mb=None):
+	"""Generates the basis of a group of jobs, LLL-reduces it once and runs BKZ for every job of the group
+	with the shared LLL result as warm start (see `main.run_lll_stage` and `main.run_bkz_stage`).
+	The basis of lattice ID `i` is drawn from the `i`-th child of `SeedSequence(seed)`, which is the same
+	basis `main.py --seed seed` generates for lattice ID `i`.
+
+	Args:
+		group (list[tuple]): `(key, parameters)` pairs of jobs that differ only in `BKZ_PARAMETERS` (see `group_jobs`).
+		cache_dir (str): Directory of the reduction result cache (see `main.open_cache`). If None, nothing is cached.
+		cache_size_mb (float): Size cap of the result cache in megabytes.
+
+	Returns:
+		(list[dict]): One results record per job, with the job key, its parameters and the metrics of the
+		original, LLL-reduced and BKZ-reduced basis.
+	"""
+	cache_options = {"cache_dir": cache_dir, "cache_size_mb": cache_size_mb}
+	args = argparse.Namespace(**group[0][1], **cache_options)
+	seed_sequence = np.random.SeedSequence(args.seed, spawn_key=(args.lattice_id,))
+	original_basis = LATTICE_FAMILIES[args.lattice_family](
+		args.lattice_dimension, args.entry_bound, np.random.default_rng(seed_sequence)
+	)
+	results_original, results_lll, lll_result = run_lll_stage(original_basis, args)
+
+	records = []
+	for key, parameters in group:
+		results_bkz = run_bkz_stage(lll_result, argparse.Namespace(**parameters, **cache_options))
+		records.append(
+			{
+				"job": key,
+				"parameters": parameters,
+				"original": [float(x) for x in results_original],
+				"lll": [float(x) for x in results_lll],
+				"bkz": [float(x) for x in results_bkz],
+			}
+		)
+	return records
+
+
+def run_sweep(manifest, results_path, workers=1, cache_dir=None, cache_size_mb=None):
+	"""Runs all jobs of a manifest that have no results yet and appends the records to the results file
+	as soon as their group of jobs (see `group_jobs`) finishes, so an interrupted sweep resumes where it stopped.
+
+	Args:
+		manifest (dict): The manifest (see `expand_manifest`).
+		results_path (str): Path of the JSON Lines results file.
+		workers (int): Number of worker processes. With 1, the jobs run in this process.
+		cache_dir (str): Directory of the reduction result cache shared by all workers. If None, nothing is cached.
+		cache_size_mb (float): Size cap of the result cache in megabytes.
+
+	Returns:
+		(int): The number of jobs run.
+	"""
+	jobs = expand_manifest(manifest)
+	done = completed_jobs(results_path)
+	pending = {key: parameters for key, parameters in jobs.items() if key not in done}
+
+	# Terminate a line cut off by an interruption before appending
+	if os.path.exists(results_path) and os.path.getsize(results_path) > 0:
+		with open(results_path, "rb") as results_file:
+			results_file.seek(-1, os.SEEK_END)
+			needs_newline = results_file.read(1) != b"\n"
+		if needs_newline:
+			with open(results_path, "a") as results_file:
+				results_file.write("\n")
+
+	progress = tqdm(total=len(pending), desc="Sweep jobs", ascii="-##", colour="green")
+	with open(results_path, "a") as results_file:
+
+		def append(records):
+			results_file.writelines(json.dumps(record) + "\n" for record in records)
+			results_file.flush()
+			progress.update(len(records))
+
+		groups = group_jobs(pending)
+		if workers > 1:
+			with ProcessPoolExecutor(max_workers=workers) as pool:
+				futures = [pool.submit(run_job_group, group, cache_dir, cache_size_mb) for group in groups]
+				for future in as_completed(futures):
+					append(future.result())
+		else:
+			for group in groups:
+				append(run_job_group(group, cache_dir, cache_size_mb))
+	progress.close()
+
+	return len(pending)
+
+
+def main():
+	parser = argparse.ArgumentParser(
+		formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+		description="Run a sweep of lattice reductions over the parameter grids of a manifest.",
+	)
+	parser.add_argument("manifest", help="Path of the JSON manifest with the parameter grids.")
+	parser.add_argument(
+		"--results",
+		default=None,
+		help="Path of the JSON Lines results file. Defaults to the manifest path with the suffix .jsonl.",
+	)
+	parser.add_argument("--workers", type=int, default=1, help="Number of worker processes.")
+	parser.add_argument(
+		"--cache_dir",
+		default=None,
+		help="Directory of an on-disk cache of LLL and BKZ results, shared by all workers and sweeps. If omitted, nothing is cached.",
+	)
+	parser.add_argument(
+		"--cache_size_mb", type=float, default=1024, help="Size cap of the result cache in megabytes."
+	)
+	args = parser.parse_args()
+
+	with open(args.manifest) as manifest_file:
+		manifest = json.load(manifest_file)
+	results_path = args.results or os.path.splitext(args.manifest)[0] + ".jsonl"
+	run_sweep(manifest, results_path, args.workers, args.cache_dir, args.cache_size_mb)
+
+
+if __name__ == "__main__":
+	main()
@@ -23,4 +23,14 @@ def test_case_square_many(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND, test_c
         assert verify_gso_structure(lll_basis, gsc, gs_squared_norms), "GSO structure is malformed."
         assert is_size_reduced(gsc), "Condition mu is not satisfied."
         assert verify_Lovasz_condition(gs_squared_norms, gsc), "Condition delta is not satisfied."
-        
\ No newline at end of file
+
+def test_case_lazy_size_reduction(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND, test_cases=TEST_CASES):
+    for _ in range(test_cases):
+        basis = basis_gen(dim, entry_bound)
+        lll_basis, gsc, gs_squared_norms = l3fp(basis.copy(), lazy_size_reduction=True)
+        upper_bound = (4/3) ** ((dim-1)/4)
+        assert verify_lattice_invariance(basis, lll_basis), "Determinant mismatch."
+        assert verify_hermite_factor(lll_basis, dim, upper_bound), "Hermite factor out of bounds."
+        assert verify_gso_structure(lll_basis, gsc, gs_squared_norms), "GSO structure is malformed."
+        assert is_size_reduced(gsc), "Condition mu is not satisfied."
+        assert verify_Lovasz_condition(gs_squared_norms, gsc), "Condition delta is not satisfied."
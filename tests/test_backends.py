@@ -0,0 +1,80 @@
+import sys
+import os
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from tests.test_utils import *
+from bkz.backends import BACKENDS, fpylll_bkz, fpylll_enum_solver, fpylll_lll, from_integer_matrix, to_integer_matrix
+from bkz.basis_generator import basis_gen
+from bkz.bkz_schnorr_euchner import bkz_se
+from bkz.L3FP.L3fp import l3fp
+from bkz.SVPsolvers import ENUM_ALGORITHMS
+from main import run_bkz
+
+LATTICE_DIMENSION = 16
+ENTRY_BOUND = 1021
+BLOCK_SIZE = 6
+LOVASZ_CONDITION_PARAM = 0.99
+SEED = 17
+
+#RUN root: pytest tests/test_backends.py
+# Allow prints: pytest -s tests/test_backends.py
+
+def test_case_conversion(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND):
+    basis = basis_gen(dim, entry_bound, SEED)
+    assert np.array_equal(from_integer_matrix(to_integer_matrix(basis)), basis), "Round trip changed the basis."
+
+
+def test_case_fpylll_lll(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND, param=LOVASZ_CONDITION_PARAM):
+    basis = basis_gen(dim, entry_bound, SEED)
+    reduced_basis, gsc, gs_squared_norms = fpylll_lll(basis.copy(), Lovasz_cond_param=param)
+    assert verify_lattice_invariance(basis, reduced_basis), "Lattice changed."
+    assert is_size_reduced(gsc), "Basis is not size-reduced."
+    assert verify_Lovasz_condition(gs_squared_norms, gsc, param), "Lovasz condition violated."
+
+
+def test_case_fpylll_bkz(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND, block_size=BLOCK_SIZE):
+    basis = basis_gen(dim, entry_bound, SEED)
+    reduced_basis, gsc, gs_squared_norms = fpylll_bkz(basis.copy(), block_size)
+    assert verify_lattice_invariance(basis, reduced_basis), "Lattice changed."
+    assert verify_gso_structure(reduced_basis, gsc, gs_squared_norms), "Gram-Schmidt data is inconsistent."
+    for j in range(dim - 1):
+        k = min(j + block_size, dim)
+        squared_norm, _ = ENUM_ALGORITHMS["1"](
+            reduced_basis[:, j:k], gs_squared_norms[j:k], gsc[j:k, j:k]
+        )
+        assert squared_norm > 0.99 * gs_squared_norms[j], f"Block {j} is not SVP-reduced."
+
+
+def test_case_fpylll_enum_solver(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND, block_size=BLOCK_SIZE):
+    basis, gsc, gs_squared_norms = l3fp(basis_gen(dim, entry_bound, SEED))
+    for j in range(0, dim - block_size, 3):
+        block = (basis[:, j:j + block_size], gs_squared_norms[j:j + block_size], gsc[j:j + block_size, j:j + block_size])
+        squared_norm, u = fpylll_enum_solver(*block)
+        expected_squared_norm, _ = ENUM_ALGORITHMS["1"](*block)
+        assert np.all(u == np.round(u)) and np.any(u), "Coefficient vector is not a nonzero integer vector."
+        assert np.isclose(squared_norm, expected_squared_norm), "fpylll enumeration did not find the shortest vector."
+
+    reduced_basis, _, _ = bkz_se(basis.copy(), block_size, fpylll_enum_solver)
+    assert verify_lattice_invariance(basis, reduced_basis), "Lattice changed in BKZ with the fpylll solver."
+
+
+def test_case_svp_backend(monkeypatch, dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND, block_size=BLOCK_SIZE):
+    calls = []
+    def counting_solver(*block):
+        calls.append(1)
+        return fpylll_enum_solver(*block)
+    monkeypatch.setitem(BACKENDS["2"], "svp", counting_solver)
+
+    basis = basis_gen(dim, entry_bound, SEED)
+    # bkz_version "2" is bkz_se, which runs with the fpylll enumeration as its SVP solver
+    reduced_basis = run_bkz(basis.copy(), block_size, "2", "1", svp_backend="2")
+    expected_basis, _, _ = bkz_se(basis.copy(), block_size, fpylll_enum_solver)
+    assert calls, "The SVP backend should replace the native solver."
+    assert np.array_equal(reduced_basis, expected_basis), "Native BKZ with fpylll enumeration changed its result."
+
+
+def test_case_integer_overflow():
+    with pytest.raises(OverflowError):
+        to_integer_matrix(np.array([[2.0**63, 0.0], [0.0, 1.0]]))
@@ -15,3 +15,11 @@ def test_basis_gen():
 
     assert basis.shape == (LATTICE_DIMENSION, LATTICE_DIMENSION), "Generated basis has malformed shape."
     assert rank == LATTICE_DIMENSION, "Generated basis is not full-rank."
+
+
+def test_basis_gen_seeded():
+    basis = basis_gen(LATTICE_DIMENSION, ENTRY_BOUND, rng=1234)
+    same_basis = basis_gen(LATTICE_DIMENSION, ENTRY_BOUND, rng=np.random.default_rng(1234))
+
+    assert np.array_equal(basis, same_basis), "Seeded bases differ."
+    assert np.all((basis >= 0) & (basis < ENTRY_BOUND)), "Entries out of bounds."
@@ -0,0 +1,26 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.bench import compare, run_benchmarks
+
+THRESHOLD = 0.1
+
+#RUN root: pytest tests/test_benchmarks.py
+# Allow prints: pytest -s tests/test_benchmarks.py
+
+def test_case_run_benchmarks():
+    run = run_benchmarks("size_reduction_loop", repeats=2, warmup=0)
+    assert list(run["results"]) == ["size_reduction_loop/dim=40"]
+    timing = run["results"]["size_reduction_loop/dim=40"]
+    assert timing["repeats"] == 2 and 0 < timing["min"] <= timing["median"]
+    assert run["metadata"]["seed"] == 0
+
+
+def test_case_compare_flags_regressions():
+    baseline = {"results": {"fast": {"median": 1.0}, "slow": {"median": 1.0}, "removed": {"median": 1.0}}}
+    current = {"results": {"fast": {"median": 1.05}, "slow": {"median": 1.5}, "new": {"median": 1.0}}}
+    rows = {row["name"]: row for row in compare(baseline, current, THRESHOLD)}
+    assert set(rows) == {"fast", "slow"}, "Only benchmarks of both runs should be compared."
+    assert not rows["fast"]["regression"], "A slowdown within the threshold is not a regression."
+    assert rows["slow"]["regression"] and abs(rows["slow"]["change"] - 0.5) < 1e-12
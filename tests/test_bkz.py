@@ -3,7 +3,11 @@ import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from bkz.basis_generator import basis_gen
-from bkz import BKZ_ALGORITHMS
+from bkz import BKZ_ALGORITHMS, BKZ_STEPS
+from bkz.L3FP.gsofp_se import gso_full
+from bkz.lattice_families import lattice_stream
+from bkz.L3FP.L3fp import l3fp
+from bkz.SVPsolvers import ENUM_SOLVERS
 from tests.test_utils import *
 
 LATTICE_DIMENSION = 10
@@ -12,6 +16,14 @@ BLOCK_SIZE = LATTICE_DIMENSION // 2
 BKZ_VERSION = "1"
 ENUM_VERSION = "1"
 TEST_CASES = 10
+# NTRU-like bases whose loop Gram-Schmidt data ends up stale after the last tour
+STALE_FAMILY = "4"
+STALE_DIMENSION = 20
+STALE_BLOCK_SIZE = 6
+STALE_SEED = 2
+# A block of an LLL-reduced basis that the full-height coefficient slice gets wrong
+SVP_INPUT_SEED = 1
+SVP_INPUT_BLOCK_START = 4
 
 #RUN root: pytest tests/test_bkz.py
 # Allow prints: pytest -s tests/test_bkz.py
@@ -37,3 +49,66 @@ def test_case_basic(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND, block_size=B
 		assert verify_Lovasz_condition(gs_squared_norms, gsc), "Condition delta is not satisfied."
 
 	print(f"Test passed with {warning_amount} warnings!")
+
+
+def test_case_warm_start(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND, test_cases=TEST_CASES):
+	for bkz_reduce in BKZ_ALGORITHMS.values():
+		for _ in range(test_cases):
+			basis = basis_gen(dim, entry_bound)
+			lll_basis, lll_gsc, lll_norms = l3fp(basis.copy())
+			lll_result = (lll_basis.copy(), lll_gsc.copy(), lll_norms.copy())
+			# One LLL result is shared by several block sizes
+			for block_size in (3, 5):
+				bkz_reduced_basis, gsc, gs_squared_norms = bkz_reduce(
+					lll_basis, block_size, ENUM_VERSION, gs_coeff_matrix=lll_gsc, gs_squared_norms=lll_norms
+				)
+				assert verify_lattice_invariance(basis, bkz_reduced_basis), "Determinant mismatch."
+				assert is_size_reduced(gsc), "Condition mu is not satisfied."
+				assert verify_Lovasz_condition(gs_squared_norms, gsc), "Condition delta is not satisfied."
+				for shared, original in zip((lll_basis, lll_gsc, lll_norms), lll_result):
+					assert np.array_equal(shared, original), "Warm start modified the LLL result."
+
+
+def test_case_final_refresh():
+	basis, = lattice_stream(STALE_FAMILY, STALE_DIMENSION, ENTRY_BOUND, STALE_SEED, 1)
+	for bkz_version, bkz_steps in BKZ_STEPS.items():
+		# The working arrays of the last yielded state hold the loop data when the generator returns
+		steps = bkz_steps(basis.copy(), STALE_BLOCK_SIZE, ENUM_VERSION)
+		while True:
+			try:
+				state = next(steps)
+			except StopIteration as stop:
+				bkz_reduced_basis, gsc, gs_squared_norms = stop.value
+				break
+		loop_norms, loop_gsc = gso_full(state["basis_matrix"])
+		assert not (
+			np.allclose(loop_norms, state["gs_squared_norms"]) and np.allclose(loop_gsc, np.triu(state["gs_coeff_matrix"]))
+		), "The Gram-Schmidt data of the loop should be stale for this basis."
+
+		expected_norms, expected_gsc = gso_full(bkz_reduced_basis)
+		assert np.allclose(gs_squared_norms, expected_norms), f"BKZ {bkz_version} returned stale Gram-Schmidt norms."
+		assert np.allclose(np.triu(gsc), expected_gsc), f"BKZ {bkz_version} returned stale Gram-Schmidt coefficients."
+
+
+def test_case_block_svp_input(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND, block_size=BLOCK_SIZE):
+	svp_solver = ENUM_SOLVERS[ENUM_VERSION]
+	basis = basis_gen(dim, entry_bound, np.random.default_rng(SVP_INPUT_SEED))
+	lll_basis, gsc, gs_squared_norms = l3fp(basis.copy())
+	j = SVP_INPUT_BLOCK_START
+	k = j + block_size - 1
+	block = lll_basis[:, j:k + 1]
+
+	# Reference: the block projected orthogonally to the preceding columns
+	q, _ = np.linalg.qr(lll_basis[:, :j])
+	projected_block = block - q @ (q.T @ block)
+	projected_norms, projected_gsc = gso_full(projected_block)
+	expected_squared_norm, _ = svp_solver(projected_block, projected_norms, projected_gsc)
+
+	# The solvers index the coefficients with block-local rows, so the drivers pass the diagonal block
+	squared_norm, coeff_vec = svp_solver(block, gs_squared_norms[j:k + 1], gsc[j:k + 1, j:k + 1])
+	assert np.isclose(squared_norm, expected_squared_norm), "The block SVP is not solved on the projected block."
+	assert np.isclose(np.sum((projected_block @ coeff_vec) ** 2), squared_norm), "Projected length mismatch."
+
+	# The full-height slice, which the drivers passed before, reads the coefficients of the first columns instead
+	squared_norm, coeff_vec = svp_solver(block, gs_squared_norms[j:k + 1], gsc[:, j:k + 1])
+	assert not np.isclose(np.sum((projected_block @ coeff_vec) ** 2), expected_squared_norm)
@@ -0,0 +1,69 @@
+import sys
+import os
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bkz.basis_generator import basis_gen
+from bkz import BKZ_ALGORITHMS
+from bkz.bkz_stream import iter_bkz
+from bkz.observers import CompositeObserver, StatsObserver, TraceRecorder, observe
+
+LATTICE_DIMENSION = 16
+ENTRY_BOUND = 173
+BLOCK_SIZE = 6
+ENUM_VERSION = "2"
+
+#RUN root: pytest tests/test_bkz_stream.py
+# Allow prints: pytest -s tests/test_bkz_stream.py
+
+
+@pytest.mark.parametrize("bkz_version", sorted(BKZ_ALGORITHMS))
+def test_case_snapshots(bkz_version):
+	basis = basis_gen(LATTICE_DIMENSION, ENTRY_BOUND, np.random.default_rng(7))
+	expected = BKZ_ALGORITHMS[bkz_version](basis.copy(), BLOCK_SIZE, ENUM_VERSION)
+
+	snapshots = [snapshot.copy() for snapshot in iter_bkz(basis.copy(), BLOCK_SIZE, ENUM_VERSION, bkz_version)]
+	assert [snapshot.tours for snapshot in snapshots[:-1]] == list(range(len(snapshots) - 1)), "Expected one snapshot per tour."
+	final = snapshots[-1]
+	assert final.done and not any(snapshot.done for snapshot in snapshots[:-1])
+	assert np.array_equal(final.basis_matrix, expected[0]), "The final snapshot differs from the driver result."
+	assert np.array_equal(final.gs_squared_norms, expected[2])
+
+	block_snapshots = list(iter_bkz(basis.copy(), BLOCK_SIZE, ENUM_VERSION, bkz_version, per="block"))
+	assert [snapshot.blocks for snapshot in block_snapshots] == list(range(len(block_snapshots)))
+	assert block_snapshots[-1].blocks == final.blocks
+
+
+def test_case_read_only_views_and_early_stop():
+	basis = basis_gen(LATTICE_DIMENSION, ENTRY_BOUND, np.random.default_rng(8))
+	stream = iter_bkz(basis.copy(), BLOCK_SIZE, ENUM_VERSION, per="block")
+	snapshot = next(stream)
+	# Views of the working arrays, not copies
+	assert snapshot.gs_squared_norms.base is not None
+	with pytest.raises(ValueError):
+		snapshot.gs_squared_norms[0] = 1.0
+	assert not np.shares_memory(snapshot.copy().gs_squared_norms, snapshot.gs_squared_norms)
+	assert snapshot.root_hermite_factor > 1.0
+	# Stopping early leaves a valid, unchanged lattice
+	snapshot = next(stream).copy()
+	stream.close()
+	assert abs(abs(np.linalg.det(snapshot.basis_matrix)) - abs(np.linalg.det(basis))) < 1e-6 * abs(np.linalg.det(basis))
+
+
+@pytest.mark.parametrize("bkz_version", sorted(BKZ_ALGORITHMS))
+def test_case_early_stop_ends_phases(bkz_version):
+	basis = basis_gen(LATTICE_DIMENSION, ENTRY_BOUND, np.random.default_rng(9))
+	recorder = TraceRecorder()
+	stats = StatsObserver()
+	with observe(CompositeObserver(recorder, stats)):
+		stream = iter_bkz(basis.copy(), BLOCK_SIZE, ENUM_VERSION, bkz_version, per="block")
+		next(stream)
+		next(stream)
+		stream.close()
+
+	for phase in ("bkz", "tour"):
+		begins = [event for event in recorder.events if event["name"] == phase and event["ph"] == "B"]
+		ends = [event for event in recorder.events if event["name"] == phase and event["ph"] == "E"]
+		assert len(begins) == len(ends) == 1, f"The {phase} phase should be ended when the stream is closed."
+	assert not any(stats.starts.values()), "No phase should be left open."
@@ -0,0 +1,112 @@
+import sys
+import os
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bkz.basis_generator import basis_gen
+from bkz.lattice_families import lattice_stream
+from bkz import BKZ_ALGORITHMS
+from bkz.checkpoint import BKZCheckpoint, load_checkpoint, resume_bkz
+from bkz.L3FP import L3fp_params
+
+LATTICE_DIMENSION = 16
+ENTRY_BOUND = 173
+BLOCK_SIZE = 6
+ENUM_VERSION = "2"
+EVERY_BLOCKS = 7
+# A basis that takes the progress check driver three tours; interrupted in its second tour
+TOURS_FAMILY = "1"
+TOURS_SEED = 2
+TOURS_VERSION = "2"
+LATE_EVERY_BLOCKS = 10
+RUN_TAU = 12
+
+#RUN root: pytest tests/test_checkpoint.py
+# Allow prints: pytest -s tests/test_checkpoint.py
+
+
+class Preempted(Exception):
+	pass
+
+
+class PreemptedCheckpoint(BKZCheckpoint):
+	"""Checkpoint that interrupts the reduction right after its second snapshot."""
+
+	def save(self, state):
+		super().save(state)
+		if self.blocks >= 2 * self.every_blocks:
+			raise Preempted
+
+
+class RecordingCheckpoint(BKZCheckpoint):
+	"""Checkpoint that never saves and records the block and tour counts and the TAU of every loop state."""
+
+	def __init__(self, path):
+		super().__init__(path, every_blocks=1)
+		self.counts = []
+		self.taus = []
+
+	def update(self, state):
+		super().update(state)
+		self.counts.append((state["blocks"], state["tours"]))
+		self.taus.append(L3fp_params.TAU)
+
+	def save(self, state):
+		pass
+
+
+@pytest.mark.parametrize("bkz_version", sorted(BKZ_ALGORITHMS))
+def test_case_resume_matches_uninterrupted(tmp_path, bkz_version):
+	bkz_reduce = BKZ_ALGORITHMS[bkz_version]
+	basis = basis_gen(LATTICE_DIMENSION, ENTRY_BOUND, np.random.default_rng(5))
+	expected = bkz_reduce(basis.copy(), BLOCK_SIZE, ENUM_VERSION)
+
+	path = str(tmp_path / "bkz.npz")
+	with pytest.raises(Preempted):
+		bkz_reduce(basis.copy(), BLOCK_SIZE, ENUM_VERSION, checkpoint=PreemptedCheckpoint(path, every_blocks=EVERY_BLOCKS))
+	snapshot = load_checkpoint(path)
+	assert snapshot["position"]["blocks"] == 2 * EVERY_BLOCKS
+	assert snapshot["parameters"]["algorithm"] == bkz_reduce.__name__
+
+	resumed = resume_bkz(path, checkpoint=BKZCheckpoint(path, every_blocks=EVERY_BLOCKS))
+	for resumed_data, expected_data in zip(resumed, expected):
+		assert np.array_equal(resumed_data, expected_data), "The resumed run differs from the uninterrupted run."
+
+
+def test_case_resume_restores_counters(tmp_path):
+	bkz_reduce = BKZ_ALGORITHMS[TOURS_VERSION]
+	basis, = lattice_stream(TOURS_FAMILY, LATTICE_DIMENSION, ENTRY_BOUND, TOURS_SEED, 1)
+	uninterrupted = RecordingCheckpoint(str(tmp_path / "unused.npz"))
+	bkz_reduce(basis.copy(), BLOCK_SIZE, ENUM_VERSION, checkpoint=uninterrupted)
+
+	path = str(tmp_path / "bkz.npz")
+	with pytest.raises(Preempted):
+		bkz_reduce(basis.copy(), BLOCK_SIZE, ENUM_VERSION, checkpoint=PreemptedCheckpoint(path, every_blocks=LATE_EVERY_BLOCKS))
+	assert load_checkpoint(path)["position"]["tours"] > 0, "The snapshot should be taken after the first tour."
+
+	resumed = RecordingCheckpoint(path)
+	resume_bkz(path, checkpoint=resumed)
+	assert resumed.counts == uninterrupted.counts[2 * LATE_EVERY_BLOCKS :], "The resumed run should continue the block and tour counts."
+
+
+def test_case_resume_restores_tau(tmp_path):
+	bkz_reduce = BKZ_ALGORITHMS["1"]
+	basis = basis_gen(LATTICE_DIMENSION, ENTRY_BOUND, np.random.default_rng(5))
+	default_tau = L3fp_params.TAU
+	path = str(tmp_path / "bkz.npz")
+	L3fp_params.TAU = RUN_TAU
+	try:
+		expected = bkz_reduce(basis.copy(), BLOCK_SIZE, ENUM_VERSION)
+		with pytest.raises(Preempted):
+			bkz_reduce(basis.copy(), BLOCK_SIZE, ENUM_VERSION, checkpoint=PreemptedCheckpoint(path, every_blocks=EVERY_BLOCKS))
+	finally:
+		L3fp_params.TAU = default_tau
+	assert load_checkpoint(path)["tau"] == RUN_TAU
+
+	recording = RecordingCheckpoint(path)
+	resumed = resume_bkz(path, checkpoint=recording)
+	assert set(recording.taus) == {RUN_TAU}, "The resumed run should use the TAU of the interrupted run."
+	assert L3fp_params.TAU == default_tau, "resume_bkz should restore the TAU of the calling process."
+	for resumed_data, expected_data in zip(resumed, expected):
+		assert np.array_equal(resumed_data, expected_data), "The resumed run differs from the uninterrupted run."
@@ -0,0 +1,45 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bkz.basis_generator import basis_gen
+from bkz.L3FP import LLL_ALGORITHMS
+from bkz.L3FP.delta_schedule import lovasz_satisfied_fraction, run_delta_schedule
+from bkz.L3FP.L3fp import l3fp
+from tests.test_utils import *
+
+LATTICE_DIMENSION = 10
+ENTRY_BOUND = 173
+TEST_CASES = 10
+DELTA_SCHEDULE = (0.5, 0.75, 0.99)
+
+#RUN root: pytest tests/test_delta_schedule.py
+# Allow prints: pytest -s tests/test_delta_schedule.py
+
+def test_case_l3fp_schedule(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND, test_cases=TEST_CASES):
+    for _ in range(test_cases):
+        basis = basis_gen(dim, entry_bound)
+        lll_basis, gsc, gs_squared_norms = l3fp(basis.copy(), delta_schedule=DELTA_SCHEDULE)
+        assert verify_lattice_invariance(basis, lll_basis), "Determinant mismatch."
+        assert verify_gso_structure(lll_basis, gsc, gs_squared_norms), "GSO structure is malformed."
+        assert is_size_reduced(gsc), "Condition mu is not satisfied."
+        assert verify_Lovasz_condition(gs_squared_norms, gsc, 0.99), "Condition delta is not satisfied."
+
+
+def test_case_schedule_all_variants(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND):
+    basis = basis_gen(dim, entry_bound)
+    for lll_reduce in LLL_ALGORITHMS.values():
+        lll_basis, gsc, gs_squared_norms = run_delta_schedule(lll_reduce, basis.copy(), DELTA_SCHEDULE)
+        assert verify_lattice_invariance(basis, lll_basis), "Determinant mismatch."
+        assert is_size_reduced(gsc), "Condition mu is not satisfied."
+        assert verify_Lovasz_condition(gs_squared_norms, gsc, 0.99), "Condition delta is not satisfied."
+
+
+def test_case_early_exit(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND, test_cases=TEST_CASES):
+    for _ in range(test_cases):
+        basis = basis_gen(dim, entry_bound)
+        lll_basis, gsc, gs_squared_norms = l3fp(basis.copy(), delta_schedule=DELTA_SCHEDULE, early_exit=0.5)
+        assert verify_lattice_invariance(basis, lll_basis), "Determinant mismatch."
+        assert is_size_reduced(gsc), "Condition mu is not satisfied."
+        assert verify_Lovasz_condition(gs_squared_norms, gsc, 0.5), "Condition delta is not satisfied."
+        assert lovasz_satisfied_fraction(gsc, gs_squared_norms, 0.99) >= 0.5
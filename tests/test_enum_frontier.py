@@ -0,0 +1,40 @@
+import sys
+import os
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bkz.basis_generator import basis_gen
+from bkz.L3FP.L3fp import l3fp
+from bkz.SVPsolvers import ENUM_ALGORITHMS
+from bkz.SVPsolvers.enum_frontier import enum_frontier_f32_solver, enum_frontier_solver
+
+ENTRY_BOUND = 1021
+DIMENSIONS = (5, 10, 16)
+MAX_FRONTIERS = (1, 16, 2**10)
+SEED = 5
+
+#RUN root: pytest tests/test_enum_frontier.py
+# Allow prints: pytest -s tests/test_enum_frontier.py
+
+def test_case_enum_frontier(entry_bound=ENTRY_BOUND, dimensions=DIMENSIONS, max_frontiers=MAX_FRONTIERS):
+    rng = np.random.default_rng(SEED)
+    reference_solver = ENUM_ALGORITHMS["1"]
+    for dim in dimensions:
+        basis, gsc, gs_squared_norms = l3fp(basis_gen(dim, entry_bound, rng))
+        expected_squared_norm, _ = reference_solver(basis, gs_squared_norms, gsc)
+        for max_frontier in max_frontiers:
+            squared_norm, u = enum_frontier_solver(basis, gs_squared_norms, gsc, max_frontier=max_frontier)
+            assert np.all(u == np.round(u)) and np.any(u), "Coefficient vector is not a nonzero integer vector."
+            assert np.isclose(np.sum((basis @ u) ** 2), squared_norm), "Squared norm mismatch."
+            assert np.isclose(squared_norm, expected_squared_norm), "Frontier solver did not find the shortest vector."
+
+
+def test_case_enum_frontier_f32(entry_bound=ENTRY_BOUND, dimensions=DIMENSIONS):
+    rng = np.random.default_rng(SEED)
+    for dim in dimensions:
+        basis, gsc, gs_squared_norms = l3fp(basis_gen(dim, entry_bound, rng))
+        expected_squared_norm, _ = enum_frontier_solver(basis, gs_squared_norms, gsc)
+        squared_norm, u = enum_frontier_f32_solver(basis, gs_squared_norms, gsc)
+        assert squared_norm.dtype == np.float64, "Candidates are not rescored in float64."
+        assert np.isclose(squared_norm, expected_squared_norm), "float32 tree walk changed the result."
+        assert np.isclose(np.sum((basis @ u) ** 2), squared_norm), "Squared norm mismatch."
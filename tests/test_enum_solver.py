@@ -0,0 +1,37 @@
+import sys
+import os
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bkz.basis_generator import basis_gen
+from bkz.L3FP.gsofp_se import gso_full
+from bkz.SVPsolvers import ENUM_ALGORITHMS, ENUM_SOLVERS
+from bkz.SVPsolvers.enum_solver import EnumSolver
+
+ENTRY_BOUND = 173
+BLOCK_SIZES = (5, 7, 5, 6)
+SEED = 11
+
+#RUN root: pytest tests/test_enum_solver.py
+# Allow prints: pytest -s tests/test_enum_solver.py
+
+def test_case_enum_solvers(entry_bound=ENTRY_BOUND, block_sizes=BLOCK_SIZES):
+    rng = np.random.default_rng(SEED)
+    blocks = []
+    for block_size in block_sizes:
+        basis = basis_gen(block_size, entry_bound, rng)
+        gs_squared_norms, gsc = gso_full(basis)
+        blocks.append((basis, gs_squared_norms, gsc))
+
+    for key, solver in ENUM_SOLVERS.items():
+        if not isinstance(solver, EnumSolver):
+            continue
+        results = solver.solve_many(blocks)
+        assert len(solver.workspaces) == len(set(block_sizes)), "Workspaces are not shared between equal block sizes."
+        for block, (squared_norm, u) in zip(blocks, results):
+            expected_squared_norm, expected_u = ENUM_ALGORITHMS[key](*block)
+            assert squared_norm == expected_squared_norm, "Squared norm differs from the function solver."
+            assert np.array_equal(u, expected_u), "Coefficient vector differs from the function solver."
+        # Results are copies and stay valid when the workspace is reused
+        assert results[0][1] is not results[2][1]
+        assert np.array_equal(results[0][1], solver(*blocks[0])[1])
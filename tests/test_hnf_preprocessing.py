@@ -0,0 +1,47 @@
+import sys
+import os
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bkz.basis_generator import basis_gen
+from bkz.hnf_preprocessing import bareiss_determinant, hnf_mod_determinant, hnf_preprocess
+from bkz.L3FP.L3fp import l3fp
+from bkz.lattice_families import lattice_stream
+from tests.test_utils import *
+
+LATTICE_DIMENSION = 10
+ENTRY_BOUND = 173
+MODULUS = 3329
+TEST_CASES = 5
+SEED = 11
+
+#RUN root: pytest tests/test_hnf_preprocessing.py
+# Allow prints: pytest -s tests/test_hnf_preprocessing.py
+
+def test_case_hnf(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND, test_cases=TEST_CASES):
+    rng = np.random.default_rng(SEED)
+    for _ in range(test_cases):
+        basis = basis_gen(dim, entry_bound, rng)
+        determinant = bareiss_determinant(basis)
+        assert np.isclose(determinant, np.linalg.det(basis), rtol=1e-6), "Determinant mismatch."
+        hnf = hnf_mod_determinant(basis, determinant)
+        for i in range(dim):
+            assert all(hnf[i, j] == 0 for j in range(i)), "HNF is not upper triangular."
+            assert all(0 <= hnf[i, j] < hnf[i, i] for j in range(i + 1, dim)), "HNF is not reduced."
+        assert np.prod(np.diag(hnf)) == abs(determinant), "HNF determinant mismatch."
+
+
+def test_case_hnf_preprocess(dim=LATTICE_DIMENSION, test_cases=TEST_CASES):
+    rng = np.random.default_rng(SEED)
+    for qary in lattice_stream("2", dim, MODULUS, rng, test_cases):
+        # Hide the small determinant behind a random unimodular transform with large entries
+        lower = np.tril(rng.integers(-20, 21, size=(dim, dim)), -1) + np.eye(dim, dtype=np.int64)
+        upper = np.triu(rng.integers(-20, 21, size=(dim, dim)), 1) + np.eye(dim, dtype=np.int64)
+        basis = qary @ lower @ upper
+        preprocessed, transform = hnf_preprocess(basis)
+        assert np.max(np.abs(preprocessed)) < np.max(np.abs(basis)), "HNF was not adopted."
+        assert np.array_equal(basis.astype(object) @ transform, preprocessed.astype(object)), "Transform mismatch."
+        assert abs(bareiss_determinant(transform)) == 1, "Transform is not unimodular."
+        lll_basis, gsc, gs_squared_norms = l3fp(preprocessed.copy())
+        assert verify_lattice_invariance(qary, lll_basis), "Determinant mismatch."
+        assert verify_Lovasz_condition(gs_squared_norms, gsc), "Condition delta is not satisfied."
@@ -0,0 +1,41 @@
+import sys
+import os
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bkz.L3FP.L3fp import l3fp
+from bkz.lattice_families import LATTICE_FAMILIES, is_prime, lattice_stream
+from tests.test_utils import *
+
+LATTICE_DIMENSION = 10
+ENTRY_BOUND = 173
+TEST_CASES = 5
+SEED = 2024
+
+#RUN root: pytest tests/test_lattice_families.py
+# Allow prints: pytest -s tests/test_lattice_families.py
+
+def test_case_families(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND, test_cases=TEST_CASES):
+    for family in LATTICE_FAMILIES:
+        for basis in lattice_stream(family, dim, entry_bound, SEED, test_cases):
+            assert basis.shape == (dim, dim), "Generated basis has malformed shape."
+            assert np.linalg.matrix_rank(basis) == dim, "Generated basis is not full-rank."
+            lll_basis, gsc, gs_squared_norms = l3fp(basis.copy())
+            assert verify_lattice_invariance(basis, lll_basis), "Determinant mismatch."
+            assert verify_Lovasz_condition(gs_squared_norms, gsc), "Condition delta is not satisfied."
+
+
+def test_case_family_determinants(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND):
+    qary, = lattice_stream("2", dim, entry_bound, SEED, 1)
+    ntru, = lattice_stream("4", dim, entry_bound, SEED, 1)
+    goldstein_mayer, = lattice_stream("5", dim, entry_bound, SEED, 1)
+    assert np.isclose(abs(np.linalg.det(qary)), float(entry_bound) ** (dim // 2)), "q-ary determinant mismatch."
+    assert np.isclose(abs(np.linalg.det(ntru)), float(entry_bound) ** (dim // 2)), "NTRU determinant mismatch."
+    assert is_prime(round(abs(np.linalg.det(goldstein_mayer)))), "Goldstein-Mayer determinant is not prime."
+
+
+def test_case_seeded_stream(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND, test_cases=TEST_CASES):
+    for family in LATTICE_FAMILIES:
+        first = list(lattice_stream(family, dim, entry_bound, SEED, test_cases))
+        second = list(lattice_stream(family, dim, entry_bound, SEED, test_cases))
+        assert all(np.array_equal(a, b) for a, b in zip(first, second)), "Seeded streams differ."
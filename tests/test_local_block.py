@@ -0,0 +1,92 @@
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bkz.basis_generator import basis_gen
+from bkz.L3FP import L3fp_params
+from bkz.L3FP.gsofp_se import gso_full
+from bkz.L3FP.L3fp import l3fp
+from bkz.local_block import insert_in_block, local_l3fp, unimodular_completion
+from bkz import BKZ_ALGORITHMS
+from tests.test_utils import *
+
+LATTICE_DIMENSION = 10
+ENTRY_BOUND = 173
+BLOCK_SIZE = LATTICE_DIMENSION // 2
+ENUM_VERSION = "1"
+TEST_CASES = 10
+# A TAU for which the local coefficients of LARGE_COEFF_VEC trip the precision guard
+LOW_TAU = 4
+LARGE_COEFF_VEC = np.array([1, 40, -37, 25, 11])
+
+#RUN root: pytest tests/test_local_block.py
+# Allow prints: pytest -s tests/test_local_block.py
+
+def test_case_unimodular_completion(test_cases=TEST_CASES):
+    rng = np.random.default_rng()
+    for _ in range(test_cases):
+        coeff_vec = rng.integers(-5, 6, size=BLOCK_SIZE)
+        if not np.any(coeff_vec):
+            continue
+        transform = unimodular_completion(coeff_vec)
+        assert np.isclose(abs(np.linalg.det(transform)), 1.0), "Transform is not unimodular."
+        assert np.array_equal(transform[:, 0] * np.gcd.reduce(coeff_vec), coeff_vec), "First column mismatch."
+
+
+def test_case_insert_in_block(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND, test_cases=TEST_CASES):
+    rng = np.random.default_rng()
+    for _ in range(test_cases):
+        basis = basis_gen(dim, entry_bound)
+        lll_basis, gsc, gs_squared_norms = l3fp(basis.copy())
+        j = int(rng.integers(0, dim - BLOCK_SIZE + 1))
+        coeff_vec = rng.integers(-2, 3, size=BLOCK_SIZE)
+        coeff_vec[0] = 1
+        lll_basis, gsc, gs_squared_norms, restart_stage = insert_in_block(
+            lll_basis, gsc, gs_squared_norms, j, j + BLOCK_SIZE, coeff_vec, 0.99
+        )
+        lll_basis, gsc, gs_squared_norms = l3fp(
+            lll_basis, gsc[:restart_stage, :restart_stage], gs_squared_norms[:restart_stage], restart_stage
+        )
+        assert verify_lattice_invariance(basis, lll_basis), "Determinant mismatch."
+        assert verify_gso_structure(lll_basis, gsc, gs_squared_norms), "GSO structure is malformed."
+        assert is_size_reduced(gsc), "Condition mu is not satisfied."
+        assert verify_Lovasz_condition(gs_squared_norms, gsc), "Condition delta is not satisfied."
+
+
+def test_case_bkz_ambient_blocks(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND, test_cases=TEST_CASES):
+    for bkz_reduce in BKZ_ALGORITHMS.values():
+        for _ in range(test_cases):
+            basis = basis_gen(dim, entry_bound)
+            bkz_basis, gsc, gs_squared_norms = bkz_reduce(basis.copy(), BLOCK_SIZE, ENUM_VERSION, local_blocks=False)
+            assert verify_lattice_invariance(basis, bkz_basis), "Determinant mismatch."
+            assert is_size_reduced(gsc), "Condition mu is not satisfied."
+            assert verify_Lovasz_condition(gs_squared_norms, gsc), "Condition delta is not satisfied."
+
+
+def test_case_local_precision_guard(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND):
+    basis = basis_gen(dim, entry_bound, np.random.default_rng(7))
+    default_tau = L3fp_params.TAU
+    L3fp_params.TAU = LOW_TAU
+    try:
+        for j in (0, dim - BLOCK_SIZE):
+            lll_basis, gsc, gs_squared_norms = l3fp(basis.copy())
+            transform = unimodular_completion(LARGE_COEFF_VEC)
+            local_norms, local_coeffs = gso_full(lll_basis[:, j : j + BLOCK_SIZE] @ transform)
+            *_, f_c = local_l3fp(local_coeffs, local_norms, transform, 0.99)
+            assert f_c, "Large local coefficients should be flagged as a precision issue."
+
+            # The global l3fp takes over from the start of the block
+            lll_basis, gsc, gs_squared_norms, restart_stage = insert_in_block(
+                lll_basis, gsc, gs_squared_norms, j, j + BLOCK_SIZE, LARGE_COEFF_VEC, 0.99
+            )
+            assert restart_stage == max(j, 1)
+            lll_basis, gsc, gs_squared_norms = l3fp(
+                lll_basis, gsc[:restart_stage, :restart_stage], gs_squared_norms[:restart_stage], restart_stage
+            )
+            assert verify_lattice_invariance(basis, lll_basis), "Determinant mismatch."
+            assert is_size_reduced(gsc), "Condition mu is not satisfied."
+            assert verify_Lovasz_condition(gs_squared_norms, gsc), "Condition delta is not satisfied."
+    finally:
+        L3fp_params.TAU = default_tau
@@ -0,0 +1,51 @@
+import sys
+import os
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bkz.basis_generator import basis_gen
+from bkz.L3FP.mlll import mlll
+from tests.test_utils import *
+
+LATTICE_DIMENSION = 10
+ENTRY_BOUND = 173
+EXTRA_VECTORS = 6
+CHUNK_SIZES = [None, 1, 4]
+TEST_CASES = 5
+SEED = 5
+
+#RUN root: pytest tests/test_mlll.py
+# Allow prints: pytest -s tests/test_mlll.py
+
+def test_case_generating_set(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND, test_cases=TEST_CASES):
+    rng = np.random.default_rng(SEED)
+    for _ in range(test_cases):
+        basis = basis_gen(dim, entry_bound, rng)
+        # Append integer combinations of the basis vectors and a zero column
+        combinations = basis @ rng.integers(-3, 4, size=(dim, EXTRA_VECTORS))
+        generating_set = np.hstack((combinations[:, :2], basis, np.zeros((dim, 1), dtype=np.int64), combinations[:, 2:]))
+        for chunk_size in CHUNK_SIZES:
+            reduced_basis, gsc, gs_squared_norms, rank = mlll(generating_set, chunk_size=chunk_size)
+            assert rank == dim, "Rank mismatch."
+            assert verify_lattice_invariance(basis, reduced_basis), "Determinant mismatch."
+            assert verify_gso_structure(reduced_basis, gsc, gs_squared_norms), "GSO structure is malformed."
+            assert is_size_reduced(gsc), "Condition mu is not satisfied."
+            assert verify_Lovasz_condition(gs_squared_norms, gsc), "Condition delta is not satisfied."
+
+
+def test_case_rank_deficient(dim=LATTICE_DIMENSION, entry_bound=ENTRY_BOUND, test_cases=TEST_CASES):
+    rng = np.random.default_rng(SEED)
+    rank = dim // 2
+    for _ in range(test_cases):
+        sublattice_basis = basis_gen(dim, entry_bound, rng)[:, :rank]
+        generating_set = sublattice_basis @ np.hstack(
+            (np.eye(rank, dtype=np.int64), rng.integers(-3, 4, size=(rank, EXTRA_VECTORS)))
+        )
+        chunks = (generating_set[:, i : i + 3] for i in range(0, generating_set.shape[1], 3))
+        reduced_basis, gsc, gs_squared_norms, reduced_rank = mlll(chunks)
+        assert reduced_rank == rank, "Rank mismatch."
+        assert np.isclose(
+            np.linalg.slogdet(reduced_basis.T @ reduced_basis)[1],
+            np.linalg.slogdet((sublattice_basis.T @ sublattice_basis).astype(np.float64))[1],
+        ), "Volume mismatch."
+        assert verify_Lovasz_condition(gs_squared_norms, gsc), "Condition delta is not satisfied."
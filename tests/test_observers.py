@@ -0,0 +1,109 @@
+import sys
+import os
+import io
+import json
+from itertools import pairwise
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bkz.basis_generator import basis_gen
+from bkz import BKZ_ALGORITHMS
+from bkz.L3FP import LLL_ALGORITHMS
+from bkz.observers import CompositeObserver, Observer, TqdmObserver, TraceRecorder, observe, with_stats
+
+LATTICE_DIMENSION = 12
+ENTRY_BOUND = 173
+BLOCK_SIZE = 4
+ENUM_VERSION = "2"
+
+#RUN root: pytest tests/test_observers.py
+# Allow prints: pytest -s tests/test_observers.py
+
+
+class RecordingObserver(Observer):
+	def __init__(self):
+		self.events = []
+
+	def begin(self, phase, total=None, **details):
+		self.events.append(("begin", phase))
+
+	def update(self, phase, amount=1):
+		self.events.append(("update", phase))
+
+	def end(self, phase):
+		self.events.append(("end", phase))
+
+
+def test_case_events(capsys):
+	basis = basis_gen(LATTICE_DIMENSION, ENTRY_BOUND, np.random.default_rng(2))
+	BKZ_ALGORITHMS["1"](basis.copy(), BLOCK_SIZE, ENUM_VERSION)
+	assert capsys.readouterr().err == "", "Without an observer the reduction loops should not write anything."
+
+	recorder = RecordingObserver()
+	stream = io.StringIO()
+	progress = TqdmObserver({phase: {"desc": phase, "file": stream} for phase in ("lll", "bkz")})
+	with observe(CompositeObserver(recorder, progress)):
+		BKZ_ALGORITHMS["1"](basis.copy(), BLOCK_SIZE, ENUM_VERSION)
+		# One reused bar per phase, however many times l3fp runs
+		assert sorted(progress.bars) == ["bkz", "lll"]
+	assert progress.bars == {}, "Leaving observe should close the bars."
+
+	events = recorder.events
+	assert events[0] == ("begin", "lll"), "The LLL preprocessing should be reported first."
+	for phase in ("lll", "bkz"):
+		assert events.count(("begin", phase)) == events.count(("end", phase)) > 0
+	assert ("update", "bkz") in events and "bkz" in stream.getvalue()
+
+
+def test_case_stats(block_size=2 * BLOCK_SIZE):
+	basis = basis_gen(LATTICE_DIMENSION, ENTRY_BOUND, np.random.default_rng(3))
+	expected = BKZ_ALGORITHMS["2"](basis.copy(), block_size, ENUM_VERSION)
+	result, stats = with_stats(BKZ_ALGORITHMS["2"], basis.copy(), block_size, ENUM_VERSION)
+	assert all(np.array_equal(a, b) for a, b in zip(result, expected)), "Statistics changed the result."
+
+	assert {"lll", "bkz", "gso", "size_reduction", "svp"} <= set(stats["times"])
+	assert stats["calls"]["bkz"] == 1 and stats["calls"]["gso"] == stats["calls"]["size_reduction"]
+	assert stats["counters"].get("swaps", 0) == stats["calls"].get("swap", 0)
+	assert stats["counters"].get("insertions", 0) == stats["calls"].get("insertion", 0)
+	# Blocks larger than the tiny-block kernels go to the enumeration solver, every call visits at least the root level
+	assert len(stats["levels"]["enum_nodes"]) >= block_size and min(stats["levels"]["enum_nodes"][:block_size]) > 0
+
+
+def test_case_lll_stats():
+	basis = basis_gen(LATTICE_DIMENSION, ENTRY_BOUND, np.random.default_rng(5))
+	for key, lll_reduce in LLL_ALGORITHMS.items():
+		expected = lll_reduce(basis.copy())
+		result, stats = with_stats(lll_reduce, basis.copy())
+		assert all(np.array_equal(a, b) for a, b in zip(result, expected)), f"Statistics changed the result of LLL {key}."
+		assert stats["calls"]["lll"] == 1, f"LLL {key} should report one lll phase."
+		assert {"gso", "size_reduction", "swap"} <= set(stats["calls"]), f"LLL {key} should report its steps."
+		assert stats["counters"]["swaps"] > 0, f"LLL {key} should count its swaps."
+		if key in ("3", "4"):
+			assert stats["calls"]["deep_insertion"] > 0, f"LLL {key} should report its insertion searches."
+
+
+def test_case_trace(tmp_path, block_size=2 * BLOCK_SIZE):
+	basis = basis_gen(LATTICE_DIMENSION, ENTRY_BOUND, np.random.default_rng(4))
+	recorder = TraceRecorder()
+	with observe(recorder):
+		BKZ_ALGORITHMS["1"](basis.copy(), block_size, ENUM_VERSION)
+	path = str(tmp_path / "trace.json")
+	recorder.write(path)
+	with open(path) as trace_file:
+		events = json.load(trace_file)["traceEvents"]
+
+	for phase in ("bkz", "tour", "svp", "lll"):
+		begins = [event for event in events if event["name"] == phase and event["ph"] == "B"]
+		assert len(begins) == len([event for event in events if event["name"] == phase and event["ph"] == "E"]) > 0
+	assert all(event["ts"] <= later["ts"] for event, later in pairwise(events)), "Events should be in time order."
+	svp_events = [event for event in events if event["name"] == "svp"]
+	assert {"start", "end"} <= set(svp_events[0]["args"])
+	assert any("enum_nodes" in event["args"] for event in svp_events if event["ph"] == "E")
+
+	# The ring buffer keeps only the most recent events
+	bounded = TraceRecorder(max_events=10)
+	with observe(bounded):
+		BKZ_ALGORITHMS["1"](basis.copy(), block_size, ENUM_VERSION)
+	assert len(bounded.events) == 10 and bounded.dropped == len(events) - 10
+	# The final Gram-Schmidt refresh (an LLL pass) runs inside the BKZ phase
+	assert list(bounded.events)[-1]["name"] == "bkz", "The last event should be the end of the BKZ phase."
@@ -0,0 +1,115 @@
+import sys
+import os
+import argparse
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bkz.basis_generator import basis_gen
+from bkz.bkz_schnorr_euchner import bkz_se
+from bkz.L3FP.L3fp import l3fp
+from bkz.result_cache import STALE_TEMPORARY_SECONDS, ReductionCache
+from main import run_bkz_stage, run_lll_stage
+
+LATTICE_DIMENSION = 8
+ENTRY_BOUND = 173
+ARGS = {
+    "lattice_dimension": LATTICE_DIMENSION,
+    "block_size": 4,
+    "bkz_version": "1",
+    "svp_solver": "1",
+    "lll_version": "1",
+    "backend": "1",
+    "svp_backend": "1",
+    "structure": False,
+    "hnf": False,
+    "precision": "default",
+    "cache_size_mb": 1,
+}
+
+#RUN root: pytest tests/test_result_cache.py
+# Allow prints: pytest -s tests/test_result_cache.py
+
+def test_case_hit_skips_reduction(tmp_path):
+    basis = basis_gen(LATTICE_DIMENSION, ENTRY_BOUND, np.random.default_rng(3))
+    args = argparse.Namespace(**ARGS, cache_dir=str(tmp_path))
+    _, characteristics_lll, lll_result = run_lll_stage(basis, args)
+    characteristics_bkz = run_bkz_stage(lll_result, args)
+    assert len(os.listdir(tmp_path)) == 2, "The LLL and the BKZ result should be cached."
+
+    calls = []
+    cache = ReductionCache(str(tmp_path))
+    key = cache.key(basis, {"stage": "test"})
+    reduce = lambda basis_matrix: calls.append(1) or lll_result
+    first, _ = cache.run(reduce, basis, {"stage": "test"})
+    second, _ = cache.run(reduce, basis, {"stage": "test"})
+    assert len(calls) == 1, "A cache hit must not run the reduction."
+    assert all(np.array_equal(a, b) for a, b in zip(first, second))
+    assert cache.key(basis, {"stage": "other"}) != key, "The parameters must be part of the key."
+
+    # Rerunning the pipeline returns the cached results with a run time of 0.0
+    assert run_lll_stage(basis, args)[1] == characteristics_lll[:-1] + [0.0]
+    assert run_bkz_stage(lll_result, args) == characteristics_bkz[:-1] + [0.0]
+
+
+def test_case_lru_eviction(tmp_path):
+    cache = ReductionCache(str(tmp_path))
+    result = (np.eye(LATTICE_DIMENSION), np.eye(LATTICE_DIMENSION), np.ones(LATTICE_DIMENSION))
+    keys = [cache.key(np.eye(LATTICE_DIMENSION) * (i + 1), {}) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.store(key, result, {"run_time": 0.0})
+        os.utime(cache.path(key), (i, i))
+    file_size = os.path.getsize(cache.path(keys[0]))
+
+    # A hit marks the oldest entry as recently used, so the second one is evicted
+    assert cache.load(keys[0]) is not None
+    cache.max_bytes = 2 * file_size
+    cache.evict()
+    assert cache.load(keys[1]) is None, "The least recently used entry should be evicted."
+    assert cache.load(keys[0]) is not None and cache.load(keys[2]) is not None
+
+
+def test_case_stale_temporary_files(tmp_path):
+    cache = ReductionCache(str(tmp_path))
+    stale_path = tmp_path / "crashed.tmp"
+    fresh_path = tmp_path / "writing.tmp"
+    stale_path.write_bytes(b"0" * 100)
+    fresh_path.write_bytes(b"0" * 100)
+    stale_time = time.time() - 2 * STALE_TEMPORARY_SECONDS
+    os.utime(stale_path, (stale_time, stale_time))
+    cache.evict()
+    assert not stale_path.exists(), "A temporary file left behind by a crash should be removed."
+    assert fresh_path.exists(), "A temporary file that may still be written should be kept."
+
+    # Temporary files count towards the size cap
+    result = (np.eye(LATTICE_DIMENSION), np.eye(LATTICE_DIMENSION), np.ones(LATTICE_DIMENSION))
+    key = cache.key(np.eye(LATTICE_DIMENSION), {})
+    cache.store(key, result, {"run_time": 0.0})
+    cache.max_bytes = os.path.getsize(cache.path(key))
+    cache.evict()
+    assert cache.load(key) is None, "The cached result and the temporary file exceed the cap together."
+
+
+def test_case_cached_function(tmp_path):
+    basis = basis_gen(LATTICE_DIMENSION, ENTRY_BOUND, np.random.default_rng(3))
+    cache = ReductionCache(str(tmp_path))
+    calls = []
+
+    def counted_l3fp(basis_matrix, **kwargs):
+        calls.append(1)
+        return l3fp(basis_matrix, **kwargs)
+
+    cached_l3fp = cache.cached(counted_l3fp)
+    lll_result = cached_l3fp(basis.copy(), Lovasz_cond_param=0.99)
+    assert all(np.array_equal(a, b) for a, b in zip(cached_l3fp(basis.copy(), Lovasz_cond_param=0.99), lll_result))
+    assert len(calls) == 1, "A cache hit must not run the reduction."
+    cached_l3fp(basis.copy(), Lovasz_cond_param=0.75)
+    assert len(calls) == 2, "The arguments must be part of the key."
+
+    # Warm-start arrays are keyed by their content
+    cached_bkz = cache.cached(bkz_se)
+    expected = bkz_se(lll_result[0].copy(), 4, "1", gs_coeff_matrix=lll_result[1], gs_squared_norms=lll_result[2])
+    for _ in range(2):
+        result = cached_bkz(lll_result[0].copy(), 4, "1", gs_coeff_matrix=lll_result[1], gs_squared_norms=lll_result[2])
+        assert all(np.array_equal(a, b) for a, b in zip(result, expected))
+    assert len(os.listdir(tmp_path)) == 3, "Two LLL results and one BKZ result should be cached."
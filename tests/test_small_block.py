@@ -0,0 +1,49 @@
+import sys
+import os
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bkz import BKZ_ALGORITHMS
+from bkz.basis_generator import basis_gen
+from bkz.L3FP.gsofp_se import gso_full
+from bkz.SVPsolvers import ENUM_ALGORITHMS, ENUM_SOLVERS, SMALL_BLOCK_SOLVERS
+
+ENTRY_BOUND = 173
+TEST_CASES = 20
+SEED = 3
+LATTICE_DIMENSION = 12
+BLOCK_SIZE = 5
+
+#RUN root: pytest tests/test_small_block.py
+# Allow prints: pytest -s tests/test_small_block.py
+
+def test_case_small_blocks(entry_bound=ENTRY_BOUND, test_cases=TEST_CASES):
+    rng = np.random.default_rng(SEED)
+    reference_solver = ENUM_ALGORITHMS["1"]
+    for block_size, solver in SMALL_BLOCK_SOLVERS.items():
+        for _ in range(test_cases):
+            basis = basis_gen(block_size, entry_bound, rng)
+            gs_squared_norms, gsc = gso_full(basis)
+            squared_norm, u = solver(basis, gs_squared_norms, gsc)
+            expected_squared_norm, _ = reference_solver(basis, gs_squared_norms, gsc)
+            assert np.all(u == np.round(u)) and np.any(u), "Coefficient vector is not a nonzero integer vector."
+            assert np.isclose(np.sum((basis @ u) ** 2), squared_norm), "Squared norm mismatch."
+            assert np.isclose(squared_norm, expected_squared_norm), "Solver did not find the shortest vector."
+
+
+@pytest.mark.parametrize("bkz_version", sorted(BKZ_ALGORITHMS))
+def test_case_explicit_solver(bkz_version, entry_bound=ENTRY_BOUND):
+    bkz_reduce = BKZ_ALGORITHMS[bkz_version]
+    basis = basis_gen(LATTICE_DIMENSION, entry_bound, np.random.default_rng(SEED))
+    block_dimensions = []
+
+    def solver(basis_matrix, gs_squared_norms, gs_coeff_matrix):
+        block_dimensions.append(basis_matrix.shape[1])
+        return ENUM_SOLVERS["1"](basis_matrix, gs_squared_norms, gs_coeff_matrix)
+
+    result = bkz_reduce(basis.copy(), BLOCK_SIZE, solver)
+    expected = bkz_reduce(basis.copy(), BLOCK_SIZE, "1")
+    assert set(block_dimensions) >= set(SMALL_BLOCK_SOLVERS), "The tiny blocks should go to the given solver."
+    for result_data, expected_data in zip(result, expected):
+        assert np.allclose(result_data, expected_data), "The given solver should find the same blocks as the built-in one."
@@ -0,0 +1,89 @@
+import sys
+import os
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bkz.L3FP.gsofp_se import gso_full, gso_step_banded
+from bkz.L3FP.L3fp import l3fp
+from bkz.L3FP.structure import detect_supports
+from bkz.lattice_families import lattice_stream
+from bkz.local_block import refresh_gso
+from bkz import BKZ_ALGORITHMS
+from tests.test_utils import *
+
+LATTICE_DIMENSION = 20
+MODULUS = 3329
+BLOCK_SIZE = 5
+ENUM_VERSION = "1"
+TEST_CASES = 5
+SEED = 7
+# Knapsack bases whose final refresh_gso size reduction changes the column supports
+GSO_CHECK_FAMILY = "3"
+GSO_CHECK_DIMENSION = 30
+GSO_CHECK_BOUND = 257
+GSO_CHECK_BLOCK_SIZE = 8
+GSO_CHECK_SEED = 14
+
+#RUN root: pytest tests/test_structure.py
+# Allow prints: pytest -s tests/test_structure.py
+
+def test_case_detect_supports():
+    basis, = lattice_stream("2", LATTICE_DIMENSION, MODULUS, SEED, 1)
+    supports = detect_supports(basis)
+    k = LATTICE_DIMENSION // 2
+    assert np.array_equal(supports[:, :k], np.vstack((np.arange(k), np.arange(1, k + 1)))), "q-vector supports mismatch."
+    assert np.all(supports[1, k:] == np.arange(k + 1, LATTICE_DIMENSION + 1)), "Identity block supports mismatch."
+
+
+def test_case_gso_step_banded():
+    basis, = lattice_stream("2", LATTICE_DIMENSION, MODULUS, SEED, 1)
+    basis = basis.astype(np.float64)
+    supports = detect_supports(basis)
+    gsc = np.eye(LATTICE_DIMENSION)
+    norms = np.zeros(LATTICE_DIMENSION)
+    for stage in range(1, LATTICE_DIMENSION):
+        norms[: stage + 1], gsc[:, : stage + 1] = gso_step_banded(
+            basis[:, : stage + 1], gsc[:, : stage + 1], norms[: stage + 1], stage, supports[:, : stage + 1]
+        )
+    expected_norms, expected_gsc = gso_full(basis)
+    assert np.allclose(norms, expected_norms), "Banded Gram-Schmidt norms mismatch."
+    assert np.allclose(np.triu(gsc), expected_gsc), "Banded Gram-Schmidt coefficients mismatch."
+
+
+def test_case_structured_l3fp(test_cases=TEST_CASES):
+    for basis in lattice_stream("2", LATTICE_DIMENSION, MODULUS, SEED, test_cases):
+        dense_basis, _, _ = l3fp(basis.copy())
+        lll_basis, gsc, gs_squared_norms = l3fp(basis.copy(), supports="detect")
+        assert np.allclose(dense_basis, lll_basis), "Structure-aware reduction differs from dense reduction."
+        assert verify_gso_structure(lll_basis, gsc, gs_squared_norms), "GSO structure is malformed."
+        assert verify_Lovasz_condition(gs_squared_norms, gsc), "Condition delta is not satisfied."
+
+
+def test_case_structured_bkz(test_cases=TEST_CASES):
+    for bkz_reduce in BKZ_ALGORITHMS.values():
+        for basis in lattice_stream("2", LATTICE_DIMENSION, MODULUS, SEED, test_cases):
+            bkz_basis, gsc, gs_squared_norms = bkz_reduce(basis.copy(), BLOCK_SIZE, ENUM_VERSION, supports="detect")
+            assert verify_lattice_invariance(basis, bkz_basis), "Determinant mismatch."
+            assert verify_gso_structure(bkz_basis, gsc, gs_squared_norms), "GSO structure is malformed."
+            assert is_size_reduced(gsc), "Condition mu is not satisfied."
+            assert verify_Lovasz_condition(gs_squared_norms, gsc), "Condition delta is not satisfied."
+
+
+def test_case_refresh_gso_supports(test_cases=TEST_CASES):
+    rng = np.random.default_rng(SEED)
+    for basis in lattice_stream("2", LATTICE_DIMENSION, MODULUS, SEED, test_cases):
+        basis = basis[:, rng.permutation(LATTICE_DIMENSION)].astype(np.float64)
+        supports = detect_supports(basis)
+        basis, gsc, gs_squared_norms = refresh_gso(basis, 0.99, supports)
+        expected_norms, expected_gsc = gso_full(basis)
+        assert np.allclose(gs_squared_norms, expected_norms), "Gram-Schmidt norms mismatch."
+        assert np.allclose(np.triu(gsc), expected_gsc), "Gram-Schmidt coefficients mismatch."
+
+
+def test_case_structured_bkz_gso():
+    basis, = lattice_stream(GSO_CHECK_FAMILY, GSO_CHECK_DIMENSION, GSO_CHECK_BOUND, GSO_CHECK_SEED, 1)
+    for bkz_reduce in BKZ_ALGORITHMS.values():
+        bkz_basis, gsc, gs_squared_norms = bkz_reduce(basis.copy(), GSO_CHECK_BLOCK_SIZE, "2", supports="detect")
+        expected_norms, expected_gsc = gso_full(bkz_basis)
+        assert np.allclose(gs_squared_norms, expected_norms), "Gram-Schmidt norms do not match the returned basis."
+        assert np.allclose(np.triu(gsc), expected_gsc), "Gram-Schmidt coefficients do not match the returned basis."
@@ -0,0 +1,81 @@
+import sys
+import os
+import json
+import argparse
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bkz.BasisQualityEvaluation.basis_quality_evaluation import compute_basis_quality_characteristics
+from bkz.bkz_params import ENTRY_BOUND
+from bkz.lattice_families import LATTICE_FAMILIES
+from main import run_pipeline
+from sweep import expand_manifest, group_jobs, run_job_group, run_sweep
+
+MANIFEST = {
+    "grids": [
+        {"lattice_dimension": [6, 8], "block_size": 3, "svp_solver": [1, 2]},
+        {"lattice_dimension": 6, "block_size": [3]},
+    ],
+    "repetitions": 2,
+    "seed": 23,
+}
+
+#RUN root: pytest tests/test_sweep.py
+# Allow prints: pytest -s tests/test_sweep.py
+
+def test_case_expand_manifest(manifest=MANIFEST):
+    jobs = expand_manifest(manifest)
+    # The second grid repeats a combination of the first one (svp_solver 1 is the default)
+    assert len(jobs) == 2 * 2 * 2, "Duplicate jobs were not removed."
+    assert all(parameters["svp_solver"] in ("1", "2") for parameters in jobs.values())
+
+
+def test_case_grid_keys():
+    # A manifest that is a single grid holds the repetitions and the seed next to its parameters
+    jobs = expand_manifest({"lattice_dimension": 6, "block_size": [3, "4"], "repetitions": 2, "seed": 5})
+    assert len(jobs) == 2 * 2 and {parameters["block_size"] for parameters in jobs.values()} == {3, 4}
+    assert all(parameters["seed"] == 5 for parameters in jobs.values())
+
+    for name, value in (("workers", 4), ("seed", 1), ("repetitions", 3)):
+        with pytest.raises(ValueError, match=name):
+            expand_manifest({"grids": [{"lattice_dimension": 6, name: value}]})
+    with pytest.raises(ValueError, match="unknown_parameter"):
+        expand_manifest({"lattice_dimension": 6, "unknown_parameter": 1})
+
+
+def test_case_resume(tmp_path, manifest=MANIFEST):
+    results_path = str(tmp_path / "results.jsonl")
+    assert run_sweep(manifest, results_path) == 8
+    with open(results_path) as results_file:
+        lines = results_file.readlines()
+
+    # Simulate an interruption while the last record was written
+    with open(results_path, "w") as results_file:
+        results_file.writelines(lines[:5])
+        results_file.write(lines[5][:10])
+    assert run_sweep(manifest, results_path) == 3, "Only the missing jobs should run."
+    assert run_sweep(manifest, results_path) == 0, "A complete sweep should not run again."
+    with open(results_path) as results_file:
+        records = [json.loads(line) for line in results_file if line.strip().endswith("}")]
+    assert sorted(record["job"] for record in records) == sorted(expand_manifest(manifest))
+
+
+def test_case_bases_match_main(manifest=MANIFEST):
+    jobs = expand_manifest(manifest)
+    groups = group_jobs(jobs)
+    # Jobs differing only in svp_solver share their LLL result
+    assert len(groups) == 2 * 2 and all(len(group) == 2 for group in groups)
+    group = next(group for group in groups if group[0][1]["lattice_id"] == 1)
+    records = run_job_group(group)
+
+    # main.py draws lattice ID i from the i-th spawned child of SeedSequence(seed)
+    parameters = group[0][1]
+    seed_sequence = np.random.SeedSequence(parameters["seed"]).spawn(2)[1]
+    basis = LATTICE_FAMILIES["1"](parameters["lattice_dimension"], ENTRY_BOUND, np.random.default_rng(seed_sequence))
+    expected = compute_basis_quality_characteristics(basis, False)
+    for (key, parameters), record in zip(group, records):
+        assert record["job"] == key
+        assert np.allclose(record["original"][:3], expected), "Sweep basis differs from the main.py basis."
+        expected_bkz = run_pipeline(basis, argparse.Namespace(**parameters))[2]
+        assert np.allclose(record["bkz"][:3], expected_bkz[:3]), "Shared LLL result changed the BKZ result."
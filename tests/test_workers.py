@@ -0,0 +1,37 @@
+import sys
+import os
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bkz.lattice_families import lattice_stream
+from main import run_pipeline, run_pipelines_in_pool
+
+ARGS = argparse.Namespace(
+    lattice_family="1",
+    lattice_dimension=8,
+    entry_bound=173,
+    block_size=4,
+    bkz_version="1",
+    svp_solver="1",
+    lll_version="1",
+    backend="1",
+    svp_backend="1",
+    structure=False,
+    hnf=False,
+    precision="default",
+    repetitions=3,
+    workers=2,
+    seed=19,
+)
+
+#RUN root: pytest tests/test_workers.py
+# Allow prints: pytest -s tests/test_workers.py
+
+def test_case_pool_matches_sequential(args=ARGS):
+    bases = list(lattice_stream(args.lattice_family, args.lattice_dimension, args.entry_bound, args.seed, args.repetitions))
+    pooled_results = run_pipelines_in_pool(bases, args)
+    sequential_results = np.array([run_pipeline(basis, args) for basis in bases])
+    assert pooled_results.shape == (args.repetitions, 3, 4)
+    # Quality metrics (all columns but the run time) are collected in lattice ID order
+    assert np.allclose(pooled_results[:, :, :3], sequential_results[:, :, :3]), "Pool results differ from sequential results."